@@ -0,0 +1,6 @@
+"""
+Benchmarks and Local Test Harness
+Fake mail servers, synthetic data generators and timed benchmark commands.
+Not shipped with the service package; run from the project root with
+``python -m benchmarks.<module>``.
+"""
@@ -0,0 +1,122 @@
+"""
+Column Role Benchmark
+Builds wide vendor price-list sheets (up to 40 columns: the five product
+columns under varying vendor header names, shuffled among distractors such as
+"Line #", "List Price" or "Product Family") and compares column role
+detection with the previous per-role find_column calls against
+classify_columns, which scores all columns once and assigns roles jointly.
+
+Reports the share of roles and of whole sheets detected correctly and the
+mean detection time per sheet.
+
+Usage:
+    python -m benchmarks.column_roles_bench
+    python -m benchmarks.column_roles_bench --sheets 500 --width 40
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import pandas as pd
+
+from benchmarks.mail_corpus import PRODUCTS
+from benchmarks.product_rows_bench import find_column
+from src.document_processor.excel_parser import COLUMN_ROLES, ExcelParser, spreadsheet_rules
+
+# Header names vendors use for each role
+ROLE_HEADERS = {
+    'sku': ['Part Number', 'SKU', 'Product', 'Item', 'Product Code', 'מק"ט'],
+    'description': ['Description', 'Product Description', 'Item Description', 'תיאור'],
+    'quantity': ['Qty', 'Quantity', 'כמות'],
+    'price': ['Unit Price', 'Price', 'Unit Cost', 'מחיר'],
+    'total': ['Total', 'Line Total', 'Total Price', 'Extended'],
+}
+DISTRACTORS = [
+    'Line', 'Line #', 'List Price', 'Discount %', 'Lead Time', 'Warehouse', 'Notes', 'Currency',
+    'Product Family', 'Weight (kg)', 'Country of Origin', 'EAN', 'Warranty', 'Category', 'Status',
+    'Vendor', 'Contract', 'Delivery', 'Region', 'Comments',
+]
+
+
+class FindColumnParser(ExcelParser):
+    """The previous column detection: one find_column call per role"""
+
+    def _classify_columns(self, df: pd.DataFrame) -> List:
+        column_keywords = spreadsheet_rules().column_keywords
+        return [find_column(df, column_keywords[role]) for role in COLUMN_ROLES]
+
+
+def build_sheet(rng: random.Random, width: int, rows: int = 30) -> Tuple[pd.DataFrame, Dict[str, str]]:
+    """One price-list sheet and its true role -> column header mapping"""
+    truth = {role: rng.choice(names) for role, names in ROLE_HEADERS.items()}
+    distractors = rng.sample(DISTRACTORS, min(len(DISTRACTORS), max(0, width - len(truth))))
+    distractors += [f'Attribute {i}' for i in range(width - len(truth) - len(distractors))]
+    headers = list(truth.values()) + distractors
+    rng.shuffle(headers)
+
+    data = []
+    for line in range(rows):
+        sku, description, quantity = rng.choice(PRODUCTS)
+        price = round(rng.uniform(150, 25000), 2)
+        values = {
+            truth['sku']: sku, truth['description']: description, truth['quantity']: quantity,
+            truth['price']: price, truth['total']: round(price * quantity, 2),
+            'Line': line + 1, 'Line #': line + 1, 'List Price': round(price * 1.2, 2),
+            'Discount %': rng.choice([0, 10, 15]), 'Product Family': rng.choice(['PowerEdge', 'EXAScaler', 'Quantum']),
+        }
+        data.append([values.get(header, rng.choice(['', 'N/A', 'IL'])) for header in headers])
+    return pd.DataFrame(data, columns=headers), truth
+
+
+def score(parser: ExcelParser, sheets: List[Tuple[pd.DataFrame, Dict[str, str]]]) -> Dict:
+    """Role accuracy, sheet accuracy and mean time of one detection method"""
+    correct_roles = correct_sheets = 0
+    start = time.perf_counter()
+    detected = [parser._classify_columns(df) for df, _ in sheets]
+    elapsed = time.perf_counter() - start
+    for columns, (_, truth) in zip(detected, sheets):
+        hits = sum(1 for role, col in zip(COLUMN_ROLES, columns) if col == truth[role])
+        correct_roles += hits
+        correct_sheets += hits == len(COLUMN_ROLES)
+    return {
+        'role_accuracy': round(correct_roles / (len(sheets) * len(COLUMN_ROLES)), 3),
+        'sheet_accuracy': round(correct_sheets / len(sheets), 3),
+        'ms_per_sheet': round(elapsed / len(sheets) * 1000, 3),
+    }
+
+
+def run_benchmark(sheets: int, width: int, seed: int = 1) -> Dict[str, Dict]:
+    rng = random.Random(seed)
+    generated = [build_sheet(rng, width) for _ in range(sheets)]
+    return {
+        'find_column': score(FindColumnParser(), generated),
+        'classify_columns': score(ExcelParser(), generated),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark column role detection on wide price lists')
+    parser.add_argument('--sheets', type=int, default=300, help='Generated sheets')
+    parser.add_argument('--width', type=int, nargs='+', default=[8, 40], help='Columns per sheet')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed')
+    args = parser.parse_args()
+
+    print("\n=== Column Role Benchmark ===")
+    print(f"  {'width':>5} {'method':<17} {'role_acc':>9} {'sheet_acc':>10} {'ms/sheet':>9}")
+    for width in args.width:
+        for method, row in run_benchmark(args.sheets, width, args.seed).items():
+            print(f"  {width:>5} {method:<17} {row['role_accuracy']:>9} {row['sheet_accuracy']:>10} "
+                  f"{row['ms_per_sheet']:>9}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""
+Email Context Extraction Benchmark
+Times EmailContentExtractor.extract_context on long Hebrew/English reply
+chains against the previous one-re.finditer-per-pattern approach and checks
+that both produce the same matches. ``newest_3_ms`` limits extraction to the
+newest three messages of the thread (processing.max_thread_segments: 3).
+
+Usage:
+    python -m benchmarks.context_bench
+    python -m benchmarks.context_bench --sizes 20000 200000 1000000 --repeat 5
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, List
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from benchmarks.mail_corpus import build_thread_text
+from src.email_intake.content_extractor import EmailContentExtractor
+from src.rules import rule_pack
+
+
+def sequential_scan(text: str) -> Dict[str, List]:
+    """Reference: every pattern string passed to re.finditer, one after another"""
+    results: Dict[str, List] = {}
+    for pattern in rule_pack('context').rules.patterns:
+        results.setdefault(pattern.field, []).extend(
+            (m.span(), m.groups()) for m in re.finditer(pattern.regex.pattern, text, pattern.regex.flags)
+        )
+    return results
+
+
+def best_of(func, repeat: int) -> float:
+    """Fastest wall time of ``repeat`` runs in seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+THREAD_MIXES = {'mixed': 0.5, 'english': 0.0}  # Share of Hebrew messages in the thread
+
+
+def run_benchmark(sizes: List[int], repeat: int = 3, seed: int = 1) -> List[Dict]:
+    """
+    Time context extraction on synthetic threads of the given sizes
+
+    Args:
+        sizes: Thread sizes in characters
+        repeat: Runs per measurement (best is reported)
+        seed: Random seed for the thread text
+
+    Returns:
+        One result dictionary per thread mix and size
+    """
+    extractor = EmailContentExtractor()
+    newest_three = EmailContentExtractor(max_segments=3)
+    results = []
+    for (mix, hebrew_ratio), size in ((m, s) for m in THREAD_MIXES.items() for s in sizes):
+        text = build_thread_text(size, random.Random(seed), hebrew_ratio)
+        metadata = SimpleNamespace(
+            from_address='Alon Katan <alon@c-data.co.il>', to_addresses=[], subject='RE: R350',
+            body_text=text, body_html=None, language='he'
+        )
+
+        scanned = {
+            field_name: [(m.span(), m.groups()) for _, m in matches]
+            for field_name, matches in extractor.scanner.scan(text).items()
+        }
+        if scanned != sequential_scan(text):
+            raise AssertionError(f"Scanner output differs from sequential scan ({mix}, {size} chars)")
+
+        results.append({
+            'mix': mix,
+            'chars': len(text),
+            'sequential_ms': round(best_of(lambda: sequential_scan(text), repeat) * 1000, 1),
+            'scanner_ms': round(best_of(lambda: extractor.scanner.scan(text), repeat) * 1000, 1),
+            'extract_context_ms': round(best_of(lambda: extractor.extract_context(metadata).materialize(), repeat) * 1000, 1),
+            'newest_3_ms': round(best_of(lambda: newest_three.extract_context(metadata).materialize(), repeat) * 1000, 1),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark email context extraction on long threads')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[20000, 200000, 1000000],
+                        help='Thread sizes in characters')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement (best is reported)')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed')
+    args = parser.parse_args()
+
+    print("\n=== Email Context Extraction Benchmark ===")
+    print(f"  {'mix':<8} {'chars':>9} {'sequential_ms':>14} {'scanner_ms':>11} {'extract_context_ms':>19} "
+          f"{'newest_3_ms':>12}")
+    for row in run_benchmark(args.sizes, args.repeat, args.seed):
+        print(f"  {row['mix']:<8} {row['chars']:>9} {row['sequential_ms']:>14} {row['scanner_ms']:>11} "
+              f"{row['extract_context_ms']:>19} {row['newest_3_ms']:>12}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""
+CSV Intake Benchmark
+Writes a large distributor catalog dump as Windows-1255 ';'-separated CSV
+(Hebrew headers, the price-list layout of product_rows_bench) and parses it
+with ExcelParser, which sniffs the encoding and delimiter and streams the
+rows in chunks, against loading the whole file with pd.read_csv first and
+extracting products from one frame. Checks both return the same products.
+
+Reports wall time and peak traced memory (tracemalloc, in a separate run) of both.
+
+Usage:
+    python -m benchmarks.csv_intake_bench
+    python -m benchmarks.csv_intake_bench --rows 100000 500000
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import pandas as pd
+
+from benchmarks.product_rows_bench import build_price_list
+from src.document_processor.delimited import sniff_dialect
+from src.document_processor.excel_parser import ExcelParser
+
+HEBREW_HEADERS = ['מק"ט', 'תיאור', 'כמות', 'מחיר', 'Total', 'הערות']
+
+
+def products_of(products) -> List:
+    return [(p.sku, p.description, p.quantity, p.unit_price, p.total_price, p.row_number) for p in products]
+
+
+def load_whole(parser: ExcelParser, path: str) -> List:
+    """The file read in one go with pd.read_csv, then the same header detection and extraction"""
+    encoding, delimiter = sniff_dialect(path)
+    rows = pd.read_csv(path, sep=delimiter, encoding=encoding, header=None, dtype=object,
+                       keep_default_na=False).values.tolist()
+    header_row = parser._find_header_row(rows) or 0
+    df = parser._frame_from_grid(rows, header=header_row)
+    return products_of(parser._extract_products_from_dataframe(df, Path(path).stem).products)
+
+
+def stream(parser: ExcelParser, path: str) -> List:
+    return products_of(parser.merge_sheets(parser.parse_excel(path)))
+
+
+def measure(func) -> Dict:
+    """Wall time of one call, and its peak traced memory in a second (traced, slower) call"""
+    start = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'seconds': round(seconds, 2), 'peak_mb': round(peak / 1024 / 1024, 1), 'products': result}
+
+
+def run_benchmark(rows: int, seed: int = 1) -> Dict:
+    """
+    Parse one generated CSV catalog streamed and loaded whole
+
+    Returns:
+        Result dictionary per mode plus the product parity check
+    """
+    parser = ExcelParser(max_workers=1)
+    with tempfile.TemporaryDirectory(prefix='dt-agent-csv-intake-') as scratch:
+        path = os.path.join(scratch, 'catalog.csv')
+        df = build_price_list(random.Random(seed), rows)
+        df.columns = HEBREW_HEADERS
+        df.to_csv(path, sep=';', encoding='cp1255', index=False)
+        del df
+        size_mb = os.path.getsize(path) / 1024 / 1024
+
+        whole = measure(lambda: load_whole(parser, path))
+        streamed = measure(lambda: stream(parser, path))
+    identical = whole.pop('products') == streamed['products']
+    product_count = len(streamed.pop('products'))
+    return {'rows': rows, 'file_mb': round(size_mb, 1), 'products': product_count,
+            'read_csv': whole, 'streaming': streamed, 'identical_products': identical}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark streaming CSV price-list intake')
+    parser.add_argument('--rows', type=int, nargs='+', default=[100000], help='Catalog sizes (rows)')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed')
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    print("\n=== CSV Intake Benchmark ===")
+    print(f"  {'rows':>8} {'MB':>6} {'products':>9} {'mode':<10} {'seconds':>8} {'peak MB':>8} {'identical':>10}")
+    identical = True
+    for rows in args.rows:
+        result = run_benchmark(rows, args.seed)
+        identical = identical and result['identical_products']
+        for mode in ('read_csv', 'streaming'):
+            print(f"  {rows:>8} {result['file_mb']:>6} {result['products']:>9} {mode:<10} "
+                  f"{result[mode]['seconds']:>8} {result[mode]['peak_mb']:>8} {str(result['identical_products']):>10}")
+    return 0 if identical else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
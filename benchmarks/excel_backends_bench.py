@@ -0,0 +1,111 @@
+"""
+Excel Backend Benchmark
+Writes a large distributor price list (mail_corpus.write_price_list) and
+measures reading it with each ExcelParser backend, each in a fresh process:
+
+    pandas    parse_excel with the whole sheet read into a DataFrame
+    openpyxl  iter_products over openpyxl read-only rows
+    calamine  iter_products over python-calamine rows (if installed)
+
+Reports wall time, products and peak RSS over the process baseline, plus the
+backend "auto" picks for the file.
+
+Usage:
+    python -m benchmarks.excel_backends_bench
+    python -m benchmarks.excel_backends_bench --rows 50000 200000
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.document_processor.excel_stream import STREAMING_BACKENDS, available_backends, select_backend
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (ru_maxrss is KB on Linux)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def worker(backend: str, path: str) -> Dict:
+    """Read the workbook with one backend in this process and report time and peak RSS"""
+    from src.document_processor.excel_parser import ExcelParser
+
+    logging.disable(logging.WARNING)
+    parser = ExcelParser(backend=backend)
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    if backend in STREAMING_BACKENDS:
+        products = sum(1 for _ in parser.iter_products(path, backend=backend))
+    else:
+        products = len(parser.merge_sheets(parser.parse_excel(path)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        'backend': backend,
+        'products': products,
+        'seconds': round(elapsed, 2),
+        'delta_rss_mb': round(peak_rss_mb() - baseline, 1),
+    }
+
+
+def run_benchmark(rows: int, seed: int = 1) -> List[Dict]:
+    """
+    Write one price list and read it with every available backend
+
+    Returns:
+        One result dictionary per backend
+    """
+    from benchmarks.mail_corpus import write_price_list
+
+    with tempfile.TemporaryDirectory(prefix='dt-agent-excel-backends-') as scratch:
+        path = write_price_list(os.path.join(scratch, 'price_list.xlsx'), random.Random(seed), rows)
+        size_mb = os.path.getsize(path) / 1024 / 1024
+        auto = select_backend(path)
+        results = []
+        for backend in ['pandas'] + [b for b in STREAMING_BACKENDS if b in available_backends(path)]:
+            completed = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.excel_backends_bench', '--worker', backend, path],
+                cwd=str(project_root), capture_output=True, text=True, check=True
+            )
+            result = json.loads(completed.stdout.strip().splitlines()[-1])
+            result.update(rows=rows, file_mb=round(size_mb, 1), auto=backend == auto)
+            results.append(result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Excel reading backends on large price lists')
+    parser.add_argument('--rows', type=int, nargs='+', default=[100000], help='Price-list sizes (product rows)')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed')
+    parser.add_argument('--worker', nargs=2, metavar=('BACKEND', 'PATH'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(worker(*args.worker)))
+        return 0
+
+    print("\n=== Excel Backend Benchmark ===")
+    print(f"  {'rows':>8} {'file_mb':>8} {'backend':<9} {'products':>9} {'seconds':>8} {'delta_rss_mb':>13} {'auto':>5}")
+    for rows in args.rows:
+        for row in run_benchmark(rows, args.seed):
+            print(f"  {row['rows']:>8} {row['file_mb']:>8} {row['backend']:<9} {row['products']:>9} "
+                  f"{row['seconds']:>8} {row['delta_rss_mb']:>13} {'*' if row['auto'] else '':>5}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""
+Parallel Sheet Parsing Benchmark
+Times ExcelParser.parse_excel on multi-sheet project workbooks
+(mail_corpus.build_vendor_workbook) serially and with sheets spread over
+worker processes, and checks both return the same products in the same order.
+
+The speedup is bounded by the CPU cores available (reported); on a single
+core the parallel run only shows the worker start-up and result transfer cost.
+
+Usage:
+    python -m benchmarks.excel_parallel_bench
+    python -m benchmarks.excel_parallel_bench --sheets 12 --rows 3000 --workers 2 4 8
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from benchmarks.mail_corpus import build_vendor_workbook
+from src.document_processor.excel_parser import ExcelParser
+
+
+def products_of(parser: ExcelParser, sheets) -> List:
+    return [(p.sku, p.quantity, p.unit_price, p.total_price, p.row_number) for p in parser.merge_sheets(sheets)]
+
+
+def best_of(func, repeat: int) -> float:
+    """Fastest wall time of ``repeat`` runs in seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run_benchmark(sheets: int, rows: int, workers: List[int], repeat: int = 3, seed: int = 1) -> List[Dict]:
+    """
+    Parse one generated workbook serially and with each worker count
+
+    Returns:
+        One result dictionary per worker count (1 = serial)
+    """
+    with tempfile.TemporaryDirectory(prefix='dt-agent-excel-parallel-') as scratch:
+        path = os.path.join(scratch, 'project.xlsx')
+        with open(path, 'wb') as f:
+            f.write(build_vendor_workbook(random.Random(seed), sheets=sheets, rows=rows))
+        size_mb = os.path.getsize(path) / 1024 / 1024
+
+        serial = ExcelParser(backend='pandas', max_workers=1)
+        expected = products_of(serial, serial.parse_excel(path))
+        serial_s = best_of(lambda: serial.parse_excel(path), repeat)
+        results = [{'workers': 1, 'seconds': round(serial_s, 2), 'speedup': 1.0, 'identical_products': True}]
+        for count in workers:
+            parser = ExcelParser(backend='pandas', max_workers=count, parallel_threshold_mb=0)
+            identical = products_of(parser, parser.parse_excel(path)) == expected
+            seconds = best_of(lambda: parser.parse_excel(path), repeat)
+            results.append({
+                'workers': count,
+                'seconds': round(seconds, 2),
+                'speedup': round(serial_s / seconds, 2) if seconds else 0.0,
+                'identical_products': identical,
+            })
+    for result in results:
+        result.update(sheets=sheets, rows_per_sheet=rows, file_mb=round(size_mb, 2))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark parallel per-sheet Excel parsing')
+    parser.add_argument('--sheets', type=int, default=8, help='Sheets per workbook')
+    parser.add_argument('--rows', type=int, default=3000, help='Product rows per sheet')
+    parser.add_argument('--workers', type=int, nargs='+', default=[2, 4], help='Worker process counts')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement (best is reported)')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed')
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    results = run_benchmark(args.sheets, args.rows, args.workers, args.repeat, args.seed)
+    print("\n=== Parallel Sheet Parsing Benchmark ===")
+    print(f"  workbook: {args.sheets} sheets x {args.rows} rows, {results[0]['file_mb']} MB; "
+          f"CPU cores: {os.cpu_count()}")
+    print(f"  {'workers':>8} {'seconds':>8} {'speedup':>8} {'identical':>10}")
+    for row in results:
+        print(f"  {row['workers']:>8} {row['seconds']:>8} {row['speedup']:>7}x {str(row['identical_products']):>10}")
+    return 0 if all(row['identical_products'] for row in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
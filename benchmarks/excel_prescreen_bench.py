@@ -0,0 +1,104 @@
+"""
+Sheet Pre-Screen Benchmark
+Parses a vendor workbook padded with large sheets that hold no products
+(mail_corpus.write_bloated_workbook: terms and conditions, a change log, an
+empty sheet) with and without the sheet pre-screen, per backend, and checks
+both return the same products.
+
+Usage:
+    python -m benchmarks.excel_prescreen_bench
+    python -m benchmarks.excel_prescreen_bench --filler-rows 50000 --backends pandas openpyxl
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from benchmarks.mail_corpus import write_bloated_workbook
+from src.document_processor.excel_parser import ExcelParser
+from src.document_processor.excel_stream import available_backends
+
+
+class NoScreenExcelParser(ExcelParser):
+    """ExcelParser that reads every sheet with rows in full"""
+
+    def _screen_sheet(self, head, header_row, layout=None):
+        return None if head else "empty"
+
+
+def products_of(parser: ExcelParser, sheets) -> List:
+    return [(p.sku, p.quantity, p.unit_price, p.total_price, p.row_number) for p in parser.merge_sheets(sheets)]
+
+
+def best_of(func, repeat: int) -> float:
+    """Fastest wall time of ``repeat`` runs in seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run_benchmark(rows: int, filler_rows: int, backends: List[str], repeat: int = 3, seed: int = 1) -> List[Dict]:
+    """
+    Parse one bloated workbook with and without the pre-screen per backend
+
+    Returns:
+        One result dictionary per backend
+    """
+    results = []
+    with tempfile.TemporaryDirectory(prefix='dt-agent-excel-prescreen-') as scratch:
+        path = write_bloated_workbook(os.path.join(scratch, 'quote.xlsx'), random.Random(seed), rows, filler_rows)
+        size_mb = os.path.getsize(path) / 1024 / 1024
+        for backend in backends:
+            if backend != 'pandas' and backend not in available_backends(path):
+                continue
+            full = NoScreenExcelParser(backend=backend, max_workers=1)
+            screened = ExcelParser(backend=backend, max_workers=1)
+            identical = products_of(full, full.parse_excel(path)) == products_of(screened, screened.parse_excel(path))
+            full_s = best_of(lambda: full.parse_excel(path), repeat)
+            screened_s = best_of(lambda: screened.parse_excel(path), repeat)
+            results.append({
+                'backend': backend,
+                'file_mb': round(size_mb, 2),
+                'full_s': round(full_s, 3),
+                'screened_s': round(screened_s, 3),
+                'speedup': round(full_s / screened_s, 2) if screened_s else 0.0,
+                'sheets_parsed': len(screened.parse_excel(path)),
+                'identical_products': identical,
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark skipping sheets that cannot hold products')
+    parser.add_argument('--rows', type=int, default=200, help='Product rows on the quote sheet')
+    parser.add_argument('--filler-rows', type=int, default=20000, help='Rows of each filler sheet')
+    parser.add_argument('--backends', nargs='+', default=['pandas', 'openpyxl', 'calamine'], help='Backends to run')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement (best is reported)')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed')
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    results = run_benchmark(args.rows, args.filler_rows, args.backends, args.repeat, args.seed)
+    print("\n=== Sheet Pre-Screen Benchmark ===")
+    print(f"  {'backend':<9} {'file_mb':>8} {'full_s':>8} {'screened_s':>11} {'speedup':>8} {'sheets':>7} {'identical':>10}")
+    for row in results:
+        print(f"  {row['backend']:<9} {row['file_mb']:>8} {row['full_s']:>8} {row['screened_s']:>11} "
+              f"{row['speedup']:>7}x {row['sheets_parsed']:>7} {str(row['identical_products']):>10}")
+    return 0 if all(row['identical_products'] for row in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""
+Excel Sheet Read Benchmark
+Times ExcelParser sheet loading, which reads each sheet once and detects the
+header row on the raw cells, against the previous two-read flow
+(read_excel(header=None) to find the header, then read_excel(header=N)),
+on multi-sheet vendor workbooks (mail_corpus.build_vendor_workbook). Reports
+the loading stage alone and the whole parse_excel call, and checks both
+flows return the same products.
+
+Usage:
+    python -m benchmarks.excel_read_bench
+    python -m benchmarks.excel_read_bench --sheets 8 --rows 500
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import pandas as pd
+
+from benchmarks.mail_corpus import build_vendor_workbook
+from src.document_processor.excel_parser import ExcelParser, ExcelSheetData, count_header_keywords
+
+
+class TwoReadExcelParser(ExcelParser):
+    """The previous sheet loading: every sheet parsed twice"""
+
+    def _load_sheet(self, excel_file: pd.ExcelFile, sheet_name: str, domain: str = "", header=None,
+                    sheet=None) -> Tuple[pd.DataFrame, None]:
+        df_no_header = pd.read_excel(excel_file, sheet_name=sheet_name, header=None)
+        header_row = None
+        for row_idx in range(min(20, len(df_no_header))):
+            values = [str(val).lower().strip() for val in df_no_header.iloc[row_idx].values if pd.notna(val)]
+            if count_header_keywords(values) >= 2:
+                header_row = row_idx
+                break
+        if header_row is None:
+            return pd.read_excel(excel_file, sheet_name=sheet_name), None
+        df = pd.read_excel(excel_file, sheet_name=sheet_name, header=header_row)
+        return (df.dropna(how='all') if header_row > 0 else df), None
+
+
+def load_sheets(parser: ExcelParser, path: str) -> List[pd.DataFrame]:
+    """Sheet loading stage only (read + header detection), without product extraction"""
+    with pd.ExcelFile(path) as excel_file:
+        return [parser._load_sheet(excel_file, name)[0] for name in excel_file.sheet_names]
+
+
+def products_of(sheets: Dict[str, ExcelSheetData]) -> List:
+    return [(name, [(p.sku, p.quantity, p.unit_price, p.total_price, p.row_number) for p in data.products])
+            for name, data in sheets.items()]
+
+
+def best_of(func, repeat: int) -> float:
+    """Fastest wall time of ``repeat`` runs in seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run_benchmark(sheets: int, rows: int, workbooks: int = 3, repeat: int = 3, seed: int = 1) -> Dict:
+    """
+    Parse ``workbooks`` generated workbooks with both parsers
+
+    Returns:
+        Result dictionary (timings, speedup, product parity)
+    """
+    rng = random.Random(seed)
+    single, double = ExcelParser(), TwoReadExcelParser()
+    with tempfile.TemporaryDirectory(prefix='dt-agent-excel-bench-') as scratch:
+        paths = []
+        for index in range(workbooks):
+            path = os.path.join(scratch, f'vendor_{index}.xlsx')
+            with open(path, 'wb') as f:
+                f.write(build_vendor_workbook(rng, sheets=sheets, rows=rows))
+            paths.append(path)
+
+        identical = all(products_of(single.parse_excel(p)) == products_of(double.parse_excel(p)) for p in paths)
+        single_load_s = best_of(lambda: [load_sheets(single, p) for p in paths], repeat)
+        double_load_s = best_of(lambda: [load_sheets(double, p) for p in paths], repeat)
+        single_s = best_of(lambda: [single.parse_excel(p) for p in paths], repeat)
+        double_s = best_of(lambda: [double.parse_excel(p) for p in paths], repeat)
+
+    return {
+        'workbooks': workbooks,
+        'sheets': sheets,
+        'rows_per_sheet': rows,
+        'two_read_load_ms': round(double_load_s * 1000, 1),
+        'single_read_load_ms': round(single_load_s * 1000, 1),
+        'load_speedup': round(double_load_s / single_load_s, 2) if single_load_s else 0.0,
+        'two_read_parse_ms': round(double_s * 1000, 1),
+        'single_read_parse_ms': round(single_s * 1000, 1),
+        'parse_speedup': round(double_s / single_s, 2) if single_s else 0.0,
+        'identical_products': identical,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark single-read Excel sheet parsing')
+    parser.add_argument('--sheets', type=int, default=4, help='Sheets per workbook')
+    parser.add_argument('--rows', type=int, default=300, help='Product rows per sheet')
+    parser.add_argument('--workbooks', type=int, default=3, help='Workbooks parsed per run')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement (best is reported)')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed')
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    result = run_benchmark(args.sheets, args.rows, args.workbooks, args.repeat, args.seed)
+    print("\n=== Excel Sheet Read Benchmark ===")
+    for key, value in result.items():
+        print(f"  {key:<22} {value}")
+    return 0 if result['identical_products'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,182 @@
+"""
+Excel Parser Benchmark Suite
+Generates workbooks in every shape ExcelParser supports
+(mail_corpus.write_shaped_workbook: header offset, prices below products,
+Hebrew headers, multi-sheet project) at 100, 10k and 100k product rows, and
+times parse_excel + merge_sheets on each in a fresh process, recording peak
+RSS over the process baseline and a digest of the products.
+
+Results are compared with a stored baseline JSON
+(benchmarks/baselines/excel_suite.json): a case is flagged when it got
+slower or grew in memory beyond the tolerances, or when its products
+changed. The exit code is non-zero if any case is flagged. Timings are
+machine-specific; regenerate the baseline on the machine you compare on.
+
+Usage:
+    python -m benchmarks.excel_suite_bench
+    python -m benchmarks.excel_suite_bench --sizes 100 10000 --shapes hebrew project
+    python -m benchmarks.excel_suite_bench --update-baseline
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from benchmarks.mail_corpus import WORKBOOK_SHAPES, write_shaped_workbook
+
+BASELINE_PATH = Path(__file__).parent / 'baselines' / 'excel_suite.json'
+BASELINE_FORMAT = 1
+SIZES = (100, 10000, 100000)
+TIME_TOLERANCE = 1.5  # Slower than baseline x this is a regression...
+TIME_FLOOR_S = 0.05  # ...if also this much slower (timer noise on small cases)
+MEMORY_TOLERANCE = 1.5
+MEMORY_FLOOR_MB = 10.0
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (ru_maxrss is KB on Linux)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def worker(path: str, repeat: int) -> Dict:
+    """Parse the workbook ``repeat`` times in this process; best time, peak RSS and product digest"""
+    from src.document_processor.excel_parser import ExcelParser
+    from src.document_processor.excel_stream import select_backend
+
+    logging.disable(logging.WARNING)
+    parser = ExcelParser(max_workers=1)
+    baseline = peak_rss_mb()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        products = parser.merge_sheets(parser.parse_excel(path))
+        timings.append(time.perf_counter() - start)
+    rows = [(p.sku, p.description, p.quantity, p.unit_price, p.total_price, p.row_number) for p in products]
+    return {
+        'backend': select_backend(path, parser.backend, parser.streaming_threshold_mb),
+        'products': len(products),
+        'digest': hashlib.sha256(repr(rows).encode()).hexdigest()[:16],
+        'seconds': round(min(timings), 3),
+        'peak_rss_mb': round(peak_rss_mb() - baseline, 1),
+    }
+
+
+def run_case(shape: str, rows: int, scratch: str, repeat: int, seed: int) -> Dict:
+    """Generate one workbook and measure it in a fresh process"""
+    path = write_shaped_workbook(os.path.join(scratch, f'{shape}_{rows}.xlsx'), random.Random(seed), shape, rows)
+    completed = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.excel_suite_bench', '--worker', path, str(repeat)],
+        cwd=str(project_root), capture_output=True, text=True, check=True
+    )
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result['file_mb'] = round(os.path.getsize(path) / 1024 / 1024, 2)
+    os.remove(path)
+    return result
+
+
+def compare(case: Dict, expected: Optional[Dict], time_tolerance: float, memory_tolerance: float) -> List[str]:
+    """Regressions of one case against its baseline entry ([] if none or no baseline)"""
+    if expected is None:
+        return []
+    flags = []
+    if case['seconds'] > expected['seconds'] * time_tolerance and case['seconds'] - expected['seconds'] > TIME_FLOOR_S:
+        flags.append(f"slower {case['seconds'] / max(expected['seconds'], 1e-9):.1f}x")
+    if case['peak_rss_mb'] > expected['peak_rss_mb'] * memory_tolerance \
+            and case['peak_rss_mb'] - expected['peak_rss_mb'] > MEMORY_FLOOR_MB:
+        flags.append(f"memory +{case['peak_rss_mb'] - expected['peak_rss_mb']:.0f} MB")
+    if case['products'] != expected['products'] or case['digest'] != expected['digest']:
+        flags.append(f"products changed ({expected['products']} -> {case['products']})")
+    if case['backend'] != expected.get('backend', case['backend']):
+        flags.append(f"backend {expected['backend']} -> {case['backend']}")
+    return flags
+
+
+def load_baseline(path: Path) -> Dict[str, Dict]:
+    """Baseline cases by "shape/rows" ({} if missing or of another format)"""
+    if not path.exists():
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if data.get('format') != BASELINE_FORMAT:
+        print(f"  Ignoring baseline {path} (format {data.get('format')})")
+        return {}
+    return data['cases']
+
+
+def save_baseline(path: Path, cases: Dict[str, Dict], repeat: int, seed: int):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        'format': BASELINE_FORMAT,
+        'environment': {'python': platform.python_version(), 'machine': platform.machine(), 'cpus': os.cpu_count()},
+        'repeat': repeat,
+        'seed': seed,
+        'cases': cases,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark ExcelParser on generated workbooks against a baseline')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(SIZES), help='Product rows per workbook')
+    parser.add_argument('--shapes', nargs='+', default=list(WORKBOOK_SHAPES), choices=WORKBOOK_SHAPES)
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per case (best is reported)')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed')
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH, help='Baseline JSON')
+    parser.add_argument('--update-baseline', action='store_true', help='Store these results as the baseline')
+    parser.add_argument('--time-tolerance', type=float, default=TIME_TOLERANCE, help='Allowed slowdown factor')
+    parser.add_argument('--memory-tolerance', type=float, default=MEMORY_TOLERANCE, help='Allowed peak RSS factor')
+    parser.add_argument('--worker', nargs=2, metavar=('PATH', 'REPEAT'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(worker(args.worker[0], int(args.worker[1]))))
+        return 0
+
+    baseline = {} if args.update_baseline else load_baseline(args.baseline)
+    results: Dict[str, Dict] = {}
+    regressions = 0
+    print("\n=== Excel Parser Benchmark Suite ===")
+    print(f"  {'case':<21} {'file_mb':>8} {'backend':<9} {'products':>9} {'seconds':>8} {'base_s':>8} "
+          f"{'rss_mb':>7} {'base_mb':>8}  flags")
+    with tempfile.TemporaryDirectory(prefix='dt-agent-excel-suite-') as scratch:
+        for rows in args.sizes:
+            for shape in args.shapes:
+                key = f'{shape}/{rows}'
+                case = run_case(shape, rows, scratch, args.repeat, args.seed)
+                results[key] = case
+                expected = baseline.get(key)
+                flags = compare(case, expected, args.time_tolerance, args.memory_tolerance)
+                regressions += bool(flags)
+                print(f"  {key:<21} {case['file_mb']:>8} {case['backend']:<9} {case['products']:>9} "
+                      f"{case['seconds']:>8} {expected['seconds'] if expected else '-':>8} {case['peak_rss_mb']:>7} "
+                      f"{expected['peak_rss_mb'] if expected else '-':>8}  {', '.join(flags) or 'ok'}")
+
+    if args.update_baseline:
+        save_baseline(args.baseline, {**load_baseline(args.baseline), **results}, args.repeat, args.seed)
+        print(f"  Baseline written to {args.baseline}")
+        return 0
+    if not baseline:
+        print(f"  No baseline at {args.baseline}; run with --update-baseline to store one")
+    print(f"  {regressions} regression(s)")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""
+Vendor Template Benchmark
+Parses a stream of vendor quote workbooks (mail_corpus.build_vendor_workbook)
+from a few sender domains, first with header/column detection on every sheet
+and then with a TemplateRegistry that learned the layouts on a first pass, and
+checks both return the same products.
+
+Reports total parse time and the time spent in header row and column
+detection (_find_header_row / _classify_columns) for both runs.
+
+Usage:
+    python -m benchmarks.excel_templates_bench
+    python -m benchmarks.excel_templates_bench --files 40 --rows 50 --sheets 2
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from benchmarks.mail_corpus import build_vendor_workbook
+from src.document_processor.excel_parser import ExcelParser
+from src.document_processor.templates import TemplateRegistry
+
+SENDERS = ['quotes@ddn.com', 'sales@dell.com', 'emea.quotes@hpe.com', 'partners@nvidia.com']
+
+
+class TimedExcelParser(ExcelParser):
+    """ExcelParser that accumulates the time spent in header and column detection"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.detection_s = 0.0
+
+    def _find_header_row(self, rows):
+        start = time.perf_counter()
+        try:
+            return super()._find_header_row(rows)
+        finally:
+            self.detection_s += time.perf_counter() - start
+
+    def _classify_columns(self, df):
+        start = time.perf_counter()
+        try:
+            return super()._classify_columns(df)
+        finally:
+            self.detection_s += time.perf_counter() - start
+
+
+def parse_all(parser: TimedExcelParser, files: List[Tuple[str, str]]) -> Tuple[float, List]:
+    """Parse every (path, sender) once; returns wall time and the products"""
+    products = []
+    start = time.perf_counter()
+    for path, sender in files:
+        sheets = parser.parse_excel(path, sender=sender)
+        products.append([(p.sku, p.quantity, p.unit_price, p.total_price, p.row_number)
+                         for p in parser.merge_sheets(sheets)])
+    return time.perf_counter() - start, products
+
+
+def run_benchmark(files: int, sheets: int, rows: int, seed: int = 1) -> List[Dict]:
+    """
+    Parse the generated workbooks without and with learned templates
+
+    Returns:
+        One result dictionary per mode ("detect", "templates")
+    """
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory(prefix='dt-agent-excel-templates-') as scratch:
+        workbooks = []
+        for index in range(files):
+            path = os.path.join(scratch, f'quote_{index}.xlsx')
+            with open(path, 'wb') as f:
+                f.write(build_vendor_workbook(rng, sheets=sheets, rows=rows, title_rows=rng.randint(0, 4)))
+            workbooks.append((path, SENDERS[index % len(SENDERS)]))
+
+        cold = TimedExcelParser(backend='pandas', max_workers=1)
+        cold_s, expected = parse_all(cold, workbooks)
+
+        registry = TemplateRegistry(os.path.join(scratch, 'templates.json'))
+        learner = ExcelParser(backend='pandas', max_workers=1, templates=registry)
+        for path, sender in workbooks:
+            learner.parse_excel(path, sender=sender)
+        registry.hits = registry.misses = 0
+        warm = TimedExcelParser(backend='pandas', max_workers=1, templates=registry)
+        warm_s, products = parse_all(warm, workbooks)
+
+    return [
+        {'mode': 'detect', 'seconds': round(cold_s, 3), 'detection_ms': round(cold.detection_s * 1000, 1),
+         'hit_rate': 0.0, 'identical_products': True},
+        {'mode': 'templates', 'seconds': round(warm_s, 3), 'detection_ms': round(warm.detection_s * 1000, 1),
+         'hit_rate': round(registry.hits / max(registry.hits + registry.misses, 1), 2),
+         'identical_products': products == expected, 'layouts': len(registry)},
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark learned vendor sheet layouts')
+    parser.add_argument('--files', type=int, default=40, help='Workbooks parsed')
+    parser.add_argument('--sheets', type=int, default=2, help='Sheets per workbook')
+    parser.add_argument('--rows', type=int, default=50, help='Product rows per sheet')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed')
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    results = run_benchmark(args.files, args.sheets, args.rows, args.seed)
+    print("\n=== Vendor Template Benchmark ===")
+    print(f"  {args.files} workbooks x {args.sheets} sheets x {args.rows} rows, {len(SENDERS)} sender domains, "
+          f"{results[1]['layouts']} layouts learned")
+    print(f"  {'mode':<10} {'seconds':>8} {'detection_ms':>13} {'hit_rate':>9} {'identical':>10}")
+    for row in results:
+        print(f"  {row['mode']:<10} {row['seconds']:>8} {row['detection_ms']:>13} {row['hit_rate']:>9} "
+              f"{str(row['identical_products']):>10}")
+    return 0 if all(row['identical_products'] for row in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
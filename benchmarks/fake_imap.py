@@ -0,0 +1,407 @@
+"""
+Fake IMAP4 Server
+In-process IMAP4rev1 server for exercising IMAPWatcher without a real mailbox
+"""
+
+import re
+import select
+import socketserver
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StoredMessage:
+    """Single message held by the fake mail store"""
+    uid: int
+    data: bytes
+    flags: Set[str] = field(default_factory=set)
+    delivered_at: float = field(default_factory=time.monotonic)
+
+
+class FakeMailStore:
+    """Thread-safe in-memory mailbox store shared by all server connections"""
+
+    def __init__(self, folders: Optional[List[str]] = None):
+        self.lock = threading.RLock()
+        self.changed = threading.Condition(self.lock)
+        self.folders: Dict[str, List[StoredMessage]] = {}
+        self.uid_next: Dict[str, int] = {}
+        for name in folders or ['INBOX']:
+            self.create(name)
+
+    def create(self, folder: str) -> bool:
+        """Create folder, returns False if it already exists"""
+        with self.lock:
+            if folder in self.folders:
+                return False
+            self.folders[folder] = []
+            self.uid_next[folder] = 1
+            return True
+
+    def deliver(self, data: bytes, folder: str = 'INBOX', flags: Tuple[str, ...] = ()) -> int:
+        """
+        Append a raw RFC 822 message to a folder
+
+        Returns:
+            UID assigned to the message
+        """
+        with self.changed:
+            self.create(folder)
+            uid = self.uid_next[folder]
+            self.uid_next[folder] = uid + 1
+            self.folders[folder].append(StoredMessage(uid=uid, data=data, flags=set(flags)))
+            self.changed.notify_all()
+            return uid
+
+    def count(self, folder: str = 'INBOX') -> int:
+        """Number of messages in folder"""
+        with self.lock:
+            return len(self.folders.get(folder, []))
+
+    def messages(self, folder: str = 'INBOX') -> List[StoredMessage]:
+        """Snapshot of messages in folder"""
+        with self.lock:
+            return list(self.folders.get(folder, []))
+
+
+def _tokenize(args: str) -> List[str]:
+    """Split IMAP command arguments, keeping quoted strings and parenthesized lists whole"""
+    tokens = []
+    i = 0
+    while i < len(args):
+        char = args[i]
+        if char == ' ':
+            i += 1
+        elif char == '"':
+            end = i + 1
+            while end < len(args) and args[end] != '"':
+                end += 2 if args[end] == '\\' else 1
+            tokens.append(args[i + 1:end].replace('\\"', '"').replace('\\\\', '\\'))
+            i = end + 1
+        elif char == '(':
+            depth, end = 0, i
+            while end < len(args):
+                depth += {'(': 1, ')': -1}.get(args[end], 0)
+                if depth == 0:
+                    break
+                end += 1
+            tokens.append(args[i:end + 1])
+            i = end + 1
+        else:
+            end = args.find(' ', i)
+            end = len(args) if end == -1 else end
+            tokens.append(args[i:end])
+            i = end
+    return tokens
+
+
+def _parse_sequence_set(spec: str, maximum: int) -> Set[int]:
+    """Expand an IMAP sequence set such as ``1:3,7,9:*``"""
+    values = set()
+    for part in spec.split(','):
+        if ':' in part:
+            low, high = part.split(':', 1)
+            low = maximum if low == '*' else int(low)
+            high = maximum if high == '*' else int(high)
+            values.update(range(min(low, high), max(low, high) + 1))
+        else:
+            values.add(maximum if part == '*' else int(part))
+    return values
+
+
+class _IMAPHandler(socketserver.StreamRequestHandler):
+    """One client connection speaking a practical subset of IMAP4rev1"""
+
+    CAPABILITIES = 'IMAP4rev1 IDLE MOVE UIDPLUS'
+
+    def setup(self):
+        super().setup()
+        self.store: FakeMailStore = self.server.store
+        self.selected: Optional[str] = None
+        self.authenticated = False
+
+    def send(self, line):
+        if isinstance(line, str):
+            line = line.encode('utf-8')
+        self.wfile.write(line + b'\r\n')
+
+    def handle(self):
+        self.send('* OK [CAPABILITY %s] dt-agent fake IMAP ready' % self.CAPABILITIES)
+        while True:
+            raw = self.rfile.readline()
+            if not raw:
+                return
+            line = raw.decode('utf-8', errors='replace').rstrip('\r\n')
+            if not line:
+                continue
+            tag, _, rest = line.partition(' ')
+            command, _, args = rest.partition(' ')
+            command = command.upper()
+            try:
+                if command == 'UID':
+                    sub, _, sub_args = args.partition(' ')
+                    done = self._dispatch(tag, 'UID ' + sub.upper(), sub_args, by_uid=True)
+                else:
+                    done = self._dispatch(tag, command, args, by_uid=False)
+            except Exception as e:  # Malformed command, report like a real server
+                logger.debug(f"Fake IMAP error on {line!r}: {e}")
+                self.send(f'{tag} BAD {e}')
+                continue
+            if done:
+                return
+
+    def _dispatch(self, tag: str, command: str, args: str, by_uid: bool) -> bool:
+        name = command.split()[-1].lower()
+        handler = getattr(self, f'cmd_{name}', None)
+        if handler is None:
+            self.send(f'{tag} BAD unknown command {command}')
+            return False
+        if name not in ('capability', 'login', 'logout', 'noop') and not self.authenticated:
+            self.send(f'{tag} NO not authenticated')
+            return False
+        return bool(handler(tag, _tokenize(args), by_uid))
+
+    # -- session commands -------------------------------------------------
+
+    def cmd_capability(self, tag, args, by_uid):
+        self.send(f'* CAPABILITY {self.CAPABILITIES}')
+        self.send(f'{tag} OK CAPABILITY completed')
+
+    def cmd_noop(self, tag, args, by_uid):
+        self.send(f'{tag} OK NOOP completed')
+
+    def cmd_login(self, tag, args, by_uid):
+        users = self.server.users
+        if users is not None and users.get(args[0]) != args[1]:
+            self.send(f'{tag} NO [AUTHENTICATIONFAILED] invalid credentials')
+            return
+        self.authenticated = True
+        self.send(f'{tag} OK LOGIN completed')
+
+    def cmd_logout(self, tag, args, by_uid):
+        self.send('* BYE logging out')
+        self.send(f'{tag} OK LOGOUT completed')
+        return True
+
+    def cmd_create(self, tag, args, by_uid):
+        if self.store.create(args[0]):
+            self.send(f'{tag} OK CREATE completed')
+        else:
+            self.send(f'{tag} NO [ALREADYEXISTS] mailbox exists')
+
+    def cmd_select(self, tag, args, by_uid):
+        folder = args[0]
+        with self.store.lock:
+            if folder not in self.store.folders:
+                self.send(f'{tag} NO mailbox does not exist')
+                return
+            self.selected = folder
+            messages = self.store.folders[folder]
+            self.send('* FLAGS (\\Seen \\Deleted \\Flagged \\Answered \\Draft)')
+            self.send(f'* {len(messages)} EXISTS')
+            self.send('* 0 RECENT')
+            self.send('* OK [UIDVALIDITY 1] UIDs valid')
+            self.send(f'* OK [UIDNEXT {self.store.uid_next[folder]}] predicted next UID')
+        self.send(f'{tag} OK [READ-WRITE] SELECT completed')
+
+    cmd_examine = cmd_select
+
+    def cmd_close(self, tag, args, by_uid):
+        if self.selected:
+            self._expunge(notify=False)
+        self.selected = None
+        self.send(f'{tag} OK CLOSE completed')
+
+    def cmd_expunge(self, tag, args, by_uid):
+        self._expunge(notify=True)
+        self.send(f'{tag} OK EXPUNGE completed')
+
+    def cmd_idle(self, tag, args, by_uid):
+        """Push EXISTS updates until the client sends DONE"""
+        self.send('+ idling')
+        known = self.store.count(self.selected) if self.selected else 0
+        while True:
+            readable, _, _ = select.select([self.connection], [], [], 0.05)
+            if readable:
+                raw = self.rfile.readline()
+                if not raw or raw.strip().upper() == b'DONE':
+                    break
+            current = self.store.count(self.selected) if self.selected else 0
+            if current != known:
+                known = current
+                self.send(f'* {current} EXISTS')
+        self.send(f'{tag} OK IDLE terminated')
+
+    # -- message commands -------------------------------------------------
+
+    def _resolve(self, spec: str, by_uid: bool) -> List[Tuple[int, StoredMessage]]:
+        """Resolve sequence set (or UID set) to (sequence number, message) pairs"""
+        messages = self.store.folders[self.selected]
+        if by_uid:
+            wanted = _parse_sequence_set(spec, messages[-1].uid if messages else 0)
+            return [(i, m) for i, m in enumerate(messages, 1) if m.uid in wanted]
+        wanted = _parse_sequence_set(spec, len(messages))
+        return [(i, m) for i, m in enumerate(messages, 1) if i in wanted]
+
+    def cmd_search(self, tag, args, by_uid):
+        criteria = [a.upper() for a in args if a.upper() != 'CHARSET']
+        with self.store.lock:
+            results = []
+            for seq, message in enumerate(self.store.folders[self.selected], 1):
+                if 'UNSEEN' in criteria and '\\Seen' in message.flags:
+                    continue
+                if 'SEEN' in criteria and '\\Seen' not in message.flags:
+                    continue
+                if 'DELETED' in criteria and '\\Deleted' not in message.flags:
+                    continue
+                if 'UNDELETED' in criteria and '\\Deleted' in message.flags:
+                    continue
+                results.append(message.uid if by_uid else seq)
+        self.send('* SEARCH' + ''.join(f' {r}' for r in results))
+        self.send(f'{tag} OK SEARCH completed')
+
+    def cmd_fetch(self, tag, args, by_uid):
+        items = args[1].strip('()').upper()
+        with self.store.lock:
+            for seq, message in self._resolve(args[0], by_uid):
+                parts = [f'UID {message.uid}']
+                literal = None
+                if 'RFC822.SIZE' in items:
+                    parts.append(f'RFC822.SIZE {len(message.data)}')
+                if 'RFC822.HEADER' in items or 'BODY.PEEK[HEADER]' in items or 'BODY[HEADER]' in items:
+                    header_end = message.data.find(b'\r\n\r\n')
+                    header_end = len(message.data) if header_end == -1 else header_end + 4
+                    literal = message.data[:header_end]
+                    key = 'RFC822.HEADER' if 'RFC822.HEADER' in items else 'BODY[HEADER]'
+                    parts.append(f'{key} {{{len(literal)}}}')
+                elif re.search(r'RFC822(?![.\w])|BODY(\.PEEK)?\[\]', items):
+                    literal = message.data
+                    if 'PEEK' not in items:
+                        message.flags.add('\\Seen')
+                    key = 'RFC822' if 'RFC822' in items else 'BODY[]'
+                    parts.append(f'{key} {{{len(literal)}}}')
+                flags = ' '.join(sorted(message.flags))
+                if literal is None:
+                    self.send(f'* {seq} FETCH ({" ".join(parts)} FLAGS ({flags}))')
+                else:
+                    self.wfile.write(f'* {seq} FETCH ({" ".join(parts)}\r\n'.encode('utf-8'))
+                    self.wfile.write(literal)
+                    self.send(f' FLAGS ({flags}))')
+        self.send(f'{tag} OK FETCH completed')
+
+    def cmd_store(self, tag, args, by_uid):
+        mode = args[1].upper()
+        flags = set(args[2].strip('()').split())
+        with self.store.lock:
+            for seq, message in self._resolve(args[0], by_uid):
+                if mode.startswith('+'):
+                    message.flags |= flags
+                elif mode.startswith('-'):
+                    message.flags -= flags
+                else:
+                    message.flags = set(flags)
+                if not mode.endswith('.SILENT'):
+                    self.send(f'* {seq} FETCH (UID {message.uid} FLAGS ({" ".join(sorted(message.flags))}))')
+        self.send(f'{tag} OK STORE completed')
+
+    def cmd_copy(self, tag, args, by_uid):
+        target = args[1]
+        with self.store.lock:
+            if target not in self.store.folders:
+                self.send(f'{tag} NO [TRYCREATE] mailbox does not exist')
+                return
+            for _, message in self._resolve(args[0], by_uid):
+                self.store.deliver(message.data, target, tuple(message.flags - {'\\Deleted'}))
+        self.send(f'{tag} OK COPY completed')
+
+    def cmd_move(self, tag, args, by_uid):
+        target = args[1]
+        with self.store.lock:
+            if target not in self.store.folders:
+                self.send(f'{tag} NO [TRYCREATE] mailbox does not exist')
+                return
+            moved = self._resolve(args[0], by_uid)
+            for _, message in moved:
+                self.store.deliver(message.data, target, tuple(message.flags))
+            moved_ids = {id(m) for _, m in moved}
+            messages = self.store.folders[self.selected]
+            for seq in sorted((s for s, _ in moved), reverse=True):
+                self.send(f'* {seq} EXPUNGE')
+            messages[:] = [m for m in messages if id(m) not in moved_ids]
+        self.send(f'{tag} OK MOVE completed')
+
+    def _expunge(self, notify: bool):
+        with self.store.lock:
+            messages = self.store.folders[self.selected]
+            deleted = [seq for seq, m in enumerate(messages, 1) if '\\Deleted' in m.flags]
+            if notify:
+                for seq in reversed(deleted):
+                    self.send(f'* {seq} EXPUNGE')
+            messages[:] = [m for m in messages if '\\Deleted' not in m.flags]
+
+
+class _ThreadingIMAPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class FakeIMAPServer:
+    """
+    Fake IMAP server running on a background thread
+
+    Supports LOGIN, SELECT, CREATE, CLOSE, EXPUNGE, IDLE and the UID
+    variants of SEARCH/FETCH/STORE/COPY/MOVE - enough for IMAPWatcher.
+    Plain TCP only; configure the watcher with ``use_ssl: false``.
+
+    Usage:
+        with FakeIMAPServer() as server:
+            server.store.deliver(raw_message_bytes)
+            host, port = server.address
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0,
+                 store: Optional[FakeMailStore] = None,
+                 users: Optional[Dict[str, str]] = None):
+        """
+        Initialize fake server
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 = pick a free port)
+            store: Mail store to serve (new INBOX-only store if None)
+            users: Accepted username -> password map (None = accept anyone)
+        """
+        self.store = store or FakeMailStore()
+        self._server = _ThreadingIMAPServer((host, port), _IMAPHandler)
+        self._server.store = self.store
+        self._server.users = users
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Bound (host, port)"""
+        return self._server.server_address[:2]
+
+    def start(self) -> 'FakeIMAPServer':
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        logger.debug(f"Fake IMAP server listening on {self.address}")
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> 'FakeIMAPServer':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
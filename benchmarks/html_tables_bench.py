@@ -0,0 +1,89 @@
+"""
+HTML Table Extraction Benchmark
+Times the inline HTML table backends against the previous BeautifulSoup
+implementation on Outlook-style bodies (large <style> block, VML, inline
+base64 logo) and checks that every backend returns the same tables.
+
+Usage:
+    python -m benchmarks.html_tables_bench
+    python -m benchmarks.html_tables_bench --css-kb 2048 --image-kb 1024 --repeat 5
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from benchmarks.mail_corpus import build_outlook_html
+from src.email_intake.html_tables import available_backends, extract_html_tables
+
+
+def previous_implementation(html: str) -> List[Dict]:
+    """EmailParser._extract_html_tables before pluggable backends"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    tables = []
+    for table in soup.find_all('table'):
+        rows = []
+        for tr in table.find_all('tr'):
+            cells = [td.get_text(strip=True) for td in tr.find_all(['td', 'th'])]
+            if cells:
+                rows.append(cells)
+        if rows:
+            tables.append({"type": "html_table", "data": rows, "headers": rows[0] if rows else []})
+    return tables
+
+
+def best_of(func, repeat: int) -> float:
+    """Fastest wall time of ``repeat`` runs in seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run_benchmark(css_kb: int, image_kb: int, rows: int, repeat: int = 3, seed: int = 1) -> Dict:
+    """
+    Time every available backend on one synthetic Outlook body
+
+    Returns:
+        Result dictionary (body size and milliseconds per backend)
+    """
+    html = build_outlook_html(random.Random(seed), css_kb, image_kb, rows)
+    result = {'html_kb': round(len(html) / 1024, 1)}
+
+    reference = previous_implementation(html)
+    result['previous_bs4_ms'] = round(best_of(lambda: previous_implementation(html), repeat) * 1000, 1)
+    for backend in available_backends():
+        if extract_html_tables(html, backend) != reference:
+            raise AssertionError(f"Backend {backend} output differs from the previous implementation")
+        result[f'{backend}_ms'] = round(best_of(lambda: extract_html_tables(html, backend), repeat) * 1000, 1)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark inline HTML table extraction backends')
+    parser.add_argument('--css-kb', type=int, default=512, help='Size of the <style> block (KB)')
+    parser.add_argument('--image-kb', type=int, default=512, help='Size of the inline base64 image (KB)')
+    parser.add_argument('--rows', type=int, default=40, help='Product table rows')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement (best is reported)')
+    args = parser.parse_args()
+
+    result = run_benchmark(args.css_kb, args.image_kb, args.rows, args.repeat)
+    print("\n=== HTML Table Extraction Benchmark ===")
+    for key, value in result.items():
+        print(f"  {key:<18} {value}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
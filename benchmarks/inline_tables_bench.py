@@ -0,0 +1,73 @@
+"""
+Inline Table Product Extraction Benchmark
+Times InlineTableParser on product tables from synthetic Outlook bodies
+(mail_corpus.build_outlook_html), the rows EmailParser.extract_inline_tables
+hands to QuoteProcessor._parse_inline_tables.
+
+Usage:
+    python -m benchmarks.inline_tables_bench
+    python -m benchmarks.inline_tables_bench --tables 500 --rows 60
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from benchmarks.mail_corpus import build_outlook_html
+from src.document_processor.inline_tables import InlineTableParser
+from src.email_intake.html_tables import extract_html_tables
+
+
+def run_benchmark(table_count: int, rows: int, seed: int = 1) -> Dict:
+    """
+    Convert ``table_count`` distinct inline tables and report throughput
+
+    Returns:
+        Result dictionary (tables/s, rows/s, products and mean confidence)
+    """
+    rng = random.Random(seed)
+    tables = []
+    for _ in range(table_count):
+        html = build_outlook_html(rng, css_kb=1, image_kb=1, rows=rows)
+        tables.extend(extract_html_tables(html, 'stream'))
+
+    parser = InlineTableParser()
+    start = time.perf_counter()
+    products = [parser.parse_tables([table]) for table in tables]
+    elapsed = time.perf_counter() - start
+
+    found = [product for table_products in products for product in table_products]
+    return {
+        'tables': len(tables),
+        'rows_per_table': rows,
+        'elapsed_ms': round(elapsed * 1000, 1),
+        'tables_per_second': round(len(tables) / elapsed) if elapsed else 0,
+        'rows_per_second': round(len(tables) * rows / elapsed) if elapsed else 0,
+        'products': len(found),
+        'mean_confidence': round(sum(p.confidence for p in found) / len(found), 3) if found else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark inline table -> product conversion')
+    parser.add_argument('--tables', type=int, default=200, help='Number of inline tables')
+    parser.add_argument('--rows', type=int, default=40, help='Product rows per table')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed')
+    args = parser.parse_args()
+
+    result = run_benchmark(args.tables, args.rows, args.seed)
+    print("\n=== Inline Table Extraction Benchmark ===")
+    for key, value in result.items():
+        print(f"  {key:<18} {value}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,576 @@
+"""
+Synthetic Mail Corpus Generator
+Builds vendor quote emails with xlsx/pdf attachments modeled on example-data/
+"""
+
+import io
+import random
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+from email.utils import format_datetime, make_msgid
+from typing import Iterator, List, Optional, Tuple
+
+try:
+    from openpyxl import Workbook
+except ImportError:
+    Workbook = None
+
+VENDORS = [
+    ('Alon Katan', 'alon@c-data.co.il', 'C-Data'),
+    ('DDN Sales', 'quotes@ddn.com', 'DDN'),
+    ('Dell EMC Israel', 'deals@dell.com', 'Dell'),
+    ('HPE Partner Desk', 'partners@hpe.com', 'HPE'),
+    ('Nvidia Networking', 'sales@nvidia.com', 'Nvidia'),
+]
+
+SUBJECTS = [
+    'RE: הצעת מחיר לשרת',
+    'RE: R350',
+    'Quote for server',
+    'FW: price list - storage expansion',
+    'RE: quotation request {n}',
+]
+
+# (SKU, description, quantity) rows in the shape of example-data/project example.xlsx
+PRODUCTS = [
+    ('ES400NVX2-NDR200-S', 'EXAScaler 400NVX2 Appliance with SAS4 expansion ports, 24x NVMe slots', 1),
+    ('S0G11536P24EPP1', '15.36TB 1 DWPD NVMe G4 4K SSD drive module for 400NVX2 system', 12),
+    ('SS9024-SBOD', 'SS9024 90-slot SAS enclosure. Includes 2x SAS4 I/O modules', 4),
+    ('CBL-SAS4-MSHD-3.5M', 'Passive Copper SAS4 Cable, MSHD, 3.5m', 8),
+    ('H00C2200234NH38', '22TB 7.2K RPM SAS-3 4K HDD drive module for SS9024 enclosure', 90),
+    ('210-BFUO', 'PowerEdge R6615 AMD EPYC 9254 3Y NBD Support', 1),
+    ('MQM8700-HS2F', 'Mellanox Quantum HDR InfiniBand Switch, 40 QSFP56 ports', 2),
+    ('MCP1650-H002E26', 'Mellanox Passive Copper cable, IB HDR, up to 200Gb/s, QSFP56', 16),
+    ('FG-200G-BDL-950-12', 'FortiGate-200G Hardware plus 1 Year FortiCare Premium', 1),
+    ('SRTG15KXLI', 'APS-Smart -UPS RT 15kVa 230V International 7U', 1),
+    ('AP7557', 'Rack PDU, Basic, Zero U, 11kW, 230V,(36) C13&(6) C19', 2),
+]
+
+HEBREW_BODY = (
+    "אלון רק חשוב שכחתי לרשום שה 200 גיגה זה 2 פורטים\n\n"
+    "1U server with:\n"
+    "1x 9254 CPU (24c@2.9GHz, 128MB cache, DDR5-4800),\n"
+    "128GB RAM (4x 32GB),\n"
+    "2x 480GB SATA SSD\n"
+    "Connectx6 200GB 2 port\n\n"
+    "מצ\"ב פירטי לקוח סופי:\n"
+    "שם לקוח סופי באנגלית\n"
+    "Mentee Robotics LTD\n"
+)
+
+ENGLISH_BODY = (
+    "Hi,\n\nPlease find attached our quotation as requested.\n"
+    "Note: prices are valid for 30 days, delivery 4-6 weeks.\n"
+    "Customer: Mentee Robotics\n"
+    "Total: $ 48,250.00 USD\n"
+)
+
+SIGNATURE = "\nבברכה,\nיוסי קליינר\n\nKind regards,\nYossi Kleiner\nCEO\n"
+
+
+def build_xlsx(rows: List[Tuple[str, str, int]], rng: random.Random) -> bytes:
+    """Build a vendor price sheet workbook (header row + product rows)"""
+    if Workbook is None:
+        raise ImportError("openpyxl is required to generate xlsx attachments")
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = 'Quote'
+    sheet.append(['Product', 'Description', 'Qty', 'Price', 'Total'])
+    for sku, description, quantity in rows:
+        price = round(rng.uniform(150, 25000), 2)
+        sheet.append([sku, description, quantity, price, round(price * quantity, 2)])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def build_vendor_workbook(rng: random.Random, sheets: int = 4, rows: int = 200, title_rows: int = 3) -> bytes:
+    """
+    Build a multi-sheet vendor workbook: a few title/customer rows above the
+    header on every sheet (so the header row has to be detected), then product rows
+
+    Args:
+        rng: Random generator
+        sheets: Number of sheets
+        rows: Product rows per sheet
+        title_rows: Rows above the header row
+
+    Returns:
+        xlsx file content
+    """
+    if Workbook is None:
+        raise ImportError("openpyxl is required to generate xlsx attachments")
+    workbook = Workbook()
+    for index in range(sheets):
+        sheet = workbook.active if index == 0 else workbook.create_sheet()
+        sheet.title = f'Option {index + 1}'
+        name, address, _ = rng.choice(VENDORS)
+        titles = [[f'Quotation {rng.randint(1000, 9999)}'], ['Vendor', name], ['Contact', address], [None]]
+        for title in titles[:title_rows]:
+            sheet.append(title)
+        sheet.append(['Part Number', 'Description', 'Qty', 'Unit Price', 'Total', 'Notes'])
+        for _ in range(rows):
+            sku, description, quantity = rng.choice(PRODUCTS)
+            price = round(rng.uniform(150, 25000), 2)
+            sheet.append([sku, description, quantity, price, round(price * quantity, 2), rng.choice(['', 'EOL', '3Y NBD'])])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def write_price_list(path: str, rng: random.Random, rows: int, title_rows: int = 3) -> str:
+    """
+    Write a distributor price list: one sheet of ``rows`` product rows below a
+    few title rows, written in openpyxl write-only mode (constant memory)
+
+    Args:
+        path: Output .xlsx path
+        rng: Random generator
+        rows: Product rows
+        title_rows: Rows above the header row
+
+    Returns:
+        path
+    """
+    if Workbook is None:
+        raise ImportError("openpyxl is required to generate xlsx attachments")
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Price List')
+    name, address, _ = rng.choice(VENDORS)
+    for title in [[f'Price list {rng.randint(1000, 9999)}'], ['Distributor', name], ['Contact', address], [None]][:title_rows]:
+        sheet.append(title)
+    sheet.append(['Part Number', 'Description', 'Qty', 'Unit Price', 'Total', 'Notes'])
+    for _ in range(rows):
+        sku, description, quantity = rng.choice(PRODUCTS)
+        price = round(rng.uniform(150, 25000), 2)
+        sheet.append([sku, description, quantity, price, round(price * quantity, 2), rng.choice(['', 'EOL', '3Y NBD'])])
+    workbook.save(path)
+    return path
+
+
+def write_bloated_workbook(path: str, rng: random.Random, rows: int = 200, filler_rows: int = 20000) -> str:
+    """
+    Write a vendor workbook padded with sheets that hold no products: a quote
+    sheet of ``rows`` product rows, long terms-and-conditions and change-log
+    sheets of ``filler_rows`` rows each, and an empty sheet
+
+    Args:
+        path: Output .xlsx path
+        rng: Random generator
+        rows: Product rows
+        filler_rows: Rows of each filler sheet
+
+    Returns:
+        path
+    """
+    if Workbook is None:
+        raise ImportError("openpyxl is required to generate xlsx attachments")
+    workbook = Workbook(write_only=True)
+    quote = workbook.create_sheet('Quote')
+    name, address, _ = rng.choice(VENDORS)
+    for title in [[f'Quotation {rng.randint(1000, 9999)}'], ['Vendor', name], ['Contact', address], [None]]:
+        quote.append(title)
+    quote.append(['Part Number', 'Description', 'Qty', 'Unit Price', 'Total', 'Notes'])
+    for _ in range(rows):
+        sku, description, quantity = rng.choice(PRODUCTS)
+        price = round(rng.uniform(150, 25000), 2)
+        quote.append([sku, description, quantity, price, round(price * quantity, 2), rng.choice(['', 'EOL', '3Y NBD'])])
+
+    terms = workbook.create_sheet('Terms & Conditions')
+    terms.append(['Terms and Conditions of Sale'])
+    for clause in range(filler_rows):
+        terms.append([f'{clause + 1}.', f'Prices for each product are valid for 30 days; quantity discounts apply '
+                      f'per clause {rng.randint(1, 99)} of the master agreement.'])
+
+    changes = workbook.create_sheet('Change Log')
+    changes.append(['Date', 'Version', 'Change', 'Author'])
+    for version in range(filler_rows):
+        changes.append([f'2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}', f'1.{version}',
+                        rng.choice(['Updated unit price', 'Added product line', 'Fixed description']), 'pricing'])
+
+    workbook.create_sheet('Sheet4')
+    workbook.save(path)
+    return path
+
+
+# Layouts ExcelParser supports, for write_shaped_workbook
+WORKBOOK_SHAPES = ('header_offset', 'price_below', 'hebrew', 'project')
+HEBREW_HEADERS = ['מק"ט', 'תיאור', 'כמות', 'מחיר', 'סה"כ', 'הערות']
+
+
+def _priced_rows(rng: random.Random, count: int) -> Iterator[List]:
+    """Product rows with unit price and line total in their own columns"""
+    for _ in range(count):
+        sku, description, quantity = rng.choice(PRODUCTS)
+        price = round(rng.uniform(150, 25000), 2)
+        yield [sku, description, quantity, price, round(price * quantity, 2), rng.choice(['', 'EOL', '3Y NBD'])]
+
+
+def _price_below_rows(rng: random.Random, count: int) -> Iterator[List]:
+    """
+    Product rows in the layout of example-data/project example.xlsx: the price
+    sits below the product, in an "Includes ..." row or in the description
+    column of an unlabelled row, with a "Total" row closing each section
+    """
+    for index in range(count):
+        sku, description, quantity = rng.choice(PRODUCTS)
+        layout = rng.random()
+        if layout < 0.3:
+            price = round(rng.uniform(150, 25000), 2)
+            yield [sku, description, quantity, price, round(price * quantity, 2), None]
+        elif layout < 0.7:
+            yield [sku, description, quantity, None, None, None]
+            yield ['Includes: 3Y NBD support', round(rng.uniform(200, 9000), 2), None, None, None, None]
+        else:
+            yield [sku, description, quantity, None, None, None]
+            yield [None, None, None, None, None, 'Delivery 4-6 weeks']
+            yield [None, round(rng.uniform(200, 9000), 2), None, None, None, None]
+        if index % 20 == 19:
+            yield ['Total', None, None, None, round(rng.uniform(1000, 90000), 2), None]
+
+
+def write_shaped_workbook(path: str, rng: random.Random, shape: str, rows: int) -> str:
+    """
+    Write a workbook of ``rows`` product rows in one of WORKBOOK_SHAPES
+    (openpyxl write-only mode, constant memory)
+
+        header_offset  title and contact rows above the header, prices in the product row
+        price_below    header in the first row, prices below the products
+        hebrew         Hebrew title and headers (מק"ט, תיאור, כמות, מחיר, סה"כ), prices in the product row
+        project        a summary sheet without products, then four option sheets
+                       splitting the rows, alternating in-row and below-row prices
+
+    Args:
+        path: Output .xlsx path
+        rng: Random generator
+        shape: One of WORKBOOK_SHAPES
+        rows: Product rows in the workbook
+
+    Returns:
+        path
+    """
+    if Workbook is None:
+        raise ImportError("openpyxl is required to generate xlsx attachments")
+    if shape not in WORKBOOK_SHAPES:
+        raise ValueError(f"Unknown workbook shape {shape}, expected one of {WORKBOOK_SHAPES}")
+    workbook = Workbook(write_only=True)
+    name, address, _ = rng.choice(VENDORS)
+    english_headers = ['Part Number', 'Description', 'Qty', 'Unit Price', 'Total', 'Notes']
+
+    if shape == 'header_offset':
+        sheet = workbook.create_sheet('Quote')
+        for title in [[f'Quotation {rng.randint(1000, 9999)}'], ['Vendor', name], ['Contact', address],
+                      ['Valid until', '2026-12-31'], [None]]:
+            sheet.append(title)
+        sheet.append(english_headers)
+        for row in _priced_rows(rng, rows):
+            sheet.append(row)
+    elif shape == 'price_below':
+        sheet = workbook.create_sheet('proposal')
+        sheet.append(['Product', 'Description', 'Qty', 'Unit Price', 'Total', 'Notes'])
+        for row in _price_below_rows(rng, rows):
+            sheet.append(row)
+    elif shape == 'hebrew':
+        sheet = workbook.create_sheet('הצעת מחיר')
+        for title in [[f'הצעת מחיר מספר {rng.randint(1000, 9999)}'], ['ספק', name], [None]]:
+            sheet.append(title)
+        sheet.append(HEBREW_HEADERS)
+        for row in _priced_rows(rng, rows):
+            sheet.append(row)
+    else:
+        summary = workbook.create_sheet('Summary')
+        summary.append(['Project', f'Storage expansion {rng.randint(1, 9)}PiB'])
+        summary.append(['Option', 'Capacity', 'Total USD'])
+        options = 4
+        for index in range(options):
+            summary.append([f'Option {index + 1}', f'{rng.choice([1, 2, 3.5])} PiB', round(rng.uniform(1e5, 9e5), 2)])
+        for index in range(options):
+            sheet = workbook.create_sheet(f'Option {index + 1}')
+            sheet.append([f'Option {index + 1}', name])
+            sheet.append([None])
+            sheet.append(english_headers)
+            count = rows // options + (1 if index < rows % options else 0)
+            source = _priced_rows if index % 2 == 0 else _price_below_rows
+            for row in source(rng, count):
+                sheet.append(row)
+    workbook.save(path)
+    return path
+
+
+def _pdf_escape(text: str) -> str:
+    text = text.encode('latin-1', errors='replace').decode('latin-1')
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def _pdf_document(page_contents: List[bytes]) -> bytes:
+    """Minimal PDF of A4 pages with the given content streams (Helvetica as /F1)"""
+    page_count = len(page_contents)
+    kids = ' '.join(f'{4 + 2 * index} 0 R' for index in range(page_count))
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'<< /Type /Pages /Kids [%s] /Count %d >>' % (kids.encode(), page_count),
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+    ]
+    for index, content in enumerate(page_contents):
+        objects.append(b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] '
+                       b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % (5 + 2 * index))
+        objects.append(b'<< /Length %d >>\nstream\n' % len(content) + content + b'\nendstream')
+    out = io.BytesIO()
+    out.write(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(b'%d 0 obj\n' % number + body + b'\nendobj\n')
+    xref = out.tell()
+    out.write(b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b'%010d 00000 n \n' % offset)
+    out.write(b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n'
+              % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def build_pdf(lines: List[str]) -> bytes:
+    """Build a minimal single-page PDF with one text line per entry"""
+    stream = ['BT', '/F1 9 Tf', '11 TL', '40 800 Td']
+    stream += [f'({_pdf_escape(line)}) Tj T*' for line in lines]
+    stream.append('ET')
+    return _pdf_document(['\n'.join(stream).encode('latin-1')])
+
+
+def build_catalog_pdf(rng: random.Random, pages: int = 60, rows: int = 40) -> bytes:
+    """
+    Build a distributor catalog PDF: every page holds a ruled table (Part
+    Number, Description, Qty, Unit Price) of ``rows`` product rows, drawn with
+    lines so pdfplumber's table finder picks it up
+
+    Args:
+        rng: Random generator
+        pages: Page count
+        rows: Product rows per page
+
+    Returns:
+        PDF file content
+    """
+    columns = [30, 150, 450, 490, 565]  # Column edges (points)
+    row_height = 18
+    contents = []
+    for page in range(pages):
+        top = 810
+        table = [['Part Number', 'Description', 'Qty', 'Unit Price']]
+        for _ in range(rows):
+            sku, description, quantity = rng.choice(PRODUCTS)
+            table.append([sku, description[:62], str(quantity), f'{rng.uniform(150, 25000):,.2f}'])
+        bottom = top - row_height * len(table)
+        stream = ['0.5 w']
+        for index in range(len(table) + 1):
+            y = top - row_height * index
+            stream.append(f'{columns[0]} {y} m {columns[-1]} {y} l S')
+        for x in columns:
+            stream.append(f'{x} {top} m {x} {bottom} l S')
+        stream += ['BT', '/F1 7 Tf']
+        for index, cells in enumerate(table):
+            y = top - row_height * (index + 1) + 6
+            for x, cell in zip(columns, cells):
+                stream.append(f'1 0 0 1 {x + 3} {y} Tm ({_pdf_escape(cell)}) Tj')
+        stream.append('ET')
+        stream.append(f'BT /F1 7 Tf 1 0 0 1 30 20 Tm (Catalog page {page + 1} of {pages}) Tj ET')
+        contents.append('\n'.join(stream).encode('latin-1'))
+    return _pdf_document(contents)
+
+
+def build_thread_text(target_chars: int, rng: random.Random, hebrew_ratio: float = 0.5) -> str:
+    """
+    Build a long forwarded Hebrew/English reply chain as plain text
+
+    Args:
+        target_chars: Stop adding quoted messages once the text is this long
+        rng: Random generator
+        hebrew_ratio: Share of messages written (and headed) in Hebrew
+
+    Returns:
+        Body text, newest message first (Outlook style quoting)
+    """
+    parts = []
+    size = 0
+    day = 20
+    while size < target_chars:
+        name, address, _ = rng.choice(VENDORS)
+        hebrew = rng.random() < hebrew_ratio
+        body = HEBREW_BODY if hebrew else ENGLISH_BODY
+        rows = rng.sample(PRODUCTS, rng.randint(0, 4))
+        table = ''.join(f"{sku}  {desc}  {qty}  ${rng.uniform(150, 25000):,.2f}\n" for sku, desc, qty in rows)
+        if not hebrew:
+            header = (f"From: {name} <{address}>\nSent: Monday, January {day}, 2025 2:22 PM\n"
+                      f"To: Yossi Kleiner <yossi@dayo-tech.com>\nSubject: RE: quote\n\n")
+        else:
+            header = (f"מאת: {name} <{address}>\nנשלח: יום שני 20 ינואר 2025 14:22\n"
+                      f"אל: יוסי קליינר <yossi@dayo-tech.com>\nנושא: RE: הצעת מחיר לשרת\n\n")
+        signature = SIGNATURE if hebrew else SIGNATURE.split('\n\n', 1)[1]
+        part = (header if parts else '') + body + table + signature + '\n'
+        parts.append(part)
+        size += len(part)
+        day = max(1, day - 1)
+    return ''.join(parts)
+
+
+def build_text_table(rng: random.Random, rows: int = 20, style: str = 'spaces') -> str:
+    """
+    Build a plain text product table as vendors paste it into text bodies
+
+    Args:
+        rng: Random generator
+        rows: Product rows
+        style: "spaces" (space-aligned, right-aligned numbers), "tabs"
+            (tab-delimited, unaligned) or "mixed" (tab after the SKU, spaces after)
+
+    Returns:
+        Table text (header, rule line, rows)
+    """
+    products = [(sku, desc, str(qty), f'{rng.uniform(150, 25000):,.2f}')
+                for sku, desc, qty in (rng.choice(PRODUCTS) for _ in range(rows))]
+    header = ('SKU', 'Description', 'Qty', 'Unit Price')
+    if style == 'tabs':
+        return ''.join('\t'.join(row) + '\n' for row in [header] + products)
+
+    widths = [max(len(row[i]) for row in [header] + products) for i in range(4)]
+
+    def line(row):
+        sku = row[0] + '\t' if style == 'mixed' else row[0].ljust(widths[0] + 3)
+        return f"{sku}{row[1].ljust(widths[1] + 3)}{row[2].rjust(widths[2])}   {row[3].rjust(widths[3])}\n"
+
+    if style == 'mixed':
+        widths[0] = 0
+    rule = '   '.join('-' * width for width in widths if width) + '\n'
+    return line(header) + rule + ''.join(line(row) for row in products)
+
+
+def build_outlook_html(rng: random.Random, css_kb: int = 256, image_kb: int = 512, rows: int = 20) -> str:
+    """
+    Build an Outlook-style HTML body: Word CSS in <head>, VML shapes, an
+    inline base64 logo, quoted paragraphs and a vendor product table
+
+    Args:
+        rng: Random generator
+        css_kb: Approximate size of the <style> block
+        image_kb: Approximate size of the inline data: URI image
+        rows: Product table rows
+
+    Returns:
+        HTML markup
+    """
+    import base64
+
+    css_rule = ("p.MsoNormal{n}, li.MsoNormal{n}, div.MsoNormal{n} {{margin:0cm; font-size:11.0pt; "
+                "font-family:\"Calibri\",sans-serif; mso-fareast-language:EN-US;}}\n")
+    css = ''.join(css_rule.format(n=n) for n in range(css_kb * 1024 // len(css_rule)))
+    logo = base64.b64encode(rng.randbytes(image_kb * 768)).decode('ascii')
+    vml = ('<!--[if gte vml 1]><v:shapetype id="_x0000_t75" coordsize="21600,21600" o:spt="75" '
+           'filled="f" stroked="f"><v:stroke joinstyle="miter"/><v:formulas><v:f eqn="if lineDrawn pixelLineWidth 0"/>'
+           '</v:formulas></v:shapetype><![endif]-->')
+    paragraphs = ''.join(
+        f'<p class=MsoNormal dir=RTL><span lang=HE>{line}</span><o:p></o:p></p>'
+        for line in (HEBREW_BODY + ENGLISH_BODY).splitlines() if line
+    )
+    cells = '<td style="border:solid windowtext 1.0pt;padding:0cm 5.4pt"><p class=MsoNormal>{}</p></td>'
+    table_rows = ''.join(
+        '<tr>' + ''.join(cells.format(value) for value in (sku, desc, qty, f'{rng.uniform(150, 25000):,.2f}')) + '</tr>'
+        for sku, desc, qty in (rng.choice(PRODUCTS) for _ in range(rows))
+    )
+    return (
+        '<html xmlns:v="urn:schemas-microsoft-com:vml" xmlns:o="urn:schemas-microsoft-com:office:office">'
+        '<head><meta http-equiv=Content-Type content="text/html; charset=utf-8">'
+        f'<style><!--\n{css}--></style></head><body lang=EN-US link="#0563C1">'
+        f'<div class=WordSection1>{vml}{paragraphs}'
+        '<table class=MsoTableGrid border=1 cellspacing=0 cellpadding=0>'
+        '<tr><td><b>SKU</b></td><td><b>Description</b></td><td><b>Qty</b></td><td><b>Price</b></td></tr>'
+        f'{table_rows}</table>'
+        f'<p class=MsoNormal><img width=120 height=40 src="data:image/png;base64,{logo}" alt=logo></p>'
+        f'{paragraphs}</div></body></html>'
+    )
+
+
+def build_email(index: int, rng: random.Random, now: Optional[datetime] = None,
+                to_address: str = 'quotes@dayo-tech.com') -> bytes:
+    """
+    Build one synthetic vendor quote email
+
+    Args:
+        index: Sequence number (used in subject and Message-ID)
+        rng: Random generator (seeded for reproducible corpora)
+        now: Base timestamp for the Date header
+        to_address: Recipient address
+
+    Returns:
+        Raw RFC 822 message bytes
+    """
+    name, address, vendor = rng.choice(VENDORS)
+    rows = rng.sample(PRODUCTS, rng.randint(3, len(PRODUCTS)))
+    now = now or datetime(2025, 1, 20, 14, 22)
+
+    msg = EmailMessage()
+    msg['From'] = f'{name} <{address}>'
+    msg['To'] = to_address
+    msg['Subject'] = rng.choice(SUBJECTS).format(n=index)
+    msg['Date'] = format_datetime(now + timedelta(minutes=index))
+    msg['Message-ID'] = make_msgid(idstring=f'bench{index}', domain=address.split('@')[1])
+
+    body = HEBREW_BODY if rng.random() < 0.5 else ENGLISH_BODY
+    quoted = ''.join(
+        f"\nFrom: Yossi Kleiner <yossi@dayo-tech.com>\nSent: Monday, January {20 - i}, 2025 2:22 PM\n"
+        f"To: {name} <{address}>\nSubject: RE: quote\n\n{body}"
+        for i in range(rng.randint(0, 4))
+    )
+    msg.set_content(body + SIGNATURE + quoted)
+
+    # Signature logo, as in every Outlook reply in example-data/
+    msg.add_attachment(b'\xff\xd8\xff\xe0' + rng.randbytes(6 * 1024), maintype='image',
+                       subtype='jpeg', filename='image001.jpg')
+    if rng.random() < 0.7:
+        msg.add_attachment(build_xlsx(rows, rng), maintype='application',
+                           subtype='vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+                           filename=f'{vendor} quote {index}.xlsx')
+    else:
+        lines = [f'{vendor} Quotation #{index}', 'SKU  Description  Qty  Price']
+        lines += [f'{sku}  {desc[:60]}  {qty}  {rng.uniform(150, 25000):.2f}' for sku, desc, qty in rows]
+        msg.add_attachment(build_pdf(lines), maintype='application', subtype='pdf',
+                           filename=f'הצעת מחיר_{index}.pdf')
+    return msg.as_bytes()
+
+
+def generate_corpus(count: int, seed: int = 1) -> Iterator[bytes]:
+    """
+    Generate ``count`` synthetic vendor emails
+
+    Args:
+        count: Number of emails
+        seed: Random seed (same seed = same corpus)
+
+    Yields:
+        Raw RFC 822 message bytes
+    """
+    rng = random.Random(seed)
+    for index in range(count):
+        yield build_email(index, rng)
+
+
+def main():
+    """Write a corpus of .eml files to a directory"""
+    import argparse
+    import os
+
+    parser = argparse.ArgumentParser(description='Generate synthetic vendor quote emails')
+    parser.add_argument('output_dir', help='Directory to write .eml files to')
+    parser.add_argument('-n', '--count', type=int, default=100, help='Number of emails')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed')
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    for index, raw in enumerate(generate_corpus(args.count, args.seed)):
+        with open(os.path.join(args.output_dir, f'vendor_{index:05d}.eml'), 'wb') as f:
+            f.write(raw)
+    print(f"Wrote {args.count} emails to {args.output_dir}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,307 @@
+"""
+Mock Microsoft Graph Server
+Local HTTP server implementing the Graph mail endpoints used by GraphWatcher
+"""
+
+import json
+import re
+import threading
+import uuid
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlsplit
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MockMessage:
+    """Message held by the mock mailbox"""
+    id: str
+    folder_id: str
+    raw: bytes
+    subject: str
+    sender_name: str
+    sender_address: str
+    received: str
+    internet_message_id: str
+    has_attachments: bool
+    is_read: bool = False
+    version: int = 0  # Change version, compared against delta tokens
+
+
+class MockMailbox:
+    """In-memory mailbox with change versions for delta queries"""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.version = 0
+        self.folders: Dict[str, str] = {'inbox': 'Inbox'}  # id -> display name
+        self.messages: Dict[str, MockMessage] = {}
+        self.removed: List[Tuple[int, str, str]] = []  # (version, folder_id, message_id)
+
+    def _bump(self) -> int:
+        self.version += 1
+        return self.version
+
+    def deliver(self, raw: bytes, folder_id: str = 'inbox') -> str:
+        """Add a raw RFC 822 message, returns its Graph id"""
+        from email import message_from_bytes
+        from email.utils import parseaddr
+
+        msg = message_from_bytes(raw)
+        name, address = parseaddr(msg.get('From', ''))
+        has_attachments = any(part.get_content_disposition() == 'attachment' for part in msg.walk())
+        with self.lock:
+            message = MockMessage(
+                id=uuid.uuid4().hex,
+                folder_id=folder_id,
+                raw=raw,
+                subject=str(msg.get('Subject', '')),
+                sender_name=name,
+                sender_address=address,
+                received=str(msg.get('Date', '')),
+                internet_message_id=str(msg.get('Message-ID', '')),
+                has_attachments=has_attachments,
+                version=self._bump(),
+            )
+            self.messages[message.id] = message
+            return message.id
+
+    def create_folder(self, display_name: str) -> str:
+        with self.lock:
+            folder_id = uuid.uuid4().hex
+            self.folders[folder_id] = display_name
+            return folder_id
+
+    def move(self, message_id: str, destination_id: str) -> Optional[MockMessage]:
+        with self.lock:
+            message = self.messages.get(message_id)
+            if message is None or destination_id not in self.folders:
+                return None
+            self.removed.append((self._bump(), message.folder_id, message.id))
+            message.folder_id = destination_id
+            message.version = self.version
+            return message
+
+    def count(self, folder_id: str = 'inbox') -> int:
+        with self.lock:
+            return sum(1 for m in self.messages.values() if m.folder_id == folder_id)
+
+    def changes(self, folder_id: str, since: int) -> List[Dict]:
+        """Messages added and removed in folder after version ``since``, oldest first"""
+        with self.lock:
+            items = [(m.version, m, None) for m in self.messages.values()
+                     if m.folder_id == folder_id and m.version > since]
+            items += [(v, None, mid) for v, fid, mid in self.removed if fid == folder_id and v > since]
+            items.sort(key=lambda item: item[0])
+            return [
+                self.to_resource(m) if m else {'id': mid, '@removed': {'reason': 'deleted'}}
+                for _, m, mid in items
+            ]
+
+    @staticmethod
+    def to_resource(message: MockMessage) -> Dict:
+        return {
+            'id': message.id,
+            'subject': message.subject,
+            'from': {'emailAddress': {'name': message.sender_name, 'address': message.sender_address}},
+            'receivedDateTime': message.received,
+            'hasAttachments': message.has_attachments,
+            'internetMessageId': message.internet_message_id,
+            'isRead': message.is_read,
+            'parentFolderId': message.folder_id,
+        }
+
+
+class _GraphHandler(BaseHTTPRequestHandler):
+    """Routes a subset of Graph v1.0 mail endpoints"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        logger.debug("Mock Graph: " + format % args)
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def _handle(self, method: str):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        status, headers, payload = self.server.mock.dispatch(
+            method, self.path, dict(self.headers), body, count=True
+        )
+        if isinstance(payload, (dict, list)):
+            payload = json.dumps(payload).encode('utf-8')
+            headers.setdefault('Content-Type', 'application/json')
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class MockGraphServer:
+    """
+    Mock Graph API on a background thread
+
+    Implements the token endpoint, mailFolders list/create, messages delta
+    (paged, with delta tokens and ``$select``), ``$value`` download, move and
+    ``$batch``. Set ``throttle_every`` to answer every Nth request with
+    429 + Retry-After. ``stats`` counts requests and bytes per endpoint.
+
+    Point GraphWatcher at it with ``base_url`` and ``token_url``.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0,
+                 mailbox: Optional[MockMailbox] = None,
+                 page_size: int = 10, throttle_every: int = 0, retry_after: int = 1):
+        self.mailbox = mailbox or MockMailbox()
+        self.page_size = page_size
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.stats: Dict[str, int] = {'requests': 0, 'throttled': 0, 'bytes_sent': 0}
+        self._stats_lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _GraphHandler)
+        self._server.daemon_threads = True
+        self._server.mock = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    @property
+    def base_url(self) -> str:
+        return f'{self.url}/v1.0'
+
+    @property
+    def token_url(self) -> str:
+        return f'{self.url}/mock-tenant/oauth2/v2.0/token'
+
+    def start(self) -> 'MockGraphServer':
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> 'MockGraphServer':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _count(self, key: str, size: int = 0):
+        with self._stats_lock:
+            self.stats[key] = self.stats.get(key, 0) + 1
+            self.stats['bytes_sent'] += size
+
+    def dispatch(self, method: str, path: str, headers: Dict, body: bytes,
+                 count: bool = False) -> Tuple[int, Dict, object]:
+        """Route one request; returns (status, headers, payload)"""
+        parts = urlsplit(path)
+        route = parts.path
+        query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+
+        if count:
+            with self._stats_lock:
+                self.stats['requests'] += 1
+                throttle = self.throttle_every and self.stats['requests'] % self.throttle_every == 0
+            if throttle:
+                self._count('throttled')
+                return 429, {'Retry-After': str(self.retry_after)}, {
+                    'error': {'code': 'TooManyRequests', 'message': 'Throttled by mock'}}
+
+        if route.endswith('/oauth2/v2.0/token'):
+            return 200, {}, {'access_token': 'mock-token', 'token_type': 'Bearer', 'expires_in': 3600}
+
+        if not any(k.lower() == 'authorization' and v == 'Bearer mock-token' for k, v in headers.items()):
+            return 401, {}, {'error': {'code': 'InvalidAuthenticationToken'}}
+
+        route = re.sub(r'^/v1\.0', '', route)
+        status, out_headers, payload = self._route(method, route, query, body)
+        if count:
+            size = len(payload) if isinstance(payload, bytes) else len(json.dumps(payload))
+            self._count(route.rsplit('/', 1)[-1], size)
+        return status, out_headers, payload
+
+    def _route(self, method: str, route: str, query: Dict, body: bytes) -> Tuple[int, Dict, object]:
+        mailbox = self.mailbox
+
+        if route == '/$batch' and method == 'POST':
+            responses = []
+            for request in json.loads(body or b'{}').get('requests', []):
+                sub_body = json.dumps(request.get('body', {})).encode('utf-8')
+                status, headers, payload = self.dispatch(
+                    request['method'], request['url'],
+                    {'Authorization': 'Bearer mock-token'}, sub_body
+                )
+                responses.append({'id': request['id'], 'status': status, 'headers': headers, 'body': payload})
+            return 200, {}, {'responses': responses}
+
+        match = re.fullmatch(r'/users/[^/]+/mailFolders', route)
+        if match and method == 'GET':
+            wanted = re.search(r"displayName eq '([^']*)'", query.get('$filter', ''))
+            folders = [{'id': fid, 'displayName': name} for fid, name in mailbox.folders.items()
+                       if not wanted or name == wanted.group(1)]
+            return 200, {}, {'value': folders}
+        if match and method == 'POST':
+            name = json.loads(body)['displayName']
+            return 201, {}, {'id': mailbox.create_folder(name), 'displayName': name}
+
+        match = re.fullmatch(r'/users/([^/]+)/mailFolders/([^/]+)/messages/delta', route)
+        if match and method == 'GET':
+            return self._delta(match.group(1), match.group(2), query)
+
+        match = re.fullmatch(r'/users/[^/]+/messages/([^/]+)/\$value', route)
+        if match and method == 'GET':
+            message = mailbox.messages.get(match.group(1))
+            if message is None:
+                return 404, {}, {'error': {'code': 'ErrorItemNotFound'}}
+            return 200, {'Content-Type': 'message/rfc822'}, message.raw
+
+        match = re.fullmatch(r'/users/[^/]+/messages/([^/]+)/move', route)
+        if match and method == 'POST':
+            message = mailbox.move(match.group(1), json.loads(body)['destinationId'])
+            if message is None:
+                return 404, {}, {'error': {'code': 'ErrorItemNotFound'}}
+            return 201, {}, mailbox.to_resource(message)
+
+        return 404, {}, {'error': {'code': 'NotFound', 'message': f'{method} {route}'}}
+
+    def _delta(self, user: str, folder_id: str, query: Dict) -> Tuple[int, Dict, object]:
+        """Paged delta: $skiptoken = '<since>.<offset>', $deltatoken = version"""
+        if '$skiptoken' in query:
+            since, offset = (int(x) for x in query['$skiptoken'].split('.'))
+        else:
+            since, offset = int(query.get('$deltatoken', 0)), 0
+        select = [f for f in query.get('$select', '').split(',') if f]
+
+        changes = self.mailbox.changes(folder_id, since)
+        page = changes[offset:offset + self.page_size]
+        if select:
+            page = [item if '@removed' in item else {k: v for k, v in item.items() if k in select or k == 'id'}
+                    for item in page]
+
+        link = f'{self.base_url}/users/{user}/mailFolders/{folder_id}/messages/delta?'
+        payload = {'value': page}
+        if offset + self.page_size < len(changes):
+            token = {'$skiptoken': f'{since}.{offset + self.page_size}'}
+            if select:
+                token['$select'] = ','.join(select)
+            payload['@odata.nextLink'] = link + urlencode(token)
+        else:
+            payload['@odata.deltaLink'] = link + urlencode({'$deltatoken': self.mailbox.version})
+        return 200, {}, payload
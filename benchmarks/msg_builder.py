@@ -0,0 +1,268 @@
+"""
+Synthetic Outlook .msg Writer
+Writes a minimal MS-CFB (version 4, 4096-byte sectors) compound file with
+the MAPI streams extract_msg needs: subject, sender, body and data
+attachments. Attachment content is generated chunk by chunk straight into
+the file, so multi-hundred-MB messages can be built without holding them in
+memory.
+
+Usage:
+    python -m benchmarks.msg_builder /tmp/large.msg --attachment-mb 50 50 50
+"""
+
+import argparse
+import random
+import struct
+import sys
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+SECTOR_SIZE = 4096
+MINI_SECTOR_SIZE = 64
+MINI_STREAM_CUTOFF = 4096
+HEADER_DIFAT_ENTRIES = 109
+FAT_ENTRIES_PER_SECTOR = SECTOR_SIZE // 4
+
+FREESECT = 0xFFFFFFFF
+ENDOFCHAIN = 0xFFFFFFFE
+FATSECT = 0xFFFFFFFD
+NOSTREAM = 0xFFFFFFFF
+
+STORAGE, STREAM, ROOT = 1, 2, 5
+
+# Writes the stream content to the file in chunks
+ContentWriter = Callable[[Callable[[bytes], None]], None]
+
+
+@dataclass
+class _Entry:
+    name: str
+    kind: int
+    size: int = 0
+    content: Optional[ContentWriter] = None
+    children: List['_Entry'] = field(default_factory=list)
+    start: int = ENDOFCHAIN
+    sid: int = 0
+
+
+def _cfb_key(name: str) -> Tuple[int, str]:
+    """CFB sibling order: shorter names first, then case-insensitive"""
+    return len(name), name.upper()
+
+
+def _bytes_writer(data: bytes) -> ContentWriter:
+    return lambda write: write(data)
+
+
+def random_writer(size: int, seed: int, signature: bytes = b'') -> ContentWriter:
+    """Content of ``size`` bytes: ``signature`` followed by seeded random bytes, written in 1 MB chunks"""
+    def write_content(write):
+        rng = random.Random(seed)
+        write(signature[:size])
+        remaining = size - min(size, len(signature))
+        while remaining:
+            chunk = min(remaining, 1024 * 1024)
+            write(rng.randbytes(chunk))
+            remaining -= chunk
+    return write_content
+
+
+def _string_stream(prop_id: int, value: str) -> _Entry:
+    data = value.encode('utf-16-le')
+    return _Entry(f'__substg1.0_{prop_id:04X}001F', STREAM, len(data), _bytes_writer(data))
+
+
+def _properties(header: bytes, props: List[Tuple[int, int, int]]) -> _Entry:
+    """Property stream: header + 16-byte fixed-size property entries (tag, flags, value)"""
+    data = header + b''.join(struct.pack('<IIQ', tag, flags, value) for tag, flags, value in props)
+    return _Entry('__properties_version1.0', STREAM, len(data), _bytes_writer(data))
+
+
+def build_message_tree(subject: str, sender: str, body: str,
+                       attachments: List[Tuple[str, str, int, ContentWriter]]) -> _Entry:
+    """
+    Directory tree of an IPM.Note message
+
+    Args:
+        subject: Message subject
+        sender: Sender address
+        body: Plain text body
+        attachments: (filename, mime type, size, content writer) per attachment
+    """
+    root = _Entry('Root Entry', ROOT)
+    root.children = [
+        _properties(struct.pack('<8xIIII8x', 0, len(attachments), 0, len(attachments)), []),
+        _string_stream(0x001A, 'IPM.Note'),
+        _string_stream(0x0037, subject),
+        _string_stream(0x0C1F, sender),
+        _string_stream(0x1000, body),
+    ]
+    named = _Entry('__nameid_version1.0', STORAGE)  # Empty named-property mapping
+    named.children = [_Entry(f'__substg1.0_{stream:04X}0102', STREAM, 0, _bytes_writer(b'')) for stream in (2, 3, 4)]
+    root.children.append(named)
+    for index, (filename, mime_type, size, content) in enumerate(attachments):
+        storage = _Entry(f'__attach_version1.0_#{index:08X}', STORAGE)
+        storage.children = [
+            _properties(b'\0' * 8, [(0x37050003, 6, 1), (0x0E200003, 6, size)]),  # ATTACH_BY_VALUE, size
+            _string_stream(0x3707, filename),
+            _string_stream(0x3704, filename[:12]),
+            _string_stream(0x370E, mime_type),
+            _Entry('__substg1.0_37010102', STREAM, size, content),
+        ]
+        root.children.append(storage)
+    return root
+
+
+def write_compound_file(path: str, root: _Entry):
+    """Lay out and write a version 4 compound file for the given directory tree"""
+    entries: List[_Entry] = []
+
+    def number(entry: _Entry):
+        entry.sid = len(entries)
+        entries.append(entry)
+        for child in sorted(entry.children, key=lambda e: _cfb_key(e.name)):
+            number(child)
+
+    number(root)
+    streams = [e for e in entries if e.kind == STREAM]
+    small = [e for e in streams if e.size < MINI_STREAM_CUTOFF]
+    large = [e for e in streams if e.size >= MINI_STREAM_CUTOFF]
+
+    # Mini stream: small streams packed in 64-byte mini sectors
+    minifat: List[int] = []
+    for entry in small:
+        count = -(-entry.size // MINI_SECTOR_SIZE)
+        entry.start = len(minifat) if count else ENDOFCHAIN
+        minifat.extend(list(range(len(minifat) + 1, len(minifat) + count)) + [ENDOFCHAIN] if count else [])
+    root.size = len(minifat) * MINI_SECTOR_SIZE
+
+    def sectors(size: int) -> int:
+        return -(-size // SECTOR_SIZE)
+
+    # Sector layout: large streams, mini stream, minifat, directory, FAT
+    layout: List[Tuple[int, int]] = []  # (first sector, sector count) per chain
+    next_sector = 0
+    for entry in large:
+        entry.start = next_sector
+        layout.append((next_sector, sectors(entry.size)))
+        next_sector += sectors(entry.size)
+    root.start = next_sector if root.size else ENDOFCHAIN
+    mini_sectors = sectors(root.size)
+    layout.append((next_sector, mini_sectors))
+    next_sector += mini_sectors
+    minifat_start, minifat_sectors = next_sector, sectors(len(minifat) * 4)
+    layout.append((minifat_start, minifat_sectors))
+    next_sector += minifat_sectors
+    dir_start, dir_sectors = next_sector, sectors(len(entries) * 128)
+    layout.append((dir_start, dir_sectors))
+    next_sector += dir_sectors
+
+    fat_sectors = 1
+    while fat_sectors * FAT_ENTRIES_PER_SECTOR < next_sector + fat_sectors:
+        fat_sectors += 1
+    if fat_sectors > HEADER_DIFAT_ENTRIES:
+        raise ValueError("Message too large for a header-only DIFAT (max ~450 MB)")
+    fat_start = next_sector
+
+    fat = [FREESECT] * (fat_sectors * FAT_ENTRIES_PER_SECTOR)
+    for first, count in layout:
+        for sector in range(first, first + count):
+            fat[sector] = sector + 1 if sector < first + count - 1 else ENDOFCHAIN
+    for sector in range(fat_start, fat_start + fat_sectors):
+        fat[sector] = FATSECT
+
+    difat = list(range(fat_start, fat_start + fat_sectors)) + [FREESECT] * (HEADER_DIFAT_ENTRIES - fat_sectors)
+    header = struct.pack(
+        '<8s16sHHHHH6sIIIIIIIII',
+        b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1', b'\0' * 16, 0x3E, 4, 0xFFFE, 12, 6, b'\0' * 6,
+        dir_sectors, fat_sectors, dir_start, 0, MINI_STREAM_CUTOFF,
+        minifat_start if minifat_sectors else ENDOFCHAIN, minifat_sectors, ENDOFCHAIN, 0
+    ) + struct.pack(f'<{HEADER_DIFAT_ENTRIES}I', *difat)
+
+    def directory_entry(entry: _Entry) -> bytes:
+        name = entry.name.encode('utf-16-le') + b'\0\0'
+        children = sorted(entry.children, key=lambda e: _cfb_key(e.name))
+        return struct.pack(
+            '<64sHBBIII16sIQQIQ',
+            name, len(name), entry.kind, 1,  # black
+            NOSTREAM, NOSTREAM, children[0].sid if children else NOSTREAM,
+            b'\0' * 16, 0, 0, 0, entry.start if entry.kind != STORAGE else 0, entry.size
+        )
+
+    # Siblings form a right-leaning chain in CFB order (valid, if unbalanced, tree)
+    directory = bytearray(b''.join(directory_entry(e) for e in entries))
+    for entry in entries:
+        siblings = sorted(entry.children, key=lambda e: _cfb_key(e.name))
+        for left, right in zip(siblings, siblings[1:]):
+            struct.pack_into('<I', directory, left.sid * 128 + 72, right.sid)
+    unused = b'\0' * 64 + struct.pack('<HBBIII', 0, 0, 0, NOSTREAM, NOSTREAM, NOSTREAM) + b'\0' * 48
+
+    with open(path, 'wb') as f:
+        f.write(header.ljust(SECTOR_SIZE, b'\0'))
+
+        def write_padded(entry_list, pad_to):
+            written = 0
+
+            def write(data):
+                nonlocal written
+                f.write(data)
+                written += len(data)
+
+            for entry in entry_list:
+                start = written
+                entry.content(write)
+                if written - start != entry.size:
+                    raise ValueError(f"Stream {entry.name} wrote {written - start} bytes, expected {entry.size}")
+                pad = -written % pad_to
+                f.write(b'\0' * pad)
+                written += pad
+            return written
+
+        write_padded(large, SECTOR_SIZE)
+        mini_written = write_padded(small, MINI_SECTOR_SIZE)
+        f.write(b'\0' * (mini_sectors * SECTOR_SIZE - mini_written))
+        f.write(struct.pack(f'<{len(minifat)}I', *minifat).ljust(minifat_sectors * SECTOR_SIZE, b'\xff'))
+        directory += unused * (dir_sectors * SECTOR_SIZE // 128 - len(entries))
+        f.write(bytes(directory))
+        f.write(struct.pack(f'<{len(fat)}I', *fat))
+
+
+def write_large_msg(path: str, attachment_sizes: List[int], seed: int = 1) -> Dict:
+    """
+    Write a vendor-quote style .msg with PDF-signature attachments of the given sizes
+
+    Returns:
+        Summary (path, attachment count, total attachment bytes)
+    """
+    attachments = [
+        (f'quote_part_{index + 1}.pdf', 'application/pdf', size, random_writer(size, seed + index, b'%PDF-1.7\n'))
+        for index, size in enumerate(attachment_sizes)
+    ]
+    attachments.append(('image001.png', 'image/png', 12 * 1024,
+                        random_writer(12 * 1024, seed, b'\x89PNG\r\n\x1a\n')))
+    root = build_message_tree(
+        subject='RE: quote for storage expansion',
+        sender='vendor@example.com',
+        body='Hi,\r\n\r\nPlease find attached our quotation.\r\n\r\nBest regards,\r\nVendor Sales\r\n',
+        attachments=attachments,
+    )
+    write_compound_file(path, root)
+    return {'path': path, 'attachments': len(attachments), 'attachment_bytes': sum(a[2] for a in attachments)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write a synthetic large Outlook .msg file')
+    parser.add_argument('path', help='Output .msg path')
+    parser.add_argument('--attachment-mb', type=float, nargs='+', default=[50, 50, 50],
+                        help='Sizes of the PDF attachments (MB)')
+    parser.add_argument('--seed', type=int, default=1, help='Content random seed')
+    args = parser.parse_args()
+
+    summary = write_large_msg(args.path, [int(mb * 1024 * 1024) for mb in args.attachment_mb], args.seed)
+    print(f"Wrote {summary['path']}: {summary['attachments']} attachments, "
+          f"{summary['attachment_bytes'] / 1024 / 1024:.1f} MB")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""
+Large .msg Memory Benchmark
+Writes a synthetic Outlook message with large PDF attachments
+(benchmarks/msg_builder.py) and measures the peak RSS of parsing it and
+saving its attachments, each intake strategy in a fresh process:
+
+    extract_msg  extract_msg.Message() with eager attachments, bytes written out
+    lazy         EmailParser handles, each attachment read whole (att.data)
+    streaming    EmailParser.extract_attachments, attachments streamed in chunks
+
+Usage:
+    python -m benchmarks.msg_memory_bench --attachment-mb 50 50 50
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+MODES = ('extract_msg', 'lazy', 'streaming')
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (ru_maxrss is KB on Linux)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def worker(mode: str, msg_path: str, output_dir: str) -> Dict:
+    """Run one intake strategy in this process and report its peak RSS"""
+    import extract_msg
+    from src.email_intake.parser import EmailParser
+
+    parser = EmailParser()
+    baseline = peak_rss_mb()
+    written = 0
+
+    if mode == 'extract_msg':
+        msg = extract_msg.Message(msg_path)
+        for att in msg.attachments:
+            with open(os.path.join(output_dir, att.longFilename), 'wb') as f:
+                written += f.write(att.data)
+        msg.close()
+    elif mode == 'lazy':
+        metadata = parser.parse_msg_file(msg_path)
+        for att in metadata.attachments:
+            if att.parseable:
+                with open(os.path.join(output_dir, att.filename), 'wb') as f:
+                    written += f.write(att.data)
+    else:
+        metadata = parser.parse_msg_file(msg_path)
+        written = sum(info.size for info in parser.extract_attachments(metadata, output_dir, kinds={'pdf'}))
+
+    return {
+        'mode': mode,
+        'written_mb': round(written / 1024 / 1024, 1),
+        'baseline_rss_mb': round(baseline, 1),
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        'delta_rss_mb': round(peak_rss_mb() - baseline, 1),
+    }
+
+
+def run_benchmark(attachment_mb: List[float], seed: int = 1) -> List[Dict]:
+    """
+    Build the message once and measure every mode in its own process
+
+    Returns:
+        One result dictionary per mode
+    """
+    from benchmarks.msg_builder import write_large_msg
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix='dt-agent-msg-bench-') as scratch:
+        msg_path = os.path.join(scratch, 'large.msg')
+        write_large_msg(msg_path, [int(mb * 1024 * 1024) for mb in attachment_mb], seed)
+        msg_mb = os.path.getsize(msg_path) / 1024 / 1024
+
+        for mode in MODES:
+            output_dir = tempfile.mkdtemp(dir=scratch, prefix=f'{mode}-')
+            completed = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.msg_memory_bench', '--worker', mode, msg_path, output_dir],
+                cwd=str(project_root), capture_output=True, text=True, check=True
+            )
+            result = json.loads(completed.stdout.strip().splitlines()[-1])
+            result['msg_mb'] = round(msg_mb, 1)
+            results.append(result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure peak memory of large .msg intake')
+    parser.add_argument('--attachment-mb', type=float, nargs='+', default=[50, 50, 50],
+                        help='Sizes of the PDF attachments (MB)')
+    parser.add_argument('--seed', type=int, default=1, help='Content random seed')
+    parser.add_argument('--worker', nargs=3, metavar=('MODE', 'MSG', 'OUTPUT_DIR'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        mode, msg_path, output_dir = args.worker
+        print(json.dumps(worker(mode, msg_path, output_dir)))
+        return 0
+
+    results = run_benchmark(args.attachment_mb, args.seed)
+    print("\n=== Large .msg Memory Benchmark ===")
+    print(f"  message: {results[0]['msg_mb']} MB, attachments: {', '.join(f'{mb:g}' for mb in args.attachment_mb)} MB")
+    print(f"  {'mode':<12} {'written_mb':>10} {'peak_rss_mb':>12} {'delta_rss_mb':>13}")
+    for row in results:
+        print(f"  {row['mode']:<12} {row['written_mb']:>10} {row['peak_rss_mb']:>12} {row['delta_rss_mb']:>13}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""
+Parallel PDF Page Benchmark
+Times PDFParser on a generated distributor catalog
+(mail_corpus.build_catalog_pdf: a ruled product table on every page) with
+the previous sequential pdfplumber loop (kept verbatim below), the current
+serial path (pages closed after parsing) and page ranges spread over worker
+processes, and checks all return the same products in the same order.
+
+Also reports the peak traced memory (tracemalloc, in a separate run) of the
+previous loop and the current serial path. The speedup is bounded by the
+CPU cores available (reported).
+
+Usage:
+    python -m benchmarks.pdf_parallel_bench
+    python -m benchmarks.pdf_parallel_bench --pages 60 --rows 40 --workers 2 4 8
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import pdfplumber
+
+from benchmarks.mail_corpus import build_catalog_pdf
+from src.document_processor.excel_parser import ProductRow
+from src.document_processor.pdf_parser import PDFParser
+
+
+class SequentialPDFParser(PDFParser):
+    """The previous pdfplumber parse: one pass over pdf.pages, pages kept open"""
+
+    def _parse_with_pdfplumber(self, filepath: str) -> List[ProductRow]:
+        """Previous implementation, kept verbatim as the baseline"""
+        products = []
+
+        try:
+            with pdfplumber.open(filepath) as pdf:
+                for page_num, page in enumerate(pdf.pages, 1):
+                    # Try to extract tables first
+                    tables = page.extract_tables()
+
+                    if tables:
+                        for table in tables:
+                            table_products = self._extract_products_from_table(table, page_num)
+                            products.extend(table_products)
+
+                    # Also extract text and look for product patterns
+                    text = page.extract_text()
+                    if text:
+                        text_products = self._extract_products_from_text(text, page_num)
+                        products.extend(text_products)
+
+        except Exception as e:
+            logging.getLogger(__name__).error(f"Error with pdfplumber: {e}")
+            raise
+
+        return products
+
+
+def products_of(products: List[ProductRow]) -> List:
+    return [(p.sku, p.description, p.quantity, p.unit_price, p.row_number, p.raw_data['page']) for p in products]
+
+
+def timed(parser: PDFParser, path: str) -> Dict:
+    """Wall time and products of one parse, and peak traced memory of a second (traced, slower) one"""
+    start = time.perf_counter()
+    products = parser.parse_pdf(path)
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    parser.parse_pdf(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'seconds': round(seconds, 2), 'peak_mb': round(peak / 1024 / 1024, 1), 'products': products_of(products)}
+
+
+def run_benchmark(pages: int, rows: int, workers: List[int], seed: int = 1) -> List[Dict]:
+    """
+    Parse one generated catalog with each mode
+
+    Returns:
+        One result dictionary per mode ("sequential", "serial", "N workers")
+    """
+    with tempfile.TemporaryDirectory(prefix='dt-agent-pdf-parallel-') as scratch:
+        path = os.path.join(scratch, 'catalog.pdf')
+        with open(path, 'wb') as f:
+            f.write(build_catalog_pdf(random.Random(seed), pages=pages, rows=rows))
+
+        modes = [('sequential', SequentialPDFParser(use_ocr=False)), ('serial', PDFParser(use_ocr=False, max_workers=1))]
+        modes += [(f'{count} workers', PDFParser(use_ocr=False, max_workers=count)) for count in workers]
+        results = []
+        for mode, parser in modes:
+            result = timed(parser, path)
+            if mode.endswith('workers'):
+                result['peak_mb'] = None  # Pages are parsed in the workers, not traced here
+            results.append({'mode': mode, **result})
+
+    expected = results[0]['products']
+    for result in results:
+        result['identical_products'] = result['products'] == expected
+        result['speedup'] = round(results[0]['seconds'] / result['seconds'], 2) if result['seconds'] else 0.0
+        result['products'] = len(result['products'])
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark page-parallel pdfplumber parsing')
+    parser.add_argument('--pages', type=int, default=60, help='Catalog pages')
+    parser.add_argument('--rows', type=int, default=40, help='Product rows per page')
+    parser.add_argument('--workers', type=int, nargs='+', default=[2, 4], help='Worker process counts')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed')
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    results = run_benchmark(args.pages, args.rows, args.workers, args.seed)
+    print("\n=== Parallel PDF Page Benchmark ===")
+    print(f"  catalog: {args.pages} pages x {args.rows} rows; CPU cores: {os.cpu_count()}")
+    print(f"  {'mode':<12} {'products':>9} {'seconds':>8} {'speedup':>8} {'peak_mb':>8} {'identical':>10}")
+    for row in results:
+        peak = '-' if row['peak_mb'] is None else row['peak_mb']
+        print(f"  {row['mode']:<12} {row['products']:>9} {row['seconds']:>8} {row['speedup']:>7}x {peak:>8} "
+              f"{str(row['identical_products']):>10}")
+    return 0 if all(row['identical_products'] for row in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
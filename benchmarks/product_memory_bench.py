@@ -0,0 +1,162 @@
+"""
+Product Memory Benchmark
+Measures the memory a parsed price list keeps alive, from the sheet's
+ExcelSheetData through the unified products, with the previous row storage
+(a to_dict('records') copy of the sheet, a dict copy of its row per
+ProductRow, __dict__-based dataclasses) and with the current one (slot
+dataclasses whose raw_data is a RowRef into the sheet's shared SheetTable).
+
+Memory is traced with tracemalloc from the frame's creation on, and counted
+after the frame variable is dropped, so the current storage pays for the frame
+it keeps while the previous one pays for its dict copies. Also times
+serializing every product's raw_data, which the lazy references defer.
+
+Usage:
+    python -m benchmarks.product_memory_bench
+    python -m benchmarks.product_memory_bench --rows 100000 250000
+"""
+
+import argparse
+import dataclasses
+import gc
+import logging
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import pandas as pd
+
+from benchmarks.product_rows_bench import build_price_list
+from src.document_processor.excel_parser import ExcelParser, ExcelSheetData
+from src.document_processor.unifier import DataUnifier
+
+
+@dataclass
+class DictProductRow:
+    """The previous ProductRow: __dict__ dataclass with its own raw_data dict"""
+    sku: str
+    description: str
+    quantity: int
+    unit_price: float
+    total_price: Optional[float] = None
+    category: Optional[str] = None
+    row_number: int = 0
+    raw_data: Dict[str, Any] = None
+    confidence: float = 1.0
+
+
+@dataclass
+class DictUnifiedProduct:
+    """The previous UnifiedProduct: __dict__ dataclass"""
+    sku: str
+    description: str
+    quantity: int
+    unit_price: float
+    total_price: Optional[float] = None
+    source: str = "unknown"
+    source_file: Optional[str] = None
+    raw_data: Dict[str, Any] = field(default_factory=dict)
+    confidence: float = 1.0
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+class DictRowsExcelParser(ExcelParser):
+    """ExcelParser returning the previous storage: row dicts per product and per sheet"""
+
+    def _extract_products_from_dataframe(self, df: pd.DataFrame, sheet_name: str, **kwargs) -> ExcelSheetData:
+        data = super()._extract_products_from_dataframe(df, sheet_name, **kwargs)
+        headers, values = list(df.columns), df.values
+        products = [
+            DictProductRow(
+                sku=p.sku, description=p.description, quantity=p.quantity, unit_price=p.unit_price,
+                total_price=p.total_price, row_number=p.row_number,
+                raw_data=dict(zip(headers, values[p.row_number - 2])),
+            )
+            for p in data.products
+        ]
+        return ExcelSheetData(sheet_name=sheet_name, headers=headers, products=products,
+                              raw_data=df.to_dict('records'))
+
+
+def unify_dicts(products: List[DictProductRow]) -> List[DictUnifiedProduct]:
+    """DataUnifier.unify_products into the previous UnifiedProduct"""
+    return [
+        DictUnifiedProduct(
+            sku=p.sku, description=p.description, quantity=p.quantity, unit_price=p.unit_price,
+            total_price=p.total_price, source='excel', raw_data=p.raw_data or {}, confidence=p.confidence,
+            metadata={"row_number": p.row_number, "category": p.category},
+        )
+        for p in products
+    ]
+
+
+def measure(parser: ExcelParser, unify, rows: int, seed: int) -> Dict:
+    """Retained memory of one price list parsed and unified, and the raw_data serialization time"""
+    gc.collect()
+    tracemalloc.start()
+    df = build_price_list(random.Random(seed), rows)
+    sheet = parser._extract_products_from_dataframe(df, 'Quote')
+    unified = unify(sheet.products)
+    del df
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    serialized = [dataclasses.asdict(product)['raw_data'] for product in unified]
+    serialize_s = time.perf_counter() - start
+    return {
+        'products': len(unified),
+        'retained_mb': round(retained / 1024 / 1024, 1),
+        'bytes_per_product': round(retained / max(len(unified), 1)),
+        'serialize_ms': round(serialize_s * 1000),
+        'raw_data': serialized,
+    }
+
+
+def run_benchmark(rows: int, seed: int = 1) -> Dict:
+    """
+    Parse and unify one generated price list with both storages
+
+    Returns:
+        Result dictionary per storage plus the raw_data parity check
+    """
+    unifier = DataUnifier()
+    dict_rows = measure(DictRowsExcelParser(), unify_dicts, rows, seed)
+    shared = measure(ExcelParser(), lambda products: unifier.unify_products({'excel': products}), rows, seed)
+    clean = lambda records: [{k: None if pd.isna(v) else v for k, v in r.items()} for r in records]
+    identical = clean(dict_rows.pop('raw_data')) == clean(shared.pop('raw_data'))
+    return {'rows': rows, 'dict_rows': dict_rows, 'shared_table': shared, 'identical_raw_data': identical}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark memory kept by parsed product rows')
+    parser.add_argument('--rows', type=int, nargs='+', default=[100000], help='Price-list sizes (rows)')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed')
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    print("\n=== Product Memory Benchmark ===")
+    print(f"  {'rows':>8} {'storage':<13} {'products':>9} {'retained MB':>12} {'B/product':>10} "
+          f"{'serialize ms':>13} {'identical':>10}")
+    identical = True
+    for rows in args.rows:
+        result = run_benchmark(rows, args.seed)
+        identical = identical and result['identical_raw_data']
+        for storage in ('dict_rows', 'shared_table'):
+            row = result[storage]
+            print(f"  {rows:>8} {storage:<13} {row['products']:>9} {row['retained_mb']:>12} "
+                  f"{row['bytes_per_product']:>10} {row['serialize_ms']:>13} {str(result['identical_raw_data']):>10}")
+    return 0 if identical else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
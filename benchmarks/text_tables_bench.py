@@ -0,0 +1,110 @@
+"""
+Plain Text Table Benchmark
+Times extract_text_tables (src/email_intake/text_tables.py) on plain text
+reply chains with space-aligned, tab-delimited and mixed product tables
+(mail_corpus.build_text_table), at growing body sizes to show it stays
+linear, and counts the four-column tables found against the previous
+tab-only splitter.
+
+Usage:
+    python -m benchmarks.text_tables_bench
+    python -m benchmarks.text_tables_bench --sizes 100000 1000000 10000000
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from benchmarks.mail_corpus import build_text_table, build_thread_text
+from src.email_intake.text_tables import extract_text_tables
+
+STYLES = ('spaces', 'tabs', 'mixed')
+
+
+def legacy_text_tables(text: str) -> List[List[List[str]]]:
+    """The previous EmailParser._extract_text_tables loop (tab splitting only)"""
+    tables = []
+    current_table = []
+    for line in text.split('\n'):
+        if '\t' in line or line.count('  ') >= 2:
+            parts = [p.strip() for p in line.split('\t') if p.strip()]
+            if len(parts) >= 2:
+                current_table.append(parts)
+        elif current_table:
+            if len(current_table) > 1:
+                tables.append(current_table)
+            current_table = []
+    if len(current_table) > 1:
+        tables.append(current_table)
+    return tables
+
+
+def build_body(target_chars: int, rng: random.Random, rows: int) -> str:
+    """Reply chain text with a product table (rotating styles) after every ~8 KB of prose"""
+    parts = []
+    size = 0
+    while size < target_chars:
+        part = build_thread_text(8 * 1024, rng) + '\n' + build_text_table(rng, rows, STYLES[len(parts) % 3]) + '\n'
+        parts.append(part)
+        size += len(part)
+    return ''.join(parts)
+
+
+def run_benchmark(sizes: List[int], rows: int, seed: int = 1) -> List[Dict]:
+    """
+    Time both extractors per body size
+
+    Returns:
+        One result dictionary per size
+    """
+    results = []
+    for size in sizes:
+        text = build_body(size, random.Random(seed), rows)
+
+        start = time.perf_counter()
+        tables = extract_text_tables(text)
+        elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        legacy = legacy_text_tables(text)
+        legacy_elapsed = time.perf_counter() - start
+
+        product_tables = [t for t in tables if t['headers'] == ['SKU', 'Description', 'Qty', 'Unit Price']]
+        results.append({
+            'chars': len(text),
+            'elapsed_ms': round(elapsed * 1000, 1),
+            'us_per_kb': round(elapsed * 1e6 / (len(text) / 1024), 1),
+            'legacy_ms': round(legacy_elapsed * 1000, 1),
+            'product_tables': len(product_tables),
+            'complete_rows': sum(1 for t in product_tables for row in t['data'] if all(row)),
+            'legacy_4col_tables': sum(1 for t in legacy if all(len(row) == 4 for row in t)),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark plain text table extraction')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000, 5_000_000],
+                        help='Body sizes (characters)')
+    parser.add_argument('--rows', type=int, default=20, help='Product rows per table')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed')
+    args = parser.parse_args()
+
+    results = run_benchmark(args.sizes, args.rows, args.seed)
+    print("\n=== Plain Text Table Benchmark ===")
+    columns = list(results[0])
+    print('  ' + ' '.join(f'{column:>18}' for column in columns))
+    for row in results:
+        print('  ' + ' '.join(f'{row[column]:>18}' for column in columns))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,207 @@
+"""
+Email Automation Service Benchmark
+Runs the full watcher + processing service against the fake IMAP server (or
+the mock Graph server) and reports throughput, latency percentiles and peak RSS.
+
+Usage:
+    python -m benchmarks.watcher_bench -n 200 --interval 1
+    python -m benchmarks.watcher_bench -n 200 --method graph
+"""
+
+import argparse
+import copy
+import json
+import logging
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+from email import message_from_bytes
+from pathlib import Path
+from typing import Dict, List
+
+import yaml
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from benchmarks.fake_imap import FakeIMAPServer
+from benchmarks.mail_corpus import generate_corpus
+from benchmarks.mock_graph import MockGraphServer
+from src.automation.service import EmailAutomationService
+
+logger = logging.getLogger(__name__)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (ru_maxrss is KB on Linux)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def build_config(base_config: Dict, server, output_dir: str, interval: float) -> Dict:
+    """Point the service configuration at the fake server and a scratch output directory"""
+    config = copy.deepcopy(base_config)
+    config.setdefault('paths', {})['base'] = output_dir
+    config.setdefault('processing', {})['ocr_enabled'] = False
+    config['processing']['email_cache'] = {'enabled': False}  # Every message is new
+    automation = config.setdefault('email_automation', {})
+    automation['enabled'] = True
+    if isinstance(server, MockGraphServer):
+        automation['method'] = 'graph'
+        automation['graph'] = {
+            'tenant_id': 'mock-tenant',
+            'client_id': 'bench',
+            'client_secret': 'bench',
+            'mailbox': 'quotes@dayo-tech.com',
+            'base_url': server.base_url,
+            'token_url': server.token_url,
+            'delta_token_path': os.path.join(output_dir, 'graph_delta.json'),
+            'check_interval_seconds': interval,
+        }
+    else:
+        host, port = server.address
+        automation['method'] = 'imap'
+        automation['imap'] = {
+            'server': host,
+            'port': port,
+            'use_ssl': False,
+            'username': 'bench',
+            'password': 'bench',
+            'folder': 'INBOX',
+            'processed_folder': 'Processed',
+            'check_interval_seconds': interval,
+        }
+    automation['filters'] = {'has_attachments': True}
+    automation.pop('schedule', None)  # Fixed --interval polling
+    return config
+
+
+def run_benchmark(count: int, interval: float, rate: float, config_path: str,
+                  seed: int = 1, timeout: float = 600.0, method: str = 'imap') -> Dict:
+    """
+    Deliver ``count`` synthetic emails and let the service drain the mailbox
+
+    Args:
+        count: Number of emails in the corpus
+        interval: Watcher check interval in seconds
+        rate: Delivery rate in messages/second (0 = deliver everything up front)
+        config_path: Base configuration file
+        seed: Corpus random seed
+        timeout: Give up after this many seconds
+        method: "imap" (fake IMAP server) or "graph" (mock Graph server)
+
+    Returns:
+        Result dictionary (throughput, latency percentiles, peak RSS)
+    """
+    with open(config_path, 'r', encoding='utf-8') as f:
+        base_config = yaml.safe_load(f)
+
+    corpus = list(generate_corpus(count, seed))
+    rss_before = peak_rss_mb()
+
+    server = MockGraphServer() if method == 'graph' else FakeIMAPServer()
+    deliver = server.mailbox.deliver if method == 'graph' else server.store.deliver
+
+    with server, tempfile.TemporaryDirectory(prefix='dt-agent-bench-') as output_dir:
+        config = build_config(base_config, server, output_dir, interval)
+        service = EmailAutomationService(config)
+
+        delivered_at: Dict[str, float] = {}
+        latencies: List[float] = []
+        failures: List[str] = []
+        done = threading.Event()
+        process_email = service.processor.process_email
+
+        def timed_process_email(email_data: Dict) -> Dict:
+            result = process_email(email_data)
+            latency = time.monotonic() - delivered_at.get(email_data.get('message_id'), time.monotonic())
+            latencies.append(latency)
+            if not result.get('success'):
+                failures.append(result.get('error', 'unknown error'))
+            if len(latencies) >= count:
+                done.set()
+            return result
+
+        service.processor.process_email = timed_process_email
+        worker = threading.Thread(target=service.start, daemon=True)
+
+        start = time.monotonic()
+        if rate <= 0:
+            for raw in corpus:
+                delivered_at[message_from_bytes(raw)['Message-ID']] = time.monotonic()
+                deliver(raw)
+            worker.start()
+        else:
+            worker.start()
+            for raw in corpus:
+                delivered_at[message_from_bytes(raw)['Message-ID']] = time.monotonic()
+                deliver(raw)
+                time.sleep(1.0 / rate)
+
+        finished = done.wait(timeout)
+        elapsed = time.monotonic() - start
+        service.stop()
+        worker.join(timeout=30)
+
+    return {
+        'method': method,
+        'messages': count,
+        'processed': len(latencies),
+        'failed': len(failures),
+        'completed': finished,
+        'elapsed_seconds': round(elapsed, 3),
+        'messages_per_second': round(len(latencies) / elapsed, 3) if elapsed else 0.0,
+        'latency_p50_seconds': round(percentile(latencies, 50), 3),
+        'latency_p95_seconds': round(percentile(latencies, 95), 3),
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        'rss_before_mb': round(rss_before, 1),
+        'sample_errors': sorted(set(failures))[:5],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the email automation service end to end')
+    parser.add_argument('-n', '--count', type=int, default=100, help='Number of synthetic emails')
+    parser.add_argument('--interval', type=float, default=1.0, help='Watcher check interval (seconds)')
+    parser.add_argument('--rate', type=float, default=0.0,
+                        help='Delivery rate in messages/second (0 = all up front)')
+    parser.add_argument('--method', choices=['imap', 'graph'], default='imap',
+                        help='Watcher to benchmark (fake IMAP or mock Graph server)')
+    parser.add_argument('--config', default='config/config.yaml.example', help='Base configuration file')
+    parser.add_argument('--seed', type=int, default=1, help='Corpus random seed')
+    parser.add_argument('--timeout', type=float, default=600.0, help='Maximum run time (seconds)')
+    parser.add_argument('--json', dest='json_path', help='Also write results to this JSON file')
+    parser.add_argument('--verbose', action='store_true', help='Keep service INFO logging')
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.disable(logging.ERROR)
+
+    result = run_benchmark(args.count, args.interval, args.rate, args.config, args.seed,
+                           args.timeout, args.method)
+
+    print("\n=== Email Automation Benchmark ===")
+    for key, value in result.items():
+        print(f"  {key:<22} {value}")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+
+    return 0 if result['completed'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
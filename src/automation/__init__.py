@@ -5,7 +5,8 @@ Handles automatic email watching and processing
 
 from .email_processor import EmailProcessor
 from .imap_watcher import IMAPWatcher
+from .graph_watcher import GraphWatcher
 from .watcher import EmailWatcher
 
-__all__ = ['EmailProcessor', 'IMAPWatcher', 'EmailWatcher']
+__all__ = ['EmailProcessor', 'IMAPWatcher', 'GraphWatcher', 'EmailWatcher']
 
@@ -85,10 +85,16 @@ class EmailProcessor:
                 except:
                     pass
             
+            if not result.get('success'):
+                return {
+                    'success': False,
+                    'error': result.get('error', 'Unknown error')
+                }
+            
             return {
                 'success': True,
                 'quote_path': result.get('quote_path'),
-                'products_count': result.get('product_count', 0),
+                'products_count': result.get('products_count', 0),
                 'customer_name': result.get('customer_name'),
                 'product_name': result.get('product_name'),
                 'total_price': result.get('total_price', 0)
@@ -0,0 +1,403 @@
+"""
+Microsoft Graph Email Watcher
+Watches an Exchange Online mailbox folder using Graph delta queries
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import List, Dict, Optional, Set, Tuple
+import logging
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+from .watcher import EmailWatcher
+
+logger = logging.getLogger(__name__)
+
+
+class GraphWatcher(EmailWatcher):
+    """
+    Microsoft Graph based email watcher
+
+    Uses ``/messages/delta`` so each cycle only transfers changes since the
+    previous one. The delta link is persisted to disk, headers are fetched
+    with ``$select`` and the full MIME message (with attachments) is only
+    downloaded for emails that pass the filters. Moves are queued and sent
+    with JSON batching on ``flush()``.
+    """
+
+    SELECT_FIELDS = 'id,subject,from,receivedDateTime,hasAttachments,internetMessageId,isRead'
+    BATCH_LIMIT = 20  # Graph JSON batching maximum requests per batch
+    RETRY_STATUSES = (429, 503, 504)
+
+    def __init__(self, config: Dict):
+        """
+        Initialize Graph watcher
+
+        Args:
+            config: Configuration dictionary
+        """
+        super().__init__(config)
+        self.graph_config = self.email_config.get('graph', {})
+        self.tenant_id = self.graph_config.get('tenant_id')
+        self.client_id = self.graph_config.get('client_id')
+        self.client_secret = os.getenv('GRAPH_CLIENT_SECRET') or self.graph_config.get('client_secret')
+        self.mailbox = self.graph_config.get('mailbox')
+        self.folder = self.graph_config.get('folder', 'inbox')
+        self.processed_folder = self.graph_config.get('processed_folder', 'Processed')
+        self.failed_folder = self.graph_config.get('failed_folder', 'Failed')
+        self.max_attempts = max(1, int(self.graph_config.get('max_attempts', 3)))  # Cycles an email may fail in
+        self.check_interval = self.graph_config.get('check_interval_seconds', 30)
+        self.base_url = self.graph_config.get('base_url', 'https://graph.microsoft.com/v1.0').rstrip('/')
+        self.token_url = self.graph_config.get(
+            'token_url',
+            f'https://login.microsoftonline.com/{self.tenant_id}/oauth2/v2.0/token'
+        )
+        self.delta_token_path = self.graph_config.get('delta_token_path', '/data/state/graph_delta.json')
+        self.page_size = self.graph_config.get('page_size', 50)
+        self.max_retries = self.graph_config.get('max_retries', 5)
+        self.timeout = self.graph_config.get('timeout_seconds', 30)
+
+        self.client: Optional['httpx.Client'] = None
+        self._client_lock = threading.RLock()  # stop() may disconnect from the signal handler and the loop
+        self._closing = False
+        self.access_token: Optional[str] = None
+        self.token_expires_at = 0.0
+        self.delta_link, self.attempts = self._load_delta_state()  # attempts: email id -> failed cycles
+        self.pending_delta_link: Optional[str] = None
+        self.pending_moves: List[Dict] = []
+        self.failed_ids: Set[str] = set()  # Emails of this delta batch that failed to process or move
+        self.folder_ids: Dict[str, str] = {}
+
+    @property
+    def user_url(self) -> str:
+        return f"{self.base_url}/users/{self.mailbox}"
+
+    def connect(self) -> bool:
+        """Acquire an access token and resolve the processed folder"""
+        if httpx is None:
+            logger.error("httpx not available. Install with: pip install httpx")
+            return False
+
+        try:
+            logger.info(f"Connecting to Microsoft Graph for mailbox {self.mailbox}")
+            self.client = httpx.Client(timeout=self.timeout)
+            self._refresh_token()
+            self._resolve_folder_id(self.processed_folder)
+            logger.info("Successfully connected to Microsoft Graph")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to connect to Microsoft Graph: {e}")
+            return False
+
+    def disconnect(self):
+        """Flush queued work and close the HTTP client (safe to call more than once, from any thread)"""
+        with self._client_lock:
+            if self.client is None or self._closing:
+                return
+            self._closing = True
+        try:
+            self.flush()
+        except Exception as e:
+            logger.warning(f"Error flushing Graph watcher state: {e}")
+        finally:
+            with self._client_lock:
+                client, self.client = self.client, None
+                self._closing = False
+            client.close()
+            logger.info("Disconnected from Microsoft Graph")
+
+    def _refresh_token(self):
+        """Client credentials grant against the Microsoft identity platform"""
+        response = self.client.post(self.token_url, data={
+            'client_id': self.client_id,
+            'client_secret': self.client_secret,
+            'scope': 'https://graph.microsoft.com/.default',
+            'grant_type': 'client_credentials',
+        })
+        response.raise_for_status()
+        token = response.json()
+        self.access_token = token['access_token']
+        # Refresh a minute early so long cycles don't hit an expired token
+        self.token_expires_at = time.monotonic() + int(token.get('expires_in', 3600)) - 60
+
+    def _request(self, method: str, url: str, **kwargs) -> 'httpx.Response':
+        """
+        Send a Graph request, refreshing the token and honoring Retry-After
+
+        Raises:
+            httpx.HTTPStatusError: If the request still fails after retries
+        """
+        headers = dict(kwargs.pop('headers', None) or {})
+        for attempt in range(self.max_retries + 1):
+            if time.monotonic() >= self.token_expires_at:
+                self._refresh_token()
+
+            headers['Authorization'] = f'Bearer {self.access_token}'
+            response = self.client.request(method, url, headers=headers, **kwargs)
+
+            if response.status_code == 401 and attempt == 0:
+                self._refresh_token()
+                continue
+            if response.status_code in self.RETRY_STATUSES and attempt < self.max_retries:
+                wait = self._retry_after(response.headers.get('Retry-After'), attempt)
+                logger.warning(f"Graph throttled ({response.status_code}), retrying in {wait:.1f}s")
+                time.sleep(wait)
+                continue
+
+            response.raise_for_status()
+            return response
+
+        response.raise_for_status()
+        return response
+
+    def _retry_after(self, header: Optional[str], attempt: int) -> float:
+        """Seconds to wait: Retry-After header if present, else exponential backoff"""
+        try:
+            return max(0.0, float(header))
+        except (TypeError, ValueError):
+            return min(2 ** attempt, 60)
+
+    def _resolve_folder_id(self, name: str) -> str:
+        """Find (or create) a top-level mail folder by display name"""
+        if name in self.folder_ids:
+            return self.folder_ids[name]
+
+        literal = name.replace("'", "''")  # OData string literals escape quotes by doubling them
+        response = self._request('GET', f"{self.user_url}/mailFolders", params={
+            '$filter': f"displayName eq '{literal}'",
+            '$select': 'id,displayName',
+        })
+        folders = response.json().get('value', [])
+        if folders:
+            folder_id = folders[0]['id']
+        else:
+            response = self._request('POST', f"{self.user_url}/mailFolders", json={'displayName': name})
+            folder_id = response.json()['id']
+            logger.info(f"Created mail folder {name}")
+
+        self.folder_ids[name] = folder_id
+        return folder_id
+
+    def _load_delta_state(self) -> Tuple[Optional[str], Dict[str, int]]:
+        """Load persisted delta link and failed-attempt counts for this mailbox/folder"""
+        try:
+            with open(self.delta_token_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None, {}
+
+        if state.get('mailbox') != self.mailbox or state.get('folder') != self.folder:
+            return None, {}
+        return state.get('delta_link'), dict(state.get('attempts') or {})
+
+    def _save_delta_state(self):
+        """Persist delta link and failed-attempt counts atomically"""
+        directory = os.path.dirname(self.delta_token_path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.graph_delta_')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'mailbox': self.mailbox, 'folder': self.folder, 'delta_link': self.delta_link,
+                       'attempts': self.attempts}, f)
+        os.replace(temp_path, self.delta_token_path)
+
+    def fetch_new_emails(self) -> List[Dict]:
+        """
+        Fetch messages added since the last delta sync
+
+        Returns:
+            List of email metadata dictionaries (``raw_data`` is None until
+            ``materialize`` downloads the message)
+        """
+        if not self.client:
+            logger.error("Not connected to Microsoft Graph")
+            return []
+
+        url = self.delta_link or f"{self.user_url}/mailFolders/{self.folder}/messages/delta"
+        params = None if self.delta_link else {'$select': self.SELECT_FIELDS}
+        headers = {'Prefer': f'odata.maxpagesize={self.page_size}'}
+
+        emails = []
+        try:
+            while url:
+                data = self._request('GET', url, params=params, headers=headers).json()
+                params = None  # next/delta links already carry the query
+
+                for item in data.get('value', []):
+                    if '@removed' in item or item.get('isRead'):
+                        continue
+                    sender = item.get('from', {}).get('emailAddress', {})
+                    emails.append({
+                        'id': item['id'],
+                        'from': f"{sender.get('name', '')} <{sender.get('address', '')}>",
+                        'subject': item.get('subject') or '',
+                        'date': item.get('receivedDateTime', ''),
+                        'has_attachments': item.get('hasAttachments', False),
+                        'raw_data': None,  # Downloaded lazily by materialize()
+                        'message_id': item.get('internetMessageId', ''),
+                    })
+
+                url = data.get('@odata.nextLink')
+                if not url:
+                    self.pending_delta_link = data.get('@odata.deltaLink')
+        except Exception as e:
+            logger.error(f"Error fetching emails from Graph: {e}")
+            return []
+
+        if emails:
+            logger.info(f"Found {len(emails)} new email(s)")
+        else:
+            logger.debug("No new emails found")
+        return emails
+
+    def materialize(self, email_data: Dict) -> Optional[Dict]:
+        """
+        Download the full MIME message (including attachments) to a temp file
+
+        Args:
+            email_data: Email metadata from fetch_new_emails
+
+        Returns:
+            Email metadata with ``raw_data`` set, or None on failure
+        """
+        if email_data.get('raw_data'):
+            return email_data
+
+        try:
+            temp_dir = os.path.join(tempfile.gettempdir(), 'dt-agent-emails')
+            os.makedirs(temp_dir, exist_ok=True)
+            name = hashlib.sha1(email_data['id'].encode('utf-8')).hexdigest()[:16]
+            temp_file_path = os.path.join(temp_dir, f"graph_{name}.eml")
+
+            response = self._request('GET', f"{self.user_url}/messages/{email_data['id']}/$value")
+            with open(temp_file_path, 'wb') as f:
+                f.write(response.content)
+
+            return {**email_data, 'raw_data': temp_file_path}
+        except Exception as e:
+            logger.error(f"Error downloading email {email_data.get('id')}: {e}")
+            return None
+
+    def mark_as_processed(self, email_id: str, move_to_folder: Optional[str] = None):
+        """
+        Queue email to be moved to the processed folder on the next flush
+
+        Args:
+            email_id: Graph message id
+            move_to_folder: Folder display name (defaults to processed_folder)
+        """
+        try:
+            destination = self._resolve_folder_id(move_to_folder or self.processed_folder)
+            self.pending_moves.append({'id': email_id, 'destination': destination})
+            self.add_to_processed(email_id)
+        except Exception as e:
+            logger.error(f"Error marking email {email_id} as processed: {e}")
+            self.failed_ids.add(email_id)
+
+    def mark_as_failed(self, email_id: str):
+        """Keep the delta link of the current batch from advancing past this email"""
+        self.failed_ids.add(email_id)
+
+    def flush(self):
+        """
+        Send queued moves as JSON batches and persist the delta link
+
+        The delta link only advances when every email of the batch was
+        processed and moved; otherwise the previous link is kept, the next
+        fetch replays the batch and emails already handled are skipped via
+        the processed set. An email that fails in max_attempts cycles (the
+        counts are persisted with the link) is given up on: it is marked
+        processed and moved to failed_folder, so it can't hold the link back.
+        """
+        if not self.client:
+            return
+
+        self._send_moves()
+        if self._give_up_failed():
+            self._send_moves()
+
+        if self.failed_ids or self.pending_moves:
+            if self.pending_delta_link:
+                logger.warning(f"Keeping previous delta link: {len(self.failed_ids)} email(s) failed, "
+                               f"{len(self.pending_moves)} move(s) unsent; batch will be fetched again")
+            self.failed_ids.clear()
+            self.pending_delta_link = None
+            self._save_delta_state()
+        elif self.pending_delta_link:
+            self.delta_link = self.pending_delta_link
+            self.pending_delta_link = None
+            self.attempts.clear()  # Every email of the window was handled
+            self._save_delta_state()
+
+    def _give_up_failed(self) -> int:
+        """
+        Count this cycle's failures and queue emails out of attempts for the failed folder
+
+        Returns:
+            Number of emails given up on
+        """
+        exhausted = []
+        for email_id in self.failed_ids:
+            self.attempts[email_id] = self.attempts.get(email_id, 0) + 1
+            if self.attempts[email_id] >= self.max_attempts:
+                exhausted.append(email_id)
+
+        for email_id in exhausted:
+            logger.error(f"Email {email_id} failed in {self.attempts.pop(email_id)} cycles, "
+                         f"moving it to {self.failed_folder}")
+            self.failed_ids.discard(email_id)
+            self.add_to_processed(email_id)
+            try:
+                destination = self._resolve_folder_id(self.failed_folder)
+                self.pending_moves.append({'id': email_id, 'destination': destination, 'given_up': True})
+            except Exception as e:
+                logger.error(f"Error resolving folder {self.failed_folder}: {e}")
+        return len(exhausted)
+
+    def _send_moves(self):
+        """Send queued moves as JSON batches, retrying throttled ones (unsent moves stay queued)"""
+        while self.pending_moves:
+            chunk = self.pending_moves[:self.BATCH_LIMIT]
+            requests = [
+                {
+                    'id': str(i),
+                    'method': 'POST',
+                    'url': f"/users/{self.mailbox}/messages/{move['id']}/move",
+                    'headers': {'Content-Type': 'application/json'},
+                    'body': {'destinationId': move['destination']},
+                }
+                for i, move in enumerate(chunk)
+            ]
+            try:
+                response = self._request('POST', f"{self.base_url}/$batch", json={'requests': requests})
+            except Exception as e:
+                logger.error(f"Error sending move batch: {e}")
+                break
+
+            retry = []
+            wait = 0.0
+            for result in response.json().get('responses', []):
+                move = chunk[int(result['id'])]
+                status = result.get('status', 500)
+                if status in self.RETRY_STATUSES:
+                    retry.append(move)
+                    wait = max(wait, self._retry_after(result.get('headers', {}).get('Retry-After'), 0))
+                elif status >= 400:
+                    logger.warning(f"Failed to move email {move['id']}: HTTP {status}")
+                    if not move.get('given_up'):
+                        self.failed_ids.add(move['id'])
+                else:
+                    folder = self.failed_folder if move.get('given_up') else 'processed folder'
+                    logger.info(f"Moved email {move['id']} to {folder}")
+
+            self.pending_moves = retry + self.pending_moves[len(chunk):]
+            if retry:
+                logger.warning(f"{len(retry)} move(s) throttled, retrying in {wait:.1f}s")
+                time.sleep(wait)
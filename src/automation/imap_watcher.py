@@ -36,15 +36,19 @@ class IMAPWatcher(EmailWatcher):
         self.folder = self.imap_config.get('folder', 'INBOX')
         self.processed_folder = self.imap_config.get('processed_folder', 'Processed')
         self.check_interval = self.imap_config.get('check_interval_seconds', 30)
+        self.use_ssl = self.imap_config.get('use_ssl', True)
         
-        self.imap: Optional[imaplib.IMAP4_SSL] = None
+        self.imap: Optional[imaplib.IMAP4] = None
         self.last_check_id = None  # Track last processed email ID
     
     def connect(self) -> bool:
         """Connect to IMAP server"""
         try:
             logger.info(f"Connecting to IMAP server {self.server}:{self.port}")
-            self.imap = imaplib.IMAP4_SSL(self.server, self.port)
+            if self.use_ssl:
+                self.imap = imaplib.IMAP4_SSL(self.server, self.port)
+            else:
+                self.imap = imaplib.IMAP4(self.server, self.port)
             self.imap.login(self.username, self.password)
             logger.info("Successfully connected to IMAP server")
             return True
@@ -0,0 +1,123 @@
+"""
+Adaptive Polling Scheduler
+Chooses how long the watcher loop sleeps between mailbox checks
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, time as dt_time
+from typing import Dict, List, Optional, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+DAY_NAMES = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']
+
+
+@dataclass
+class ScheduleProfile:
+    """Interval bounds that apply during a time window (e.g. business hours)"""
+    name: str
+    min_interval: float
+    max_interval: float
+    days: List[int] = field(default_factory=lambda: list(range(7)))  # 0 = Monday
+    start: dt_time = dt_time(0, 0)
+    end: dt_time = dt_time(23, 59, 59)
+
+    def matches(self, now: datetime) -> bool:
+        """Check if profile is active at ``now`` (windows may wrap past midnight)"""
+        if now.weekday() not in self.days:
+            return False
+        current = now.time()
+        if self.start <= self.end:
+            return self.start <= current < self.end
+        return current >= self.start or current < self.end
+
+
+class PollingScheduler:
+    """
+    Adaptive interval between mailbox checks
+
+    After a cycle that found email the interval drops to the active
+    profile's minimum (bursts usually come together); every empty cycle
+    multiplies it by ``backoff_factor`` up to the maximum. Time spent
+    processing is subtracted from the sleep. Without a ``schedule`` config
+    section min = max = check interval, i.e. the old fixed polling.
+    """
+
+    def __init__(self, config: Dict, check_interval: float = 30):
+        """
+        Initialize scheduler
+
+        Args:
+            config: Configuration dictionary (reads email_automation.schedule)
+            check_interval: Watcher's configured check interval (default bounds)
+        """
+        schedule = config.get('email_automation', {}).get('schedule', {}) or {}
+        self.backoff_factor = float(schedule.get('backoff_factor', 2.0))
+        self.default_profile = ScheduleProfile(
+            name='default',
+            min_interval=float(schedule.get('min_interval_seconds', check_interval)),
+            max_interval=float(schedule.get('max_interval_seconds', check_interval)),
+        )
+        self.profiles = [self._parse_profile(p) for p in schedule.get('profiles', [])]
+
+        self.interval = self.default_profile.min_interval
+        self.metrics: Dict[str, Union[int, float]] = {
+            'poll_interval_seconds': self.interval,
+            'poll_sleep_seconds': self.interval,
+            'last_fetch_count': 0,
+            'last_cycle_seconds': 0.0,
+        }
+
+    def _parse_profile(self, profile: Dict) -> ScheduleProfile:
+        """Build profile from config, e.g. {name, days: [sun, mon], start: "08:00", end: "19:00", ...}"""
+        days = [DAY_NAMES.index(str(d).lower()[:3]) for d in profile.get('days', DAY_NAMES)]
+        return ScheduleProfile(
+            name=profile.get('name', 'profile'),
+            min_interval=float(profile.get('min_interval_seconds', self.default_profile.min_interval)),
+            max_interval=float(profile.get('max_interval_seconds', self.default_profile.max_interval)),
+            days=days,
+            start=dt_time.fromisoformat(str(profile.get('start', '00:00'))),
+            end=dt_time.fromisoformat(str(profile.get('end', '23:59:59'))),
+        )
+
+    def active_profile(self, now: Optional[datetime] = None) -> ScheduleProfile:
+        """First configured profile matching ``now``, else the default profile"""
+        now = now or datetime.now()
+        for profile in self.profiles:
+            if profile.matches(now):
+                return profile
+        return self.default_profile
+
+    def next_delay(self, fetched: int, elapsed: float, now: Optional[datetime] = None) -> float:
+        """
+        Compute sleep before the next check
+
+        Args:
+            fetched: Number of emails returned by the last fetch
+            elapsed: Seconds the last cycle (fetch + processing) took
+            now: Current time (for profile selection)
+
+        Returns:
+            Seconds to sleep (never negative)
+        """
+        profile = self.active_profile(now)
+
+        if fetched > 0:
+            interval = profile.min_interval
+        else:
+            interval = self.interval * self.backoff_factor
+        self.interval = max(profile.min_interval, min(interval, profile.max_interval))
+
+        delay = max(0.0, self.interval - elapsed)
+        self.metrics.update({
+            'poll_interval_seconds': self.interval,
+            'poll_sleep_seconds': delay,
+            'last_fetch_count': fetched,
+            'last_cycle_seconds': elapsed,
+        })
+        logger.debug(
+            f"poll_interval_seconds={self.interval:.1f} sleep_seconds={delay:.1f} "
+            f"profile={profile.name} fetched={fetched} cycle_seconds={elapsed:.1f}"
+        )
+        return delay
@@ -7,12 +7,15 @@ import time
 import logging
 import signal
 import sys
+import threading
 from typing import Dict, Optional
 from pathlib import Path
 
 from src.automation.watcher import EmailWatcher
 from src.automation.imap_watcher import IMAPWatcher
+from src.automation.graph_watcher import GraphWatcher
 from src.automation.email_processor import EmailProcessor
+from src.automation.scheduler import PollingScheduler
 
 logger = logging.getLogger(__name__)
 
@@ -32,7 +35,11 @@ class EmailAutomationService:
         self.config = config
         self.running = False
         self.watcher: Optional[EmailWatcher] = None
+        self.scheduler: Optional[PollingScheduler] = None
         self.processor = EmailProcessor(config)
+        self._wakeup = threading.Event()
+        self._stop_lock = threading.RLock()  # stop() runs from the signal handler and from start()
+        self._stopped = False
         
         # Set up signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self._signal_handler)
@@ -56,20 +63,24 @@ class EmailAutomationService:
         if method == 'imap':
             self.watcher = IMAPWatcher(self.config)
         elif method == 'graph':
-            # TODO: Implement Graph API watcher
-            logger.error("Microsoft Graph API watcher not yet implemented")
-            return False
+            self.watcher = GraphWatcher(self.config)
         else:
             logger.error(f"Unknown email watching method: {method}")
             return False
         
         return self.watcher.connect()
     
-    def _process_new_emails(self):
-        """Fetch and process new emails"""
+    def _process_new_emails(self) -> int:
+        """
+        Fetch and process new emails
+        
+        Returns:
+            Number of emails fetched this cycle
+        """
         if not self.watcher:
-            return
+            return 0
         
+        emails = []
         try:
             # Fetch new emails
             emails = self.watcher.fetch_new_emails()
@@ -80,6 +91,13 @@ class EmailAutomationService:
                     logger.debug(f"Skipping email: {email_data.get('subject')}")
                     continue
                 
+                # Download full message if the watcher only fetched headers
+                materialized = self.watcher.materialize(email_data)
+                if not materialized:
+                    self.watcher.mark_as_failed(email_data.get('id'))
+                    continue
+                email_data = materialized
+                
                 logger.info(f"Processing email: {email_data.get('subject')}")
                 
                 # Process email
@@ -99,12 +117,18 @@ class EmailAutomationService:
                         f"Failed to process email: {email_data.get('subject')}\n"
                         f"  Error: {result.get('error')}"
                     )
+                    self.watcher.mark_as_failed(email_data.get('id'))
                     
                     # Optionally move failed emails to a different folder
                     # For now, we'll leave them for manual review
+            
+            # Send batched moves / persist sync state
+            self.watcher.flush()
                     
         except Exception as e:
             logger.error(f"Error processing emails: {e}", exc_info=True)
+        
+        return len(emails)
     
     def start(self):
         """Start the email automation service"""
@@ -122,23 +146,36 @@ class EmailAutomationService:
             return
         
         self.running = True
-        check_interval = email_config.get('imap', {}).get('check_interval_seconds', 30)
+        self._stopped = False
+        self._wakeup.clear()
+        self.scheduler = PollingScheduler(self.config, self.watcher.check_interval)
         
-        logger.info(f"Email automation service running (checking every {check_interval} seconds)")
+        logger.info(
+            f"Email automation service running (checking every "
+            f"{self.scheduler.default_profile.min_interval}-{self.scheduler.default_profile.max_interval} seconds)"
+        )
         
         try:
             while self.running:
-                self._process_new_emails()
-                time.sleep(check_interval)
+                cycle_start = time.monotonic()
+                fetched = self._process_new_emails()
+                delay = self.scheduler.next_delay(fetched, time.monotonic() - cycle_start)
+                # Event wait instead of sleep so stop() doesn't wait out a long idle interval
+                self._wakeup.wait(delay)
         except KeyboardInterrupt:
             logger.info("Service interrupted")
         finally:
             self.stop()
     
     def stop(self):
-        """Stop the email automation service"""
+        """Stop the email automation service (later calls return once it is stopped)"""
+        with self._stop_lock:
+            if self._stopped:
+                return
+            self._stopped = True
         logger.info("Stopping Email Automation Service")
         self.running = False
+        self._wakeup.set()
         
         if self.watcher:
             self.watcher.disconnect()
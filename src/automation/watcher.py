@@ -67,6 +67,38 @@ class EmailWatcher(ABC):
         """
         pass
     
+    def mark_as_failed(self, email_id: str):
+        """
+        Record that an email could not be downloaded or processed
+        
+        Watchers that checkpoint their sync position (e.g. Graph delta links)
+        keep the checkpoint where it was so the email is fetched again.
+        Default: nothing to record.
+        
+        Args:
+            email_id: Unique email identifier
+        """
+        pass
+    
+    def materialize(self, email: Dict) -> Optional[Dict]:
+        """
+        Make sure ``raw_data`` points at a local email file
+        
+        Watchers that fetch headers only (e.g. Graph delta sync) download the
+        full message here, after filtering. Default: email is already local.
+        
+        Args:
+            email: Email metadata dictionary
+            
+        Returns:
+            Email metadata with ``raw_data`` set, or None if download failed
+        """
+        return email
+    
+    def flush(self):
+        """Send any queued server-side work (moves, sync state). Default: nothing queued"""
+        pass
+    
     def should_process_email(self, email: Dict) -> bool:
         """
         Check if email should be processed based on filters
@@ -0,0 +1,149 @@
+"""
+Delimited Text Row Source
+Streams CSV/TSV price lists row by row, with the encoding (BOMs, UTF-8,
+Windows-1255 Hebrew, Windows-1252) sniffed from the first non-ASCII bytes
+and the delimiter from the start of the file, so they feed the same header detection and product extraction as
+workbook sheets
+"""
+
+import codecs
+import csv
+import io
+import os
+from collections import Counter
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+import logging
+
+try:
+    import chardet
+except ImportError:
+    chardet = None
+
+logger = logging.getLogger(__name__)
+
+DELIMITED_EXTENSIONS = ('.csv', '.tsv', '.tab')
+DELIMITERS = (',', '\t', ';', '|')
+SNIFF_BYTES = 64 * 1024  # Bytes the encoding and delimiter are judged from
+SNIFF_LINES = 50
+CHARDET_MIN_CONFIDENCE = 0.8
+HEBREW_RUN_SHARE = 0.6  # Share of non-ASCII bytes in runs for Windows-1255 (Hebrew words vs. accents)
+
+_BOMS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+
+def is_delimited(filepath: str) -> bool:
+    """True for CSV/TSV files (by extension)"""
+    return os.path.splitext(filepath)[1].lower() in DELIMITED_EXTENSIONS
+
+
+def sniff_encoding(sample: bytes) -> str:
+    """
+    Text encoding of a file from a sample of its bytes (see encoding_sample)
+
+    A BOM decides; otherwise UTF-8 if the sample decodes as UTF-8, then
+    chardet's guess when installed and confident, else Windows-1255 if most
+    non-ASCII bytes come in runs of Hebrew letters (0xE0-0xFA), and
+    Windows-1252 for the rest.
+    """
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)  # Sample may end mid-character
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+
+    if chardet is not None:
+        guess = chardet.detect(sample)
+        if guess.get('encoding') and (guess.get('confidence') or 0) >= CHARDET_MIN_CONFIDENCE:
+            try:
+                return codecs.lookup(guess['encoding']).name
+            except LookupError:
+                pass
+
+    high = [i for i, byte in enumerate(sample) if byte >= 0x80]
+    letters = sum(1 for i in high if 0xE0 <= sample[i] <= 0xFA)
+    in_runs = sum(1 for i in high if (i > 0 and sample[i - 1] >= 0x80) or (i + 1 < len(sample) and sample[i + 1] >= 0x80))
+    if high and letters / len(high) >= HEBREW_RUN_SHARE and in_runs / len(high) >= HEBREW_RUN_SHARE:
+        return 'cp1255'
+    return 'cp1252'
+
+
+def sniff_delimiter(lines: List[str], default: str = ',') -> str:
+    """
+    Delimiter that splits the most lines into the same number of fields (more than one)
+
+    Lines are split with csv quoting rules, so delimiters inside quoted cells
+    ("1,234.50") don't count; title lines with a single field don't vote.
+    """
+    best, best_score = default, (0, 0)
+    for delimiter in DELIMITERS:
+        widths = Counter(len(row) for row in csv.reader(lines, delimiter=delimiter) if len(row) > 1)
+        if not widths:
+            continue
+        width, count = widths.most_common(1)[0]
+        if (count, width) > best_score:
+            best, best_score = delimiter, (count, width)
+    return best
+
+
+def encoding_sample(f: BinaryIO, head: bytes) -> bytes:
+    """
+    Bytes to judge a file's encoding from
+
+    The start of the file, unless that is plain ASCII (a header and SKU rows
+    often are): then the file is read on to its first non-ASCII byte and
+    SNIFF_BYTES from there are used, so Hebrew descriptions further down
+    still decide between UTF-8 and Windows-1255.
+
+    Args:
+        f: Binary file positioned right after ``head``
+        head: First SNIFF_BYTES of the file
+    """
+    if not head.isascii():
+        return head
+    while True:
+        chunk = f.read(SNIFF_BYTES)
+        if not chunk:
+            return head  # All ASCII
+        if not chunk.isascii():
+            start = next(i for i, byte in enumerate(chunk) if byte >= 0x80)
+            return chunk[start:] + f.read(start)
+
+
+def sniff_dialect(filepath: str) -> Tuple[str, str]:
+    """(encoding, delimiter) of a delimited text file"""
+    with open(filepath, 'rb') as f:
+        sample = f.read(SNIFF_BYTES)
+        encoding = sniff_encoding(encoding_sample(f, sample))
+    text = codecs.getincrementaldecoder(encoding)(errors='replace').decode(sample, final=False)
+    lines = text.splitlines()[:SNIFF_LINES]
+    default = '\t' if os.path.splitext(filepath)[1].lower() in ('.tsv', '.tab') else ','
+    return encoding, sniff_delimiter(lines, default)
+
+
+def iter_delimited_rows(filepath: str, encoding: Optional[str] = None,
+                        delimiter: Optional[str] = None) -> Iterator[List[str]]:
+    """
+    Stream the rows of a delimited text file
+
+    Args:
+        filepath: CSV/TSV path
+        encoding: Text encoding (None = sniffed)
+        delimiter: Field delimiter (None = sniffed)
+
+    Yields:
+        Rows of cell strings (a blank line is an empty row)
+    """
+    if encoding is None or delimiter is None:
+        sniffed_encoding, sniffed_delimiter = sniff_dialect(filepath)
+        encoding = encoding or sniffed_encoding
+        delimiter = delimiter or sniffed_delimiter
+    logger.debug(f"Reading {os.path.basename(filepath)} as {encoding}, delimiter {delimiter!r}")
+    with io.open(filepath, 'r', encoding=encoding, errors='replace', newline='') as f:
+        yield from csv.reader(f, delimiter=delimiter)
@@ -4,8 +4,12 @@ Extracts product data from Excel spreadsheets with support for multiple formats
 """
 
 import os
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, Iterator, List, Mapping, Optional, Any, Pattern, Sequence, Tuple
 import logging
 from dataclasses import dataclass
 
@@ -16,14 +20,268 @@ except ImportError:
     openpyxl = None
 
 try:
+    import numpy as np
     import pandas as pd
+    from pandas.errors import EmptyDataError
+    from pandas.io.parsers import TextParser
 except ImportError:
+    np = None
     pd = None
 
-logger = logging.getLogger(__name__)
+from ..rules import configure_rule_packs, register_compiler, rule_pack, rule_pack_settings
+from .delimited import is_delimited
+from .excel_stream import STREAMING_BACKENDS, STREAMING_THRESHOLD_MB, iter_sheet_rows, pandas_engine, select_backend
+from .sheet_table import RowRef, SheetTable
+from .templates import SheetLayout, TemplateRegistry, fingerprint, sender_domain
 
+logger = logging.getLogger(__name__)
 
 @dataclass
+class SpreadsheetRules:
+    """Compiled spreadsheet rule pack (see src/rules/spreadsheet.yaml)"""
+    column_keywords: Dict[str, List[str]]  # Column role -> header names, in match priority order
+    column_names: Dict[str, List[str]]  # Column role -> lower-cased header names
+    column_patterns: Dict[str, Pattern]  # Column role -> matches a header containing any of its names
+    header_keywords: List[str]  # Keywords that mark a header row
+    header_pattern: Pattern  # Matches a cell containing any header keyword
+
+
+@register_compiler('spreadsheet')
+def compile_spreadsheet_rules(data: Dict[str, Any]) -> SpreadsheetRules:
+    """Compile the spreadsheet rule pack"""
+    header_keywords = [str(keyword).lower() for keyword in data['header_keywords']]
+    column_names = {role: [str(name).lower() for name in names] for role, names in data['columns'].items()}
+    return SpreadsheetRules(
+        column_keywords={role: [str(name) for name in names] for role, names in data['columns'].items()},
+        column_names=column_names,
+        column_patterns={role: re.compile('|'.join(re.escape(name) for name in names)) for role, names in column_names.items()},
+        header_keywords=header_keywords,
+        header_pattern=re.compile('|'.join(re.escape(keyword) for keyword in header_keywords)),
+    )
+
+
+def spreadsheet_rules() -> SpreadsheetRules:
+    """Current spreadsheet rules (shared by Excel sheets and inline email tables)"""
+    return rule_pack('spreadsheet').rules
+
+
+# Product-column values of repeated header rows
+SKU_HEADER_LABELS = frozenset(['sku', 'part number', 'מק"ט', 'product', ''])
+# Product-column labels that don't end the look-ahead for a price below a product
+LOOKAHEAD_LABELS = frozenset(['', 'total', 'includes', 'support'])
+LOOKAHEAD_ROWS = 5  # Rows searched below a product for its price
+HEADER_SEARCH_ROWS = 20  # Rows searched for the header row
+STREAM_CHUNK_ROWS = 5000  # Rows per frame when streaming a large sheet
+PARALLEL_THRESHOLD_MB = 1  # Smaller workbooks parse faster than worker processes start
+COLUMN_ROLES = ('sku', 'description', 'quantity', 'price', 'total')
+REQUIRED_ROLES = ('sku', 'description')  # Roles a shared column may still fill (see classify_columns)
+COLUMN_SAMPLE_ROWS = 50  # Rows whose values are profiled when classifying columns
+ROLE_CANDIDATES = 4  # Best-scoring columns per role considered in the joint assignment
+VALUE_WEIGHT = 0.5  # Weight of the value statistics against the header match (both 0-1)
+PINNED_DISCOUNT = 0.25  # Header score kept when SKU / description take another role's exact header
+MAX_QUANTITY = 100000
+SKU_TOKEN = re.compile(r'^(?=[^\s]*\d)[A-Za-z0-9][A-Za-z0-9\-_./#+]{2,39}$')
+
+
+def header_match_score(header: str, possible_names: List[str]) -> float:
+    """
+    Score of a lower-cased header against a role's lower-cased names (0 = no match)
+    
+    Exact matches rank above partial ones (a name within the header), which
+    rank above a header that is only part of a name ("Line" in "line total");
+    within each kind, names earlier in the list score higher.
+    """
+    if not header:
+        return 0.0
+    count = len(possible_names)
+    if header in possible_names:
+        rank = possible_names.index(header)
+    else:
+        rank = next((count + i for i, name in enumerate(possible_names) if name in header), None)
+        if rank is None:
+            rank = next((2 * count + i for i, name in enumerate(possible_names) if header in name), None)
+        if rank is None:
+            return 0.0
+    return 1.0 - rank / (3 * count)
+
+
+def value_profile(values: List[Any]) -> Dict[str, float]:
+    """
+    Role evidence from a column's values: share of non-empty cells that look
+    like a SKU, descriptive text, a quantity (small whole number) or an amount
+    """
+    profile = dict.fromkeys(COLUMN_ROLES, 0.0)
+    cells = [val for val in values if not (val is None or (isinstance(val, float) and val != val) or not str(val).strip())]
+    if not cells:
+        return profile
+    
+    for val in cells:
+        number = None if isinstance(val, bool) else safe_float(val, None)
+        if number is not None:
+            profile['price'] += 1
+            if number.is_integer() and 0 < number <= MAX_QUANTITY:
+                profile['quantity'] += 1
+            continue
+        text = str(val).strip()
+        if SKU_TOKEN.match(text):
+            profile['sku'] += 1
+        elif ' ' in text and len(text) >= 8:
+            profile['description'] += 1
+    
+    profile['total'] = profile['price']
+    return {role: count / len(cells) for role, count in profile.items()}
+
+
+def classify_columns(headers: List[Any], column_values: Optional[Callable[[int], List[Any]]] = None,
+                     share_required: bool = True) -> Dict[str, int]:
+    """
+    Assign column roles (COLUMN_ROLES) to a table's columns in one pass
+    
+    Every header is lower-cased once and scored against every role's names
+    (header_match_score). When each role's best header is a different column,
+    those are the roles. Otherwise the competing columns are profiled from
+    their first values (value_profile) and roles are assigned jointly: each
+    column serves at most one role, picking the combination that fills the
+    most of SKU / description and then has the highest total score, so
+    "Product" no longer wins both SKU and description when a description
+    column exists. Only headers decide whether a column is a candidate at all
+    (an exact name match pins it to that role); the value statistics only
+    rank contested candidates.
+    
+    Args:
+        headers: Column headers (any type)
+        column_values: Returns the first data values (up to COLUMN_SAMPLE_ROWS)
+            of a column by index, for value statistics
+        share_required: Let SKU / description reuse another role's column when
+            no column is left for them (spreadsheet behavior)
+        
+    Returns:
+        Role -> column index, for the roles found
+    """
+    rules = spreadsheet_rules()
+    role_names = rules.column_names
+    lowered = [str(header).strip().lower() for header in headers]
+    
+    header_scores = {}
+    for role in COLUMN_ROLES:
+        # One regex search / substring test rules out most headers before ranking
+        pattern, joined = rules.column_patterns[role], '\n'.join(role_names[role])
+        header_scores[role] = [
+            header_match_score(header, role_names[role]) if header and (pattern.search(header) or header in joined) else 0.0
+            for header in lowered
+        ]
+    # A header that is exactly one of a role's names belongs to that role ("Price" is
+    # not a partial match for "total price"); only SKU / description may still take
+    # it, at a discount, when no other column fits them
+    exact_roles: Dict[int, set] = {}
+    for role in COLUMN_ROLES:
+        names = set(role_names[role])
+        for idx, header in enumerate(lowered):
+            if header in names:
+                exact_roles.setdefault(idx, set()).add(role)
+    
+    candidates: Dict[str, List[Tuple[float, int]]] = {}
+    for role in COLUMN_ROLES:
+        scored = []
+        for idx, score in enumerate(header_scores[role]):
+            if score <= 0:
+                continue
+            if role not in exact_roles.get(idx, (role,)):
+                if role not in REQUIRED_ROLES:
+                    continue
+                score *= PINNED_DISCOUNT
+            scored.append((score, idx))
+        candidates[role] = scored
+    
+    # No two roles want the same column: each takes its best-scoring header
+    best_columns = {
+        role: min(scored, key=lambda item: (-item[0], item[1]))[1] for role, scored in candidates.items() if scored
+    }
+    if len(set(best_columns.values())) == len(best_columns):
+        return _share_required(best_columns, header_scores, share_required)
+    
+    # Value statistics only where columns compete: a role with several
+    # candidates, or a column that is a candidate for several roles
+    contested = Counter(idx for scored in candidates.values() for _, idx in scored)
+    for scored in candidates.values():
+        if len(scored) > 1:
+            contested.update(idx for _, idx in scored)
+    profiles = {
+        idx: value_profile(column_values(idx)) for idx, count in contested.items() if count > 1 and column_values
+    }
+    for role, scored in candidates.items():
+        scored = [(score + VALUE_WEIGHT * profiles[idx][role] if idx in profiles else score, idx)
+                  for score, idx in scored]
+        # Best first; earlier columns win ties
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        candidates[role] = scored[:ROLE_CANDIDATES]
+    
+    # Most required roles filled first, then the highest total score
+    best: Tuple[Tuple[int, float], Dict[str, int]] = ((0, 0.0), {})
+    
+    def assign(role_idx: int, used: frozenset, total: float, chosen: Dict[str, int]):
+        nonlocal best
+        if role_idx == len(COLUMN_ROLES):
+            rank = (sum(1 for role in REQUIRED_ROLES if role in chosen), total)
+            if rank > best[0]:
+                best = (rank, dict(chosen))
+            return
+        role = COLUMN_ROLES[role_idx]
+        for score, idx in candidates[role]:
+            if idx not in used:
+                chosen[role] = idx
+                assign(role_idx + 1, used | {idx}, total + score, chosen)
+                del chosen[role]
+        assign(role_idx + 1, used, total, chosen)
+    
+    assign(0, frozenset(), 0.0, {})
+    return _share_required(best[1], header_scores, share_required)
+
+
+def _share_required(columns: Dict[str, int], header_scores: Dict[str, List[float]], share: bool) -> Dict[str, int]:
+    """Give SKU / description left without a column their best-matching header, even if taken"""
+    if share:
+        for role in REQUIRED_ROLES:
+            scores = header_scores[role]
+            if role not in columns and any(scores):
+                columns[role] = max(range(len(scores)), key=lambda idx: (scores[idx], -idx))
+    return columns
+
+
+def count_header_keywords(values: List[Any]) -> int:
+    """Number of cells in a row that contain a header keyword"""
+    header_pattern = spreadsheet_rules().header_pattern
+    return sum(1 for val in values if header_pattern.search(str(val).lower().strip()))
+
+
+def safe_int(value: Any, default: int = 0) -> int:
+    """Safely convert value to int"""
+    if value is None:
+        return default
+    try:
+        if isinstance(value, str):
+            # Remove commas, spaces
+            value = value.replace(',', '').replace(' ', '')
+        return int(float(value))
+    except (ValueError, TypeError):
+        return default
+
+
+def safe_float(value: Any, default: Optional[float] = None) -> Optional[float]:
+    """Safely convert value to float"""
+    if value is None:
+        return default
+    try:
+        if isinstance(value, str):
+            # Remove currency symbols, commas
+            value = value.replace('$', '').replace('₪', '').replace(',', '').replace(' ', '')
+        result = float(value)
+        return result if result >= 0 else default
+    except (ValueError, TypeError):
+        return default
+
+
+@dataclass(slots=True)
 class ProductRow:
     """Single product row extracted from Excel"""
     sku: str
@@ -33,7 +291,8 @@ class ProductRow:
     total_price: Optional[float] = None
     category: Optional[str] = None
     row_number: int = 0
-    raw_data: Dict[str, Any] = None
+    raw_data: Optional[Mapping[str, Any]] = None  # Source cells (a RowRef into the sheet's table for Excel rows)
+    confidence: float = 1.0  # Extraction confidence (0-1), below 1 for heuristic sources
 
 
 @dataclass
@@ -42,23 +301,56 @@ class ExcelSheetData:
     sheet_name: str
     headers: List[str]
     products: List[ProductRow]
-    raw_data: List[Dict]
+    raw_data: Sequence[Dict]  # Row dicts (a SheetTable; [] when streamed)
+    layout: Optional[SheetLayout] = None  # Header row / column roles used (when templates are enabled)
+
+
+def _parse_sheets_worker(filepath: str, sheet_names: List[str], backend: str, chunk_rows: int,
+                         templates: Optional[TemplateRegistry], domain: str) -> Dict[str, ExcelSheetData]:
+    """Process pool entry point: parse the assigned sheets of a workbook in this process"""
+    parser = ExcelParser(backend=backend, chunk_rows=chunk_rows, max_workers=1, templates=templates)
+    return parser._parse_sheets(filepath, sheet_names, backend, domain)
 
 
 class ExcelParser:
     """Parse Excel files to extract product information"""
     
-    def __init__(self):
+    def __init__(self, backend: str = 'auto', streaming_threshold_mb: float = STREAMING_THRESHOLD_MB,
+                 chunk_rows: int = STREAM_CHUNK_ROWS, max_workers: Optional[int] = None,
+                 parallel_threshold_mb: float = PARALLEL_THRESHOLD_MB, templates: Optional[TemplateRegistry] = None):
+        """
+        Initialize parser
+        
+        Args:
+            backend: "auto" (pandas below streaming_threshold_mb, streaming above),
+                "pandas" (whole sheets), "openpyxl" (read-only streaming),
+                "calamine" (python-calamine streaming) or "pyxlsb" (.xlsb
+                streaming); CSV/TSV files always stream
+            streaming_threshold_mb: Workbook size from which "auto" streams
+            chunk_rows: Rows per frame when streaming
+            max_workers: Processes sheets are spread over (None = one per CPU core, 1 = serial)
+            parallel_threshold_mb: Workbook size from which sheets are parsed in parallel
+            templates: Learned vendor sheet layouts; known layouts skip header
+                and column detection (None = always detect)
+        """
         if openpyxl is None and pd is None:
             logger.warning("No Excel parsing library available")
+        self.backend = backend
+        self.streaming_threshold_mb = streaming_threshold_mb
+        self.chunk_rows = chunk_rows
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.parallel_threshold_mb = parallel_threshold_mb
+        self.templates = templates
     
-    def parse_excel(self, filepath: str, sheet_names: Optional[List[str]] = None) -> Dict[str, ExcelSheetData]:
+    def parse_excel(self, filepath: str, sheet_names: Optional[List[str]] = None,
+                    sender: Optional[str] = None) -> Dict[str, ExcelSheetData]:
         """
         Parse Excel file and extract product data
         
         Args:
-            filepath: Path to Excel file
-            sheet_names: Specific sheets to parse (None = all sheets)
+            filepath: Path to Excel workbook (.xlsx, .xls, .xlsb, ...) or CSV/TSV price list
+            sheet_names: Specific sheets to parse (None = all sheets; a CSV/TSV file is one sheet named after the file)
+            sender: Sender address of the email the file came with (template matching)
             
         Returns:
             Dictionary mapping sheet names to ExcelSheetData
@@ -68,7 +360,16 @@ class ExcelParser:
         
         try:
             if pd:
-                return self._parse_with_pandas(filepath, sheet_names)
+                backend = select_backend(filepath, self.backend, self.streaming_threshold_mb)
+                domain = sender_domain(sender)
+                parallel_sheets = self._parallel_sheets(filepath, sheet_names)
+                if parallel_sheets:
+                    sheets = self._parse_parallel(filepath, parallel_sheets, backend, domain)
+                else:
+                    sheets = self._parse_sheets(filepath, sheet_names, backend, domain)
+                if self.templates is not None:
+                    self.templates.learn(sheet.layout for sheet in sheets.values() if sheet.products)
+                return sheets
             elif openpyxl:
                 return self._parse_with_openpyxl(filepath, sheet_names)
             else:
@@ -77,37 +378,90 @@ class ExcelParser:
             logger.error(f"Error parsing Excel file {filepath}: {e}")
             raise
     
-    def _parse_with_pandas(self, filepath: str, sheet_names: Optional[List[str]] = None) -> Dict[str, ExcelSheetData]:
-        """Parse using pandas (handles .xlsx and .xls)"""
+    def _parse_sheets(self, filepath: str, sheet_names: Optional[List[str]], backend: str,
+                      domain: str) -> Dict[str, ExcelSheetData]:
+        """Parse sheets in this process with the given backend"""
+        if backend in STREAMING_BACKENDS:
+            return self._parse_streaming(filepath, sheet_names, backend, domain)
+        return self._parse_with_pandas(filepath, sheet_names, domain)
+    
+    def _parallel_sheets(self, filepath: str, sheet_names: Optional[List[str]]) -> Optional[List[str]]:
+        """Sheets to fan out over worker processes, or None to parse serially (small file, one sheet)"""
+        if self.max_workers < 2 or is_delimited(filepath) \
+                or os.path.getsize(filepath) < self.parallel_threshold_mb * 1024 * 1024:
+            return None
+        if not sheet_names:
+            try:
+                with pd.ExcelFile(filepath, engine=pandas_engine(filepath)) as excel_file:
+                    sheet_names = excel_file.sheet_names
+            except Exception as e:
+                logger.debug(f"Could not list sheets of {filepath} ({e}), parsing serially")
+                return None
+        return list(sheet_names) if len(sheet_names) > 1 else None
+    
+    def _parse_parallel(self, filepath: str, sheet_names: List[str], backend: str,
+                        domain: str) -> Dict[str, ExcelSheetData]:
+        """
+        Parse sheets in worker processes, each opening the workbook itself
+        
+        Sheets are dealt round-robin to min(max_workers, sheets) workers; the
+        results are merged back in sheet order, so merge_sheets output is the
+        same as a serial parse. Falls back to a serial parse if the pool fails.
+        """
+        workers = min(self.max_workers, len(sheet_names))
+        assignments = [sheet_names[worker::workers] for worker in range(workers)]
+        logger.info(f"Parsing {len(sheet_names)} sheets of {os.path.basename(filepath)} in {workers} processes")
+        
+        parsed: Dict[str, ExcelSheetData] = {}
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=configure_rule_packs,
+                                     initargs=rule_pack_settings()) as pool:
+                futures = [pool.submit(_parse_sheets_worker, filepath, assigned, backend, self.chunk_rows,
+                                       self.templates, domain)
+                           for assigned in assignments]
+                for future in futures:
+                    parsed.update(future.result())
+        except Exception as e:
+            logger.warning(f"Parallel sheet parsing failed ({e}), parsing serially")
+            return self._parse_sheets(filepath, sheet_names, backend, domain)
+        
+        return {name: parsed[name] for name in sheet_names if name in parsed}
+    
+    def _parse_with_pandas(self, filepath: str, sheet_names: Optional[List[str]] = None,
+                           domain: str = "") -> Dict[str, ExcelSheetData]:
+        """Parse using pandas (handles .xlsx, .xls and .xlsb)"""
         all_sheets = {}
         
         try:
-            excel_file = pd.ExcelFile(filepath)
-            sheets_to_process = sheet_names if sheet_names else excel_file.sheet_names
-            
-            for sheet_name in sheets_to_process:
-                try:
-                    # Try to read without headers first to detect header row
-                    df_no_header = pd.read_excel(excel_file, sheet_name=sheet_name, header=None)
-                    
-                    # Find header row by looking for common column names
-                    header_row = self._find_header_row(df_no_header)
-                    
-                    if header_row is not None:
-                        # Read with header at found row
-                        df = pd.read_excel(excel_file, sheet_name=sheet_name, header=header_row)
-                        # Remove rows above header if there are any meaningful differences
-                        if header_row > 0:
-                            df = df.dropna(how='all')  # Remove completely empty rows
-                    else:
-                        # Fallback to default reading
-                        df = pd.read_excel(excel_file, sheet_name=sheet_name)
-                    
-                    sheet_data = self._extract_products_from_dataframe(df, sheet_name)
-                    all_sheets[sheet_name] = sheet_data
-                except Exception as e:
-                    logger.warning(f"Error processing sheet {sheet_name}: {e}")
-                    continue
+            with pd.ExcelFile(filepath, engine=pandas_engine(filepath)) as excel_file:
+                sheets_to_process = sheet_names if sheet_names else excel_file.sheet_names
+                
+                for sheet_name in sheets_to_process:
+                    sheet = None
+                    try:
+                        # Header row and pre-screen from the first rows only. The
+                        # engine sheet is opened once for both reads: calamine parses
+                        # the whole sheet when it is opened, while openpyxl streams
+                        # the XML and re-reads just the first rows for the full read
+                        debug = logger.isEnabledFor(logging.DEBUG)
+                        dimension = self._sheet_dimension(excel_file, sheet_name) if debug else ""
+                        sheet = self._open_sheet(excel_file, sheet_name)
+                        head = self._read_grid(excel_file, sheet_name, max_rows=HEADER_SEARCH_ROWS, sheet=sheet)
+                        header = self._header_layout(head, domain)
+                        reason = self._screen_sheet(head, *header)
+                        if reason:
+                            if debug:
+                                logger.debug(f"Skipping sheet {sheet_name} ({dimension or 'size unknown'}): {reason}")
+                            continue
+                        
+                        df, layout = self._load_sheet(excel_file, sheet_name, domain, header, sheet=sheet)
+                        sheet_data = self._extract_products_from_dataframe(df, sheet_name, layout=layout)
+                        all_sheets[sheet_name] = sheet_data
+                    except Exception as e:
+                        logger.warning(f"Error processing sheet {sheet_name}: {e}")
+                        continue
+                    finally:
+                        self._close_sheet(sheet)
         
         except Exception as e:
             logger.error(f"Error reading Excel file: {e}")
@@ -115,30 +469,176 @@ class ExcelParser:
         
         return all_sheets
     
-    def _find_header_row(self, df: pd.DataFrame, max_rows_to_check: int = 20) -> Optional[int]:
+    def _load_sheet(self, excel_file: 'pd.ExcelFile', sheet_name: str, domain: str = "",
+                    header: Optional[Tuple[Optional[int], Optional[SheetLayout]]] = None,
+                    sheet: Any = None) -> Tuple[pd.DataFrame, Optional[SheetLayout]]:
+        """
+        Read a sheet once and return its frame with the detected header row
+        
+        Args:
+            excel_file: Open workbook
+            sheet_name: Sheet to read
+            domain: Sender domain (template matching)
+            header: (header row, layout) already found in the sheet's first rows
+            sheet: Engine sheet from _open_sheet (None = opened for this read)
+            
+        Returns:
+            (DataFrame with header columns (first row if no header row is found),
+            sheet layout or None)
+        """
+        # Read the sheet once as raw cell rows
+        rows = self._read_grid(excel_file, sheet_name, sheet=sheet)
+        
+        # Header row from a known vendor layout, else by looking for common column names
+        header_row, layout = header if header is not None else self._header_layout(rows, domain)
+        
+        if header_row is not None:
+            # Frame with header at found row, built from the same rows
+            df = self._frame_from_grid(rows, header=header_row)
+            # Remove rows above header if there are any meaningful differences
+            if header_row > 0:
+                df = df.dropna(how='all')  # Remove completely empty rows
+        else:
+            # Fallback to default reading (first row is the header)
+            df = self._frame_from_grid(rows, header=0)
+        return df, layout
+    
+    def _header_layout(self, rows: List[List[Any]], domain: str) -> Tuple[Optional[int], Optional[SheetLayout]]:
+        """
+        Header row of a sheet and its layout (None without templates or header row)
+        
+        A stored layout whose fingerprint matches skips header detection;
+        otherwise the detected header row starts a new layout to be learned.
+        """
+        layout = self.templates.match(domain, rows) if self.templates is not None else None
+        if layout is not None:
+            logger.debug(f"Known sheet layout for {domain or 'unknown sender'} (header row {layout.header_row})")
+            return layout.header_row, layout
+        
+        header_row = self._find_header_row(rows)
+        if header_row is None or self.templates is None:
+            return header_row, None
+        return header_row, SheetLayout(domain=domain, header_row=header_row,
+                                       fingerprint=fingerprint(domain, header_row, rows[header_row]))
+    
+    def _read_grid(self, excel_file: 'pd.ExcelFile', sheet_name: str, max_rows: Optional[int] = None,
+                   sheet: Any = None) -> List[List[Any]]:
+        """
+        Read a sheet once as the Excel engine's raw cell rows
+        
+        These are the rows pd.read_excel hands to its parser (empty cells are
+        ""), so they can be parsed with any header row without reading the
+        file again. With max_rows only the sheet's first rows are read; pass
+        the sheet from _open_sheet to read it more than once.
+        """
+        reader = self._engine_reader(excel_file)
+        if reader is None:
+            # Engine reader not exposed by this pandas version: object grid without NA conversion
+            grid = pd.read_excel(excel_file, sheet_name=sheet_name, header=None, dtype=object, na_filter=False,
+                                 nrows=max_rows)
+            return grid.values.tolist()
+        
+        if sheet is not None:
+            return reader.get_sheet_data(sheet, file_rows_needed=max_rows)
+        sheet = self._open_sheet(excel_file, sheet_name)
+        try:
+            return reader.get_sheet_data(sheet, file_rows_needed=max_rows)
+        finally:
+            self._close_sheet(sheet)
+    
+    def _engine_reader(self, excel_file: 'pd.ExcelFile') -> Any:
+        """
+        pandas' engine reader behind an ExcelFile (None if not exposed)
+        
+        ExcelFile._reader and its get_sheet_data are private pandas API (see
+        the pandas pin in requirements.txt); without them sheets are read
+        with pd.read_excel, which gives the same products.
+        """
+        reader = getattr(excel_file, '_reader', None)
+        if reader is None or not hasattr(reader, 'get_sheet_data'):
+            return None
+        return reader
+    
+    def _open_sheet(self, excel_file: 'pd.ExcelFile', sheet_name: str) -> Any:
+        """The Excel engine's sheet object (None if this pandas version doesn't expose its reader)"""
+        reader = self._engine_reader(excel_file)
+        if reader is None:
+            return None
+        return reader.get_sheet_by_name(sheet_name) if isinstance(sheet_name, str) else reader.get_sheet_by_index(sheet_name)
+    
+    def _close_sheet(self, sheet: Any):
+        """Release an engine sheet from _open_sheet"""
+        if hasattr(sheet, 'close'):
+            sheet.close()  # pyxlsb sheets hold temporary files
+    
+    def _sheet_dimension(self, excel_file: 'pd.ExcelFile', sheet_name: str) -> str:
+        """Used range a sheet declares (e.g. "A1:F4000"), "" if the engine doesn't say"""
+        book = getattr(excel_file, 'book', None)
+        try:
+            if openpyxl is not None and isinstance(book, openpyxl.Workbook):
+                # Read-only sheets report the <dimension> the file declares, until they are read
+                return book[sheet_name].calculate_dimension()
+            if hasattr(book, 'sheet_by_name'):  # xlrd
+                sheet = book.sheet_by_name(sheet_name)
+                return f"{sheet.nrows} rows x {sheet.ncols} columns"
+        except Exception:
+            pass
+        return ""
+    
+    def _screen_sheet(self, head: List[List[Any]], header_row: Optional[int],
+                      layout: Optional[SheetLayout] = None) -> Optional[str]:
+        """
+        Why a sheet cannot yield products, judged from its first rows (None = parse it)
+        
+        Products need SKU and description columns, and those come from the
+        header row (the detected one, else the first row), so a sheet whose
+        header row classifies without them is skipped before it is read in
+        full. A sheet with a product header is never skipped, and neither is
+        one matching a stored layout that already has both column roles.
+        """
+        if layout is not None and 'sku' in layout.columns and 'description' in layout.columns:
+            return None
+        if not any(str(cell).strip() for row in head for cell in row if cell is not None):
+            return "empty"
+        roles = classify_columns(['' if cell is None else cell for cell in head[header_row or 0]])
+        if 'sku' in roles and 'description' in roles:
+            return None
+        if header_row is None:
+            return f"no header row in the first {len(head)} rows and no SKU/description column in the first row"
+        return f"no SKU/description column in header row {header_row + 1}"
+    
+    def _frame_from_grid(self, rows: List[List[Any]], header: int) -> pd.DataFrame:
+        """
+        Parse raw cell rows with the given header row
+        
+        Runs the same TextParser step pd.read_excel applies to the engine's
+        rows, so the result (column names, dtypes, NA values) matches reading
+        the sheet again with header=header.
+        """
+        if not rows:
+            return pd.DataFrame()
+        try:
+            return TextParser([list(row) for row in rows], header=header, skip_blank_lines=False).read()
+        except EmptyDataError:
+            return pd.DataFrame()
+    
+    def _find_header_row(self, rows: List[List[Any]], max_rows_to_check: int = HEADER_SEARCH_ROWS) -> Optional[int]:
         """
         Find the row that contains headers by looking for common column name patterns
         
         Args:
-            df: DataFrame read without headers
+            rows: Raw cell rows of the sheet
             max_rows_to_check: Maximum number of rows to check
             
         Returns:
             Row index if found, None otherwise
         """
-        header_keywords = [
-            'product', 'sku', 'part', 'item', 'qty', 'quantity', 'desc', 'description',
-            'price', 'cost', 'unit', 'total', 'part number', 'item number',
-            'מק"ט', 'תיאור', 'כמות', 'מחיר', 'מוצר'
-        ]
-        
         # Check first N rows
-        for row_idx in range(min(max_rows_to_check, len(df))):
-            row_values = [str(val).lower().strip() for val in df.iloc[row_idx].values if pd.notna(val)]
+        for row_idx, row in enumerate(rows[:max_rows_to_check]):
+            row_values = [str(val).lower().strip() for val in row if pd.notna(val) and val != ""]
             
             # Count how many header keywords we find in this row
-            keyword_matches = sum(1 for val in row_values 
-                                 if any(keyword in val for keyword in header_keywords))
+            keyword_matches = count_header_keywords(row_values)
             
             # If we find at least 2-3 keywords, this is likely a header row
             if keyword_matches >= 2:
@@ -147,12 +647,117 @@ class ExcelParser:
         
         return None
     
+    def iter_products(self, filepath: str, sheet_names: Optional[List[str]] = None,
+                      backend: Optional[str] = None) -> Iterator[ProductRow]:
+        """
+        Stream products from a workbook with bounded memory
+        
+        Args:
+            filepath: Path to Excel file
+            sheet_names: Specific sheets to parse (None = all sheets)
+            backend: "openpyxl", "calamine", "pyxlsb" or "csv" (None = fastest available)
+            
+        Yields:
+            ProductRow objects in sheet/row order
+        """
+        if not os.path.exists(filepath):
+            raise FileNotFoundError(f"Excel file not found: {filepath}")
+        
+        backend = select_backend(filepath, backend or STREAMING_BACKENDS[0], self.streaming_threshold_mb)
+        if backend not in STREAMING_BACKENDS:
+            raise ImportError(f"No streaming Excel backend can read {filepath}")
+        for _, _, products, _ in self._stream_sheets(filepath, sheet_names, backend):
+            yield from products
+    
+    def _parse_streaming(self, filepath: str, sheet_names: Optional[List[str]], backend: str,
+                         domain: str = "") -> Dict[str, ExcelSheetData]:
+        """Parse by streaming rows (large workbooks); raw rows are not kept"""
+        logger.info(f"Streaming {os.path.basename(filepath)} with {backend} "
+                    f"({os.path.getsize(filepath) / 1024 / 1024:.1f} MB)")
+        all_sheets = {}
+        for sheet_name, headers, products, layout in self._stream_sheets(filepath, sheet_names, backend, domain):
+            try:
+                all_sheets[sheet_name] = ExcelSheetData(
+                    sheet_name=sheet_name,
+                    headers=headers,
+                    products=list(products),
+                    raw_data=[],
+                    layout=layout
+                )
+            except Exception as e:
+                logger.warning(f"Error processing sheet {sheet_name}: {e}")
+                continue
+        return all_sheets
+    
+    def _stream_sheets(self, filepath: str, sheet_names: Optional[List[str]], backend: str,
+                       domain: str = "") -> Iterator[Tuple[str, List[Any], Iterator[ProductRow], Optional[SheetLayout]]]:
+        """
+        Detect each sheet's header row in its first rows and stream the rest
+        
+        Yields:
+            (sheet name, column headers, product iterator, layout); the products
+            must be consumed before the next sheet is read, and the layout is
+            complete once they are
+        """
+        for sheet_name, rows in iter_sheet_rows(filepath, backend, sheet_names):
+            head = list(islice(rows, HEADER_SEARCH_ROWS))
+            header_row, layout = self._header_layout(head, domain)
+            reason = self._screen_sheet(head, header_row, layout)
+            if reason:
+                logger.debug(f"Skipping sheet {sheet_name}: {reason}")
+                continue
+            
+            # Same frame shape as _load_sheet: empty rows dropped below a found header row
+            skip_empty = header_row is not None and header_row > 0
+            header_row = header_row or 0
+            width = max(len(row) for row in head)
+            header = head[header_row] + [''] * (width - len(head[header_row]))
+            headers = list(self._frame_from_grid([header], header=0).columns)
+            yield sheet_name, headers, self._stream_products(
+                header, chain(head[header_row + 1:], rows), sheet_name, skip_empty, layout), layout
+    
+    def _stream_products(self, header: List[Any], rows: Iterator[List[Any]], sheet_name: str,
+                         skip_empty: bool, layout: Optional[SheetLayout] = None) -> Iterator[ProductRow]:
+        """
+        Extract products chunk by chunk
+        
+        Each chunk of chunk_rows rows is parsed as a frame together with the
+        LOOKAHEAD_ROWS rows after it, so prices below the last products of a
+        chunk are still found; those rows are emitted with the next chunk.
+        Column roles found in the first chunk are kept in the layout and
+        reused for the rest.
+        """
+        layout = layout or SheetLayout(domain="", header_row=-1)  # Carries the column roles between chunks
+        width = len(header)
+        chunk: List[List[Any]] = []
+        offset = 0  # Frame position of chunk[0]
+        for row in rows:
+            if skip_empty and not row:
+                continue
+            chunk.append(row[:width] + [''] * (width - len(row)))
+            if len(chunk) == self.chunk_rows + LOOKAHEAD_ROWS:
+                yield from self._chunk_products(header, chunk, offset, self.chunk_rows, sheet_name, layout)
+                offset += self.chunk_rows
+                chunk = chunk[self.chunk_rows:]
+        yield from self._chunk_products(header, chunk, offset, len(chunk), sheet_name, layout)
+    
+    def _chunk_products(self, header: List[Any], chunk: List[List[Any]], offset: int, count: int,
+                        sheet_name: str, layout: Optional[SheetLayout] = None) -> Iterator[ProductRow]:
+        """Products of the first count rows of a chunk, numbered by their position in the sheet frame"""
+        if not count:
+            return
+        df = self._frame_from_grid([header] + chunk, header=0)
+        for product in self._extract_products_from_dataframe(df, sheet_name, keep_raw_data=False, layout=layout).products:
+            if product.row_number - 2 < count:
+                product.row_number += offset
+                yield product
+    
     def _parse_with_openpyxl(self, filepath: str, sheet_names: Optional[List[str]] = None) -> Dict[str, ExcelSheetData]:
         """Parse using openpyxl (handles .xlsx only)"""
         all_sheets = {}
         
         try:
-            workbook = load_workbook(filepath, data_only=True)
+            workbook = load_workbook(filepath, read_only=True, data_only=True)
             sheets_to_process = sheet_names if sheet_names else workbook.sheetnames
             
             for sheet_name in sheets_to_process:
@@ -170,6 +775,8 @@ class ExcelParser:
                 except Exception as e:
                     logger.warning(f"Error processing sheet {sheet_name}: {e}")
                     continue
+            
+            workbook.close()  # Read-only workbooks keep the file open
         
         except Exception as e:
             logger.error(f"Error reading Excel file: {e}")
@@ -177,11 +784,18 @@ class ExcelParser:
         
         return all_sheets
     
-    def _extract_products_from_dataframe(self, df: pd.DataFrame, sheet_name: str) -> ExcelSheetData:
+    def _extract_products_from_dataframe(self, df: pd.DataFrame, sheet_name: str, keep_raw_data: bool = True,
+                                         layout: Optional[SheetLayout] = None) -> ExcelSheetData:
         """
         Extract product data from pandas DataFrame
         
-        Attempts to identify columns containing SKU, description, quantity, price
+        Attempts to identify columns containing SKU, description, quantity, price.
+        Products reference their source row in a SheetTable over the frame
+        instead of copying it; with keep_raw_data=False the table is not
+        exported as the sheet's raw_data (streaming).
+        A layout with column roles (known vendor template) skips column
+        detection; otherwise the detected roles and price strategy are
+        recorded in it.
         """
         if df.empty:
             return ExcelSheetData(
@@ -193,145 +807,126 @@ class ExcelParser:
         
         headers = list(df.columns)
         products = []
-        raw_data = df.to_dict('records')
-        
-        # Try to identify relevant columns
-        sku_col = self._find_column(df, ['sku', 'part number', 'part#', 'item', 'product code', 'product', 'מק"ט', 'מוצר'])
-        desc_col = self._find_column(df, ['description', 'item description', 'desc', 'תיאור', 'מוצר'])
-        qty_col = self._find_column(df, ['quantity', 'qty', 'amount', 'כמות', 'מספר'])
-        price_col = self._find_column(df, ['price', 'unit price', 'cost', 'unit cost', 'מחיר', 'מחיר יחידה'])
-        total_col = self._find_column(df, ['total', 'line total', 'total price', 'extended', 'סה"כ', 'סה"כ שורה'])
+        table = SheetTable(sheet_name, df)
         
-        # Log what was found
-        logger.info(f"Column detection - SKU={sku_col}, Desc={desc_col}, Qty={qty_col}, Price={price_col}, Total={total_col}")
+        # Columns of a known layout, else try to identify relevant columns
+        known_columns = self._layout_columns(df, layout)
+        if known_columns is not None:
+            sku_col, desc_col, qty_col, price_col, total_col = known_columns
+        else:
+            sku_col, desc_col, qty_col, price_col, total_col = self._classify_columns(df)
+            
+            # Log what was found
+            logger.info(f"Column detection - SKU={sku_col}, Desc={desc_col}, Qty={qty_col}, Price={price_col}, Total={total_col}")
+            if layout is not None:
+                layout.columns = {
+                    role: str(col) for role, col in zip(COLUMN_ROLES, [sku_col, desc_col, qty_col, price_col, total_col])
+                    if col is not None
+                }
         
         # Require at least SKU, Description, and Quantity. Price is optional (may calculate later)
         if not all([sku_col, desc_col, qty_col]):
             logger.warning(f"Could not identify required columns (SKU, Description, Quantity) in sheet {sheet_name}")
             logger.info(f"Found columns: SKU={sku_col}, Desc={desc_col}, Qty={qty_col}, Price={price_col}")
         
-        # First pass: collect all rows and detect prices in description column
-        # Prices are often in column C (description) on rows below products
-        row_data_list = []
-        for idx, row in df.iterrows():
-            row_data_list.append((idx, row, df.columns))
+        # Cell values as iterrows() would yield them (object array for mixed dtypes), one column at a time
+        values = df.values
+        row_count = len(values)
+        column_index = {col: i for i, col in enumerate(df.columns)}
+        
+        def column(col) -> list:
+            return list(values[:, column_index[col]]) if col else [None] * row_count
+        
+        sku_cells, desc_cells = column(sku_col), column(desc_col)
+        qty_cells, price_cells, total_cells = column(qty_col), column(price_col), column(total_col)
+        skus = [str(val).strip() for val in sku_cells] if sku_col else [""] * row_count
+        descriptions = [str(val).strip() for val in desc_cells] if desc_col else [""] * row_count
+        labels = [sku.lower() for sku in skus]
+        
+        # Row masks. Summary rows carry labels like "includes:..." or "Total" in the product column
+        summary_label = np.array([
+            'includes' in label or label == 'total' or label.startswith('total') for label in labels
+        ], dtype=bool)
+        is_product = np.array([
+            bool(label) and label not in SKU_HEADER_LABELS and not ('support' in label and 'delivery' in label)
+            for label in labels
+        ], dtype=bool) & ~summary_label
+        # Prices are often in column C (description) as a plain number
+        desc_amount = np.array([
+            isinstance(val, (int, float)) and val > 100 for val in desc_cells
+        ], dtype=bool) if desc_col else np.zeros(row_count, dtype=bool)
+        
+        # Strategy 3 (rows below a product): the nearest row within LOOKAHEAD_ROWS that either
+        # ends the search (another real product) or carries a price
+        ends_search = np.array([
+            bool(sku) and label not in LOOKAHEAD_LABELS for sku, label in zip(skus, labels)
+        ], dtype=bool) & ~desc_amount
+        row_prices = [
+            self._price_row_amount(desc_cells[i], price_cells[i], total_cells[i], summary_label[i],
+                                   not skus[i] or pd.isna(sku_cells[i]) if sku_col else True)
+            for i in range(row_count)
+        ]
+        has_price = np.array([price is not None for price in row_prices], dtype=bool)
+        event_rows = np.where(ends_search | has_price, np.arange(row_count), row_count)
+        next_event = np.append(np.minimum.accumulate(event_rows[::-1])[::-1][1:], row_count)
+        next_event_row = np.minimum(next_event, row_count - 1)
+        price_below = (next_event - np.arange(row_count) <= LOOKAHEAD_ROWS) & (next_event < row_count) \
+            & ~ends_search[next_event_row] & has_price[next_event_row]
+        
+        # Strategy 4 candidates: other columns whose header looks like a price
+        price_like_columns = [
+            (col, column(col)) for col in df.columns
+            if col not in [sku_col, desc_col, qty_col]
+            and any(keyword in str(col).lower() for keyword in ['price', 'cost', 'amount', 'total', '$', 'מחיר'])
+        ]
         
-        # Second pass: extract products and find their prices
-        # Prices might be in the same row, or in the row below (in description column)
-        for idx, (row_idx, row, columns) in enumerate(row_data_list):
+        price_sources = Counter()  # Strategy that priced each product
+        for idx in np.flatnonzero(is_product).tolist():
             try:
-                sku = str(row[sku_col]).strip() if sku_col and sku_col in row else ""
-                description = str(row[desc_col]).strip() if desc_col and desc_col in row else ""
-                
-                # Skip header rows, empty rows, and price rows (rows with "includes", "total", etc. but no real product)
-                # Price rows typically have labels like "includes:..." or "Total" in PRODUCT column
-                is_price_row = False
-                if sku:
-                    sku_lower = sku.lower()
-                    is_price_row = (
-                        'includes' in sku_lower or 
-                        sku_lower == 'total' or 
-                        sku_lower.startswith('total') or
-                        'support' in sku_lower and 'delivery' in sku_lower
-                    )
-                
-                if not sku or sku.lower() in ['sku', 'part number', 'מק"ט', 'product', ''] or is_price_row:
-                    continue
+                sku = skus[idx]
+                description = descriptions[idx]
                 
                 # Parse quantity
-                quantity = self._safe_int(row.get(qty_col) if qty_col else None, 1)
+                quantity = self._safe_int(qty_cells[idx], 1)
                 
                 # Parse prices - flexible multi-strategy approach for different Excel formats
-                unit_price = self._safe_float(row.get(price_col) if price_col else None, 0.0)
-                total_price = self._safe_float(row.get(total_col) if total_col else None, None)
-                
                 # Strategy 1: Price in dedicated price/total columns (same row)
+                unit_price = self._safe_float(price_cells[idx], 0.0)
+                total_price = self._safe_float(total_cells[idx], None)
+                price_source = 'columns'
+                if price_col is None and total_price and quantity > 0:
+                    unit_price = total_price / quantity  # Line total only
+                
                 if unit_price == 0.0 and total_price is None:
                     # Strategy 2: Price in description column (same row)
-                    if desc_col:
-                        desc_val = row.get(desc_col)
-                        if isinstance(desc_val, (int, float)) and desc_val > 100:
-                            total_price = self._safe_float(desc_val, None)
-                            if total_price and quantity > 0:
-                                unit_price = total_price / quantity
-                                logger.debug(f"Found price ${total_price:.2f} for {sku} in description column (same row)")
+                    if desc_amount[idx]:
+                        total_price = self._safe_float(desc_cells[idx], None)
+                        price_source = 'description'
+                        if total_price and quantity > 0:
+                            unit_price = total_price / quantity
+                            logger.debug(f"Found price ${total_price:.2f} for {sku} in description column (same row)")
                     
-                    # Strategy 3: Check rows BELOW for price (prices often appear below products)
-                    # Check up to 3-5 rows ahead, but stop if we hit another product
-                    if unit_price == 0.0 and total_price is None:
-                        for offset in range(1, min(6, len(row_data_list) - idx)):  # Check up to 5 rows below
-                            if idx + offset >= len(row_data_list):
-                                break
-                            
-                            check_row_idx, check_row, _ = row_data_list[idx + offset]
-                            check_row_sku = str(check_row.get(sku_col, '')).strip() if sku_col else ""
-                            
-                            # If we hit another real product before finding price, stop searching
-                            if check_row_sku and check_row_sku.lower() not in ['', 'total', 'includes', 'support']:
-                                # Check if this is actually a price row disguised as a product
-                                check_desc = check_row.get(desc_col) if desc_col else None
-                                if not (isinstance(check_desc, (int, float)) and check_desc > 100):
-                                    # This is a real product, stop looking
-                                    break
-                            
-                            check_row_label = check_row_sku
-                            check_desc_val = check_row.get(desc_col) if desc_col else None
-                            check_price_col_val = check_row.get(price_col) if price_col else None
-                            check_total_col_val = check_row.get(total_col) if total_col else None
-                            
-                            # Check all possible price locations in this row
-                            found_price = None
-                            is_price_row = False
-                            
-                            # Check description column for price (most common in this Excel format)
-                            if check_desc_val:
-                                price_candidate = self._safe_float(check_desc_val, None)
-                                if price_candidate and price_candidate > 100:
-                                    found_price = price_candidate
-                                    # Determine if this looks like a price row
-                                    is_price_row = (
-                                        ('includes' in check_row_label.lower()) or
-                                        (check_row_label.lower() == 'total') or
-                                        (check_row_label.lower().startswith('total')) or
-                                        (not check_row_label or check_row_label == '' or pd.isna(check_row.get(sku_col)) if sku_col else True)
-                                    )
-                            
-                            # Check price/total columns if not found in description
-                            if not found_price:
-                                if check_price_col_val:
-                                    price_candidate = self._safe_float(check_price_col_val, None)
-                                    if price_candidate and price_candidate > 100:
-                                        found_price = price_candidate
-                                        is_price_row = True
-                                
-                                if not found_price and check_total_col_val:
-                                    price_candidate = self._safe_float(check_total_col_val, None)
-                                    if price_candidate and price_candidate > 100:
-                                        found_price = price_candidate
-                                        is_price_row = True
-                            
-                            # If we found a price and it looks like a price row, use it
-                            if found_price and is_price_row:
-                                total_price = found_price
-                                if quantity > 0:
-                                    unit_price = total_price / quantity
-                                logger.info(f"Found price ${total_price:.2f} for {sku} {offset} row(s) below (row label: '{check_row_label}')")
-                                break
+                    # Strategy 3: Price row below the product, before the next product
+                    if unit_price == 0.0 and total_price is None and price_below[idx]:
+                        below = int(next_event[idx])
+                        total_price = row_prices[below]
+                        price_source = 'below'
+                        if quantity > 0:
+                            unit_price = total_price / quantity
+                        logger.info(f"Found price ${total_price:.2f} for {sku} {below - idx} row(s) below "
+                                    f"(row label: '{skus[below]}')")
                     
                     # Strategy 4: Check all columns in same row for price-like values
                     if unit_price == 0.0 and total_price is None:
-                        for col_name in df.columns:
-                            if col_name in [sku_col, desc_col, qty_col]:
-                                continue
-                            col_val = row.get(col_name)
+                        for col_name, cells in price_like_columns:
+                            col_val = cells[idx]
                             if isinstance(col_val, (int, float)) and col_val > 100:
-                                col_lower = str(col_name).lower()
-                                if any(keyword in col_lower for keyword in ['price', 'cost', 'amount', 'total', '$', 'מחיר']):
-                                    total_price = self._safe_float(col_val, None)
-                                    if total_price and quantity > 0:
-                                        unit_price = total_price / quantity
-                                        logger.debug(f"Found price ${total_price:.2f} for {sku} in column '{col_name}' (same row)")
-                                        break
+                                total_price = self._safe_float(col_val, None)
+                                price_source = 'other'
+                                if total_price and quantity > 0:
+                                    unit_price = total_price / quantity
+                                    logger.debug(f"Found price ${total_price:.2f} for {sku} in column '{col_name}' (same row)")
+                                    break
                 
                 # Calculate total if not provided
                 if total_price is None and unit_price and quantity:
@@ -347,60 +942,73 @@ class ExcelParser:
                         unit_price=unit_price,
                         total_price=total_price,
                         row_number=idx + 2,  # +1 for 0-index, +1 for header
-                        raw_data=row.to_dict()
+                        raw_data=RowRef(table, idx)
                     ))
+                    price_sources[price_source if unit_price or total_price else 'none'] += 1
             
             except Exception as e:
                 logger.warning(f"Error processing row {idx} in sheet {sheet_name}: {e}")
                 continue
         
+        if layout is not None and price_sources:
+            layout.price_strategy = price_sources.most_common(1)[0][0]
+        
         return ExcelSheetData(
             sheet_name=sheet_name,
             headers=headers,
             products=products,
-            raw_data=raw_data
+            raw_data=table if keep_raw_data else [],
+            layout=layout if products else None
         )
     
-    def _find_column(self, df: pd.DataFrame, possible_names: List[str]) -> Optional[str]:
-        """Find column by matching possible names (case-insensitive)"""
-        columns_lower = {col.lower(): col for col in df.columns}
+    def _layout_columns(self, df: pd.DataFrame, layout: Optional[SheetLayout]) -> Optional[List[Any]]:
+        """
+        Columns for the roles stored in a layout (COLUMN_ROLES order)
+        
+        Returns:
+            Column labels (None for roles the layout has none for), or None
+            if the layout has no roles or they are not all in this frame
+        """
+        if layout is None or not layout.columns:
+            return None
+        labels = {str(col): col for col in df.columns}
+        if not all(name in labels for name in layout.columns.values()):
+            return None
+        return [labels[layout.columns[role]] if role in layout.columns else None for role in COLUMN_ROLES]
+    
+    def _price_row_amount(self, desc_val: Any, price_val: Any, total_val: Any,
+                          summary_label: bool, sku_missing: bool) -> Optional[float]:
+        """
+        Price a row contributes to the product above it (strategy 3), or None
         
-        for name in possible_names:
-            name_lower = name.lower()
-            # Exact match
-            if name_lower in columns_lower:
-                return columns_lower[name_lower]
-            # Partial match
-            for col in df.columns:
-                if name_lower in col.lower() or col.lower() in name_lower:
-                    return col
+        A price over 100 in the description column counts when the row is a
+        summary/price row (label like "includes"/"total", or no SKU); one in
+        the price or total column always counts.
+        """
+        if desc_val:
+            price_candidate = self._safe_float(desc_val, None)
+            if price_candidate and price_candidate > 100:
+                return price_candidate if summary_label or sku_missing else None
         
+        for val in (price_val, total_val):
+            if val:
+                price_candidate = self._safe_float(val, None)
+                if price_candidate and price_candidate > 100:
+                    return price_candidate
         return None
     
+    def _classify_columns(self, df: pd.DataFrame) -> List[Any]:
+        """Columns for COLUMN_ROLES (None where not found), scored from headers and the first rows"""
+        roles = classify_columns(list(df.columns), lambda idx: df.iloc[:COLUMN_SAMPLE_ROWS, idx].tolist())
+        return [df.columns[roles[role]] if role in roles else None for role in COLUMN_ROLES]
+    
     def _safe_int(self, value: Any, default: int = 0) -> int:
         """Safely convert value to int"""
-        if value is None:
-            return default
-        try:
-            if isinstance(value, str):
-                # Remove commas, spaces
-                value = value.replace(',', '').replace(' ', '')
-            return int(float(value))
-        except (ValueError, TypeError):
-            return default
+        return safe_int(value, default)
     
     def _safe_float(self, value: Any, default: Optional[float] = None) -> Optional[float]:
         """Safely convert value to float"""
-        if value is None:
-            return default
-        try:
-            if isinstance(value, str):
-                # Remove currency symbols, commas
-                value = value.replace('$', '').replace('₪', '').replace(',', '').replace(' ', '')
-            result = float(value)
-            return result if result >= 0 else default
-        except (ValueError, TypeError):
-            return default
+        return safe_float(value, default)
     
     def merge_sheets(self, sheets_data: Dict[str, ExcelSheetData]) -> List[ProductRow]:
         """
@@ -0,0 +1,218 @@
+"""
+Streaming Excel Row Sources
+Reads large workbooks row by row (openpyxl read-only mode, python-calamine or
+pyxlsb) and CSV/TSV price lists line by line instead of materializing every
+sheet, and picks the reading backend for a file
+"""
+
+import os
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+import logging
+
+try:
+    from openpyxl import load_workbook
+except ImportError:
+    load_workbook = None
+
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:
+    CalamineWorkbook = None
+
+try:
+    from pyxlsb import open_workbook as open_xlsb
+except ImportError:
+    open_xlsb = None
+
+from .delimited import iter_delimited_rows, is_delimited
+
+logger = logging.getLogger(__name__)
+
+STREAMING_BACKENDS = ('calamine', 'openpyxl', 'pyxlsb', 'csv')  # Fastest first
+BACKENDS = ('pandas',) + STREAMING_BACKENDS
+STREAMING_THRESHOLD_MB = 2  # Roughly 60k product rows of xlsx
+
+OPENPYXL_EXTENSIONS = ('.xlsx', '.xlsm', '.xltx', '.xltm')
+CALAMINE_EXTENSIONS = OPENPYXL_EXTENSIONS + ('.xls', '.xlsb', '.xla', '.xlam', '.ods')
+XLSB_EXTENSIONS = ('.xlsb',)
+
+SheetRows = Iterator[Tuple[str, Iterator[List[Any]]]]
+
+
+def available_backends(filepath: str) -> List[str]:
+    """Streaming backends installed that can read this file type, fastest first"""
+    extension = os.path.splitext(filepath)[1].lower()
+    available = []
+    if CalamineWorkbook is not None and extension in CALAMINE_EXTENSIONS:
+        available.append('calamine')
+    if load_workbook is not None and extension in OPENPYXL_EXTENSIONS:
+        available.append('openpyxl')
+    if open_xlsb is not None and extension in XLSB_EXTENSIONS:
+        available.append('pyxlsb')
+    if is_delimited(filepath):
+        available.append('csv')
+    return available
+
+
+def pandas_engine(filepath: str) -> Optional[str]:
+    """
+    pd.ExcelFile engine for a workbook (None = pandas' default)
+
+    pandas reads .xlsb with pyxlsb; without it, its calamine engine is used
+    when python-calamine is installed.
+    """
+    if os.path.splitext(filepath)[1].lower() in XLSB_EXTENSIONS and open_xlsb is None and CalamineWorkbook is not None:
+        return 'calamine'
+    return None
+
+
+def select_backend(filepath: str, backend: str = 'auto', threshold_mb: float = STREAMING_THRESHOLD_MB) -> str:
+    """
+    Resolve the reading backend for a workbook
+
+    "auto" reads files below threshold_mb fully with pandas (sheet-level
+    header detection, raw rows kept) and streams larger ones with the fastest
+    available streaming backend. A streaming backend that is not installed or
+    cannot read the file type falls back to the next one, then to pandas.
+    CSV/TSV files are always streamed with the "csv" backend.
+
+    Args:
+        filepath: Workbook path
+        backend: "auto", "pandas", "openpyxl", "calamine" or "pyxlsb"
+        threshold_mb: File size from which "auto" streams
+
+    Returns:
+        Backend name from BACKENDS
+    """
+    if backend not in BACKENDS and backend != 'auto':
+        logger.warning(f"Unknown Excel backend {backend}, using auto")
+        backend = 'auto'
+    if is_delimited(filepath):
+        return 'csv'
+    if backend == 'pandas':
+        return backend
+    if backend == 'auto' and os.path.getsize(filepath) < threshold_mb * 1024 * 1024:
+        return 'pandas'
+
+    available = available_backends(filepath)
+    if backend in available:
+        return backend
+    if backend != 'auto':
+        logger.warning(f"Excel backend {backend} cannot read {os.path.basename(filepath)}, "
+                       f"using {available[0] if available else 'pandas'}")
+    return available[0] if available else 'pandas'
+
+
+def _cell_value(value: Any) -> Any:
+    """Cell value as pandas' Excel readers return it (empty -> "", integral float -> int)"""
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _rows(raw_rows: Iterable, convert: bool = True) -> Iterator[List[Any]]:
+    """
+    Converted rows without trailing empty cells; empty rows at the end of the sheet are dropped
+
+    convert=False takes rows that already are lists of strings (csv) as they are.
+    """
+    pending_empty = 0
+    for raw in raw_rows:
+        row = [_cell_value(value) for value in raw] if convert else raw
+        while row and row[-1] == '':
+            row.pop()
+        if not row:
+            pending_empty += 1
+            continue
+        for _ in range(pending_empty):
+            yield []
+        pending_empty = 0
+        yield row
+
+
+def _from_origin(rows: Iterable[List[Any]], start: Optional[Tuple[int, int]]) -> Iterator[List[Any]]:
+    """Calamine rows start at the first used cell; pad them back to A1 like openpyxl"""
+    start_row, start_col = start or (0, 0)
+    for _ in range(start_row):
+        yield []
+    padding = [None] * start_col
+    for row in rows:
+        yield padding + row
+
+
+def _openpyxl_sheets(filepath: str, sheet_names: Optional[List[str]]) -> SheetRows:
+    workbook = load_workbook(filepath, read_only=True, data_only=True)
+    try:
+        for sheet_name in sheet_names or workbook.sheetnames:
+            yield sheet_name, _rows(workbook[sheet_name].iter_rows(values_only=True))
+    finally:
+        workbook.close()
+
+
+def _calamine_sheets(filepath: str, sheet_names: Optional[List[str]]) -> SheetRows:
+    workbook = CalamineWorkbook.from_path(filepath)
+    try:
+        for sheet_name in sheet_names or workbook.sheet_names:
+            sheet = workbook.get_sheet_by_name(sheet_name)
+            yield sheet_name, _rows(_from_origin(sheet.iter_rows(), sheet.start))
+    finally:
+        workbook.close()
+
+
+def _pyxlsb_sheets(filepath: str, sheet_names: Optional[List[str]]) -> SheetRows:
+    with open_xlsb(filepath) as workbook:
+        for sheet_name in sheet_names or workbook.sheets:
+            with workbook.get_sheet(sheet_name) as sheet:
+                yield sheet_name, _rows(_xlsb_rows(sheet.rows(sparse=True)))
+
+
+def _xlsb_rows(sparse_rows: Iterable) -> Iterator[List[Any]]:
+    """pyxlsb sparse rows (only the used cells, empty rows skipped) placed back at their row and column"""
+    next_row = 0
+    for cells in sparse_rows:
+        if not cells:
+            continue
+        for _ in range(cells[0].r - next_row):
+            yield []
+        row = [None] * (max(cell.c for cell in cells) + 1)
+        for cell in cells:
+            row[cell.c] = cell.v
+        next_row = cells[0].r + 1
+        yield row
+
+
+def _delimited_sheets(filepath: str, sheet_names: Optional[List[str]]) -> SheetRows:
+    """A CSV/TSV file as one sheet named after the file"""
+    sheet_name = os.path.splitext(os.path.basename(filepath))[0]
+    if not sheet_names or sheet_name in sheet_names:
+        yield sheet_name, _rows(iter_delimited_rows(filepath), convert=False)
+
+
+def iter_sheet_rows(filepath: str, backend: str, sheet_names: Optional[List[str]] = None) -> SheetRows:
+    """
+    Stream a workbook's sheets as rows of cell values
+
+    Rows come one at a time from the file (openpyxl parses the sheet XML as
+    it goes; calamine holds the sheet's cells in its own compact buffer;
+    pyxlsb and csv read records as they go), so no per-cell Python objects
+    are kept. Consume each sheet's rows before moving to the next sheet.
+
+    Args:
+        filepath: Workbook path
+        backend: "openpyxl", "calamine", "pyxlsb" or "csv"
+        sheet_names: Sheets to read (None = all sheets)
+
+    Returns:
+        Iterator of (sheet name, row iterator); empty cells are ""
+    """
+    if backend == 'calamine':
+        return _calamine_sheets(filepath, sheet_names)
+    if backend == 'openpyxl':
+        return _openpyxl_sheets(filepath, sheet_names)
+    if backend == 'pyxlsb':
+        return _pyxlsb_sheets(filepath, sheet_names)
+    if backend == 'csv':
+        return _delimited_sheets(filepath, sheet_names)
+    raise ValueError(f"Not a streaming Excel backend: {backend}")
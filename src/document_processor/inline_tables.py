@@ -0,0 +1,191 @@
+"""
+Inline Table Parser
+Converts tables pasted into email bodies (EmailParser.extract_inline_tables)
+into ProductRow objects, using the spreadsheet column-role detection
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+import logging
+
+from .excel_parser import (
+    COLUMN_SAMPLE_ROWS, ProductRow, classify_columns, count_header_keywords, safe_float, safe_int, spreadsheet_rules
+)
+
+logger = logging.getLogger(__name__)
+
+_NUMBER = re.compile(r'\d[\d,]*(?:\.\d+)?')
+_SKU_SHAPE = re.compile(r'^(?=.*\d)[A-Za-z0-9][A-Za-z0-9._/#-]{2,39}$')  # Code-like: no spaces, has a digit
+_SUMMARY_LABELS = ('total', 'subtotal', 'includes', 'סה"כ', 'סה״כ', 'מע"מ', 'vat')
+
+# Role weights for the table confidence (sum to 0.9; a keyword header row adds 0.1)
+ROLE_WEIGHTS = {'sku': 0.25, 'description': 0.25, 'quantity': 0.2, 'price': 0.2}
+HEADER_ROW_WEIGHT = 0.1
+
+
+@dataclass
+class TableLayout:
+    """Column roles detected in one inline table"""
+    header_row: int
+    columns: Dict[str, int]  # role -> column index
+    confidence: float  # Layout confidence (0-1) before per-row checks
+
+
+class InlineTableParser:
+    """
+    Rule-based inline table -> ProductRow converter
+
+    A header row is located with the spreadsheet header keywords, columns
+    are assigned roles with the same keyword lists as ExcelParser, and each
+    data row gets a confidence from the layout (which roles were found) and
+    how well its cells fit their role (numeric quantity/price, code-like SKU).
+    Pure Python over lists, so it is cheap enough to try on every email
+    before any expensive fallback.
+    """
+
+    def __init__(self, min_confidence: float = 0.5, max_header_rows: int = 10):
+        """
+        Initialize parser
+
+        Args:
+            min_confidence: Drop rows scored below this (0-1)
+            max_header_rows: Rows searched for the header row
+        """
+        self.min_confidence = min_confidence
+        self.max_header_rows = max_header_rows
+
+    def parse_tables(self, tables: List[Dict]) -> List[ProductRow]:
+        """
+        Convert inline tables to products
+
+        Args:
+            tables: Table dictionaries from EmailParser.extract_inline_tables
+
+        Returns:
+            ProductRow objects with confidence scores, in table/row order
+        """
+        products = []
+        seen = set()  # HTML and text bodies often carry the same table
+        for table_num, table in enumerate(tables):
+            rows = table.get('data') or []
+            key = tuple(tuple(row) for row in rows)
+            if len(rows) < 2 or key in seen:
+                continue
+            seen.add(key)
+            products.extend(self.parse_table(rows, table_num, table.get('type', 'inline_table')))
+        return products
+
+    def detect_layout(self, rows: List[List[str]]) -> Optional[TableLayout]:
+        """
+        Find the header row and assign column roles
+
+        Args:
+            rows: Table rows (lists of cell strings)
+
+        Returns:
+            TableLayout, or None if no row looks like a product table header
+        """
+        for row_idx, row in enumerate(rows[:self.max_header_rows]):
+            if count_header_keywords(row) < 2:
+                continue
+
+            # One-character headers ("#", "%") would partially match role names like "part#"
+            headers = [str(cell).strip() if len(str(cell).strip()) > 1 else "" for cell in row]
+            # Unlike spreadsheets, one pasted column never serves two roles
+            sample = rows[row_idx + 1:row_idx + 1 + COLUMN_SAMPLE_ROWS]
+            columns = classify_columns(headers, lambda idx: [row[idx] for row in sample if idx < len(row)],
+                                       share_required=False)
+
+            if 'sku' not in columns or 'description' not in columns:
+                continue
+            confidence = HEADER_ROW_WEIGHT + sum(
+                weight for role, weight in ROLE_WEIGHTS.items()
+                if role in columns or (role == 'price' and 'total' in columns)
+            )
+            return TableLayout(header_row=row_idx, columns=columns, confidence=round(confidence, 2))
+        return None
+
+    def parse_table(self, rows: List[List[str]], table_num: int = 0, source: str = 'inline_table') -> List[ProductRow]:
+        """
+        Convert one inline table to products
+
+        Args:
+            rows: Table rows (lists of cell strings)
+            table_num: Table index within the email (kept in raw_data)
+            source: Table type ("html_table" / "text_table")
+
+        Returns:
+            ProductRow objects scoring at least min_confidence
+        """
+        layout = self.detect_layout(rows)
+        if layout is None:
+            logger.debug(f"Inline table {table_num}: no product header row")
+            return []
+
+        columns = layout.columns
+        sku_headers = spreadsheet_rules().column_keywords['sku']
+        products = []
+        for row_num, row in enumerate(rows[layout.header_row + 1:], layout.header_row + 2):
+            sku = self._cell(row, columns.get('sku'))
+            description = self._cell(row, columns.get('description'))
+            if not sku or not description or self._is_summary_row(sku):
+                continue
+            if count_header_keywords(row) >= 2 and sku.lower() in sku_headers:
+                continue  # Repeated header
+
+            qty_cell = self._cell(row, columns.get('quantity'))
+            price_cell = self._cell(row, columns.get('price'))
+            total_cell = self._cell(row, columns.get('total'))
+            quantity = safe_int(self._number(qty_cell), 1) if qty_cell else 1
+            unit_price = self._price(price_cell) or 0.0
+            total_price = self._price(total_cell)
+            if not unit_price and total_price and quantity > 0:
+                unit_price = total_price / quantity
+            if total_price is None and unit_price and quantity:
+                total_price = unit_price * quantity
+
+            # Row fit: each role-bearing cell that parses as its role adds to the score
+            checks = [bool(_SKU_SHAPE.match(sku))]
+            if 'quantity' in columns:
+                checks.append(self._number(qty_cell) is not None)
+            if 'price' in columns or 'total' in columns:
+                checks.append(bool(unit_price))
+            confidence = round(layout.confidence * (0.5 + 0.5 * sum(checks) / len(checks)), 2)
+            if confidence < self.min_confidence:
+                logger.debug(f"Inline table {table_num} row {row_num}: confidence {confidence} below threshold")
+                continue
+
+            products.append(ProductRow(
+                sku=sku,
+                description=description,
+                quantity=quantity,
+                unit_price=unit_price,
+                total_price=total_price,
+                row_number=row_num,
+                raw_data={"table": table_num, "type": source, "row": row},
+                confidence=confidence
+            ))
+        return products
+
+    def _cell(self, row: List[str], index: Optional[int]) -> str:
+        if index is None or index >= len(row):
+            return ""
+        return str(row[index]).strip()
+
+    def _number(self, text: str) -> Optional[str]:
+        """First number in a cell ("1,250.00 USD" -> "1,250.00")"""
+        match = _NUMBER.search(text or "")
+        return match.group(0) if match else None
+
+    def _price(self, text: str) -> Optional[float]:
+        if not text:
+            return None
+        price = safe_float(text, None)
+        if price is None:
+            price = safe_float(self._number(text), None)
+        return price
+
+    def _is_summary_row(self, label: str) -> bool:
+        label = label.lower()
+        return any(label.startswith(summary) for summary in _SUMMARY_LABELS)
@@ -3,7 +3,9 @@ PDF File Parser
 Extracts product data from PDF documents, including scanned PDFs with OCR
 """
 
+import math
 import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 import logging
@@ -30,18 +32,37 @@ from ..document_processor.excel_parser import ProductRow
 
 logger = logging.getLogger(__name__)
 
+PARALLEL_THRESHOLD_PAGES = 4  # Fewer pages parse faster than worker processes start
+RANGES_PER_WORKER = 3  # Page ranges per worker, so a few dense pages don't leave the others idle
+
+
+def _parse_pages_worker(filepath: str, first_page: int, last_page: int) -> List[ProductRow]:
+    """Process pool entry point: parse pages first_page..last_page (1-based, inclusive) in this process"""
+    return PDFParser(use_ocr=False, max_workers=1)._parse_pages(filepath, list(range(first_page, last_page + 1)))
+
+
+def page_ranges(page_count: int, parts: int) -> List[range]:
+    """Split pages 1..page_count into at most ``parts`` contiguous ranges of near-equal size"""
+    size = max(1, math.ceil(page_count / max(parts, 1)))
+    return [range(first, min(first + size, page_count + 1)) for first in range(1, page_count + 1, size)]
+
 
 class PDFParser:
     """Parse PDF files to extract product information"""
     
-    def __init__(self, use_ocr: bool = True):
+    def __init__(self, use_ocr: bool = True, max_workers: Optional[int] = None,
+                 parallel_threshold_pages: int = PARALLEL_THRESHOLD_PAGES):
         """
         Initialize PDF parser
         
         Args:
             use_ocr: Enable OCR for scanned PDFs
+            max_workers: Processes pdfplumber pages are spread over (None = one per CPU core, 1 = serial)
+            parallel_threshold_pages: Page count from which pages are parsed in parallel
         """
         self.use_ocr = use_ocr and OCR_AVAILABLE
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.parallel_threshold_pages = parallel_threshold_pages
         
         if pdfplumber is None and PyPDF2 is None:
             logger.warning("No PDF parsing library available")
@@ -75,29 +96,77 @@ class PDFParser:
             raise
     
     def _parse_with_pdfplumber(self, filepath: str) -> List[ProductRow]:
-        """Parse using pdfplumber (better table extraction)"""
-        products = []
-        
+        """Parse using pdfplumber (better table extraction); long documents in parallel page ranges"""
         try:
             with pdfplumber.open(filepath) as pdf:
-                for page_num, page in enumerate(pdf.pages, 1):
-                    # Try to extract tables first
-                    tables = page.extract_tables()
-                    
-                    if tables:
-                        for table in tables:
-                            table_products = self._extract_products_from_table(table, page_num)
-                            products.extend(table_products)
-                    
-                    # Also extract text and look for product patterns
-                    text = page.extract_text()
-                    if text:
-                        text_products = self._extract_products_from_text(text, page_num)
-                        products.extend(text_products)
+                page_count = len(pdf.pages)
+            
+            if self.max_workers > 1 and page_count >= self.parallel_threshold_pages:
+                return self._parse_parallel(filepath, page_count)
+            return self._parse_pages(filepath)
         
         except Exception as e:
             logger.error(f"Error with pdfplumber: {e}")
             raise
+    
+    def _parse_pages(self, filepath: str, pages: Optional[List[int]] = None) -> List[ProductRow]:
+        """
+        Parse pages with pdfplumber in this process
+        
+        Args:
+            filepath: Path to PDF file
+            pages: 1-based page numbers (None = all pages)
+            
+        Returns:
+            Products in page order
+        """
+        products = []
+        
+        with pdfplumber.open(filepath, pages=pages) as pdf:
+            for page in pdf.pages:
+                page_num = page.page_number
+                
+                # Try to extract tables first
+                tables = page.extract_tables()
+                
+                if tables:
+                    for table in tables:
+                        table_products = self._extract_products_from_table(table, page_num)
+                        products.extend(table_products)
+                
+                # Also extract text and look for product patterns
+                text = page.extract_text()
+                if text:
+                    text_products = self._extract_products_from_text(text, page_num)
+                    products.extend(text_products)
+                
+                # Drop the page's parsed layout and objects, so memory doesn't grow with page count
+                page.close()
+        
+        return products
+    
+    def _parse_parallel(self, filepath: str, page_count: int) -> List[ProductRow]:
+        """
+        Parse page ranges in worker processes, each opening the file itself
+        
+        Pages are split into contiguous ranges (RANGES_PER_WORKER per worker)
+        and the ranges' products are merged back in page order, so the result
+        is the same as a serial parse. Falls back to a serial parse if the
+        pool fails.
+        """
+        workers = min(self.max_workers, page_count)
+        ranges = page_ranges(page_count, workers * RANGES_PER_WORKER)
+        logger.info(f"Parsing {page_count} pages of {os.path.basename(filepath)} in {workers} processes")
+        
+        products = []
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_parse_pages_worker, filepath, pages[0], pages[-1]) for pages in ranges]
+                for future in futures:
+                    products.extend(future.result())
+        except Exception as e:
+            logger.warning(f"Parallel page parsing failed ({e}), parsing serially")
+            return self._parse_pages(filepath)
         
         return products
     
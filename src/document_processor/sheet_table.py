@@ -0,0 +1,149 @@
+"""
+Shared Sheet Tables
+Keeps a parsed sheet's cells once, in its columnar DataFrame, and hands out
+lazy row references instead of copying every row into a dict per product
+"""
+
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Iterator, List
+
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError:
+    np = None
+    pd = None
+
+
+def _column_array(column: 'pd.Series'):
+    """A column's cells without copying them: the numpy array, or the extension/datetime array"""
+    if isinstance(column.dtype, np.dtype) and column.dtype.kind in 'biufcO':
+        return column.to_numpy(copy=False)
+    return column.array  # Timestamps, nullable and string dtypes index to the frame's scalars
+
+
+def _scalar(value: Any) -> Any:
+    """numpy scalar -> Python scalar (what an object cell array holds)"""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class SheetTable(Sequence):
+    """
+    Cell values of one parsed sheet (or streamed chunk of a sheet)
+
+    Reads like the list of row dicts ``df.to_dict('records')`` returned, but
+    rows are only built when indexed or iterated; the frame's columns are the
+    single copy of the data, shared by every RowRef into it. A RowRef reads
+    its cells from the column arrays, so no row-major copy of the sheet is made.
+    """
+
+    __slots__ = ('sheet_name', 'frame', '_columns')
+
+    def __init__(self, sheet_name: str, frame: 'pd.DataFrame'):
+        """
+        Initialize table
+
+        Args:
+            sheet_name: Sheet the rows come from
+            frame: Parsed sheet frame (header columns), or one streamed chunk of it
+        """
+        self.sheet_name = sheet_name
+        self.frame = frame
+        self._columns = None
+
+    @property
+    def headers(self) -> List[Any]:
+        return list(self.frame.columns)
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.frame.iloc[index].to_dict('records')
+        index = self.row(index).index
+        return self.frame.iloc[index:index + 1].to_dict('records')[0]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.frame.to_dict('records'))
+
+    def row(self, index: int) -> 'RowRef':
+        """Lazy reference to one row"""
+        if index < 0:
+            index += len(self.frame)
+        if not 0 <= index < len(self.frame):
+            raise IndexError(f"Row {index} out of range for sheet {self.sheet_name}")
+        return RowRef(self, index)
+
+    def row_values(self, index: int) -> List[Any]:
+        """Cell values of one row, as Python scalars (like the cells of ``frame.values[index]``)"""
+        if self._columns is None:
+            self._columns = [_column_array(self.frame.iloc[:, i]) for i in range(self.frame.shape[1])]
+        return [_scalar(column[index]) for column in self._columns]
+
+    def __getstate__(self):
+        return self.sheet_name, self.frame  # Column arrays are looked up again on demand
+
+    def __setstate__(self, state):
+        self.sheet_name, self.frame = state
+        self._columns = None
+
+    def __repr__(self) -> str:
+        return f"SheetTable(sheet_name={self.sheet_name!r}, rows={len(self)}, columns={self.frame.shape[1]})"
+
+
+class RowRef(Mapping):
+    """
+    Read-only mapping of column header -> cell value for one row of a SheetTable
+
+    Holds only the table and the row index; the values are read from the
+    table on access. Copying (copy / deepcopy, as dataclasses.asdict does)
+    materializes a plain dict, so serialized products carry their own row.
+    """
+
+    __slots__ = ('table', 'index')
+
+    def __init__(self, table: SheetTable, index: int):
+        self.table = table
+        self.index = index
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The row as a plain dict"""
+        return dict(zip(self.table.frame.columns, self.table.row_values(self.index)))
+
+    def __getitem__(self, key):
+        return self.to_dict()[key]
+
+    def __iter__(self):
+        return iter(self.to_dict())
+
+    def __len__(self) -> int:
+        return len(self.to_dict())
+
+    def __bool__(self) -> bool:
+        return self.table.frame.shape[1] > 0  # Without materializing (``raw_data or {}``)
+
+    def keys(self):
+        return self.to_dict().keys()
+
+    def items(self):
+        return self.to_dict().items()
+
+    def values(self):
+        return self.to_dict().values()
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, RowRef):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    __hash__ = None
+
+    def __copy__(self) -> Dict[str, Any]:
+        return self.to_dict()
+
+    def __deepcopy__(self, memo) -> Dict[str, Any]:
+        return self.to_dict()
+
+    def __repr__(self) -> str:
+        return repr(self.to_dict())
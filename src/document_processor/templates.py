@@ -0,0 +1,199 @@
+"""
+Vendor Template Registry
+Remembers the sheet layouts of vendors that send the same workbook format every
+time (header row, column roles, price strategy), keyed by a fingerprint of the
+header cells, sheet width and sender domain, so known layouts skip header and
+column detection
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field, replace
+from email.utils import parseaddr
+from typing import Any, Dict, Iterable, List, Optional, Set
+import logging
+
+from ..rules import rule_pack
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_FORMAT = 1  # Bump when the stored layout changes
+MAX_TEMPLATES = 2000
+SAVE_INTERVAL = 60  # Seconds between saves that only update hit counts
+REQUIRED_ROLES = ('sku', 'description')
+
+
+@dataclass
+class SheetLayout:
+    """Header row and column roles of one vendor sheet layout"""
+    domain: str  # Sender domain ("" if unknown)
+    header_row: int  # Index of the header row in the sheet's rows
+    fingerprint: str = ""
+    columns: Dict[str, str] = field(default_factory=dict)  # Role -> column header (as str)
+    price_strategy: str = "none"  # Where most prices were found: columns, description, below, other, none
+    hits: int = 0  # Parses that used the stored layout
+    last_used: float = 0.0
+
+
+def sender_domain(sender: Optional[str]) -> str:
+    """Lower-cased domain of a sender ("DDN Sales <quotes@ddn.com>" -> "ddn.com"), "" if none"""
+    address = parseaddr(sender or "")[1]
+    return address.rpartition('@')[2].lower() if '@' in address else ""
+
+
+def header_cells(row: List[Any]) -> List[str]:
+    """Normalized header cells: stripped, lower-cased, trailing empty cells removed"""
+    cells = ["" if cell is None else str(cell).strip().lower() for cell in row]
+    while cells and not cells[-1]:
+        cells.pop()
+    return cells
+
+
+def fingerprint(domain: str, header_row: int, row: List[Any]) -> str:
+    """
+    Layout fingerprint of a sheet
+
+    Covers the sender domain, the header row position and its normalized
+    cells (and so the sheet width), plus the spreadsheet rule pack digest, so
+    a rule change retires layouts learned under the old rules.
+    """
+    cells = header_cells(row)
+    digest = hashlib.sha256(f"{TEMPLATE_FORMAT}\x1e{rule_pack('spreadsheet').digest}\x1e{domain}".encode())
+    digest.update(f"\x1e{header_row}\x1e{len(cells)}\x1e".encode())
+    digest.update("\x1f".join(cells).encode())
+    return digest.hexdigest()[:24]
+
+
+class TemplateRegistry:
+    """
+    Local store of learned sheet layouts
+
+    ExcelParser asks for a match before header detection: for every header
+    row position known for the sender's domain, the row at that position is
+    fingerprinted and looked up, so a hit costs a hash per known position.
+    Layouts of sheets that yielded products are learned after each parse and
+    written to ``path`` as JSON (atomically; hit counts at most every
+    SAVE_INTERVAL seconds); the least recently used layouts are dropped above
+    ``max_templates``.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_templates: int = MAX_TEMPLATES):
+        """
+        Initialize registry
+
+        Args:
+            path: JSON file the layouts are kept in (None = in memory only)
+            max_templates: Layouts kept
+        """
+        self.path = path
+        self.max_templates = max_templates
+        self._layouts: Dict[str, SheetLayout] = {}
+        self._header_rows: Dict[str, Set[int]] = {}  # Domain -> known header row positions
+        self.hits = 0
+        self.misses = 0
+        self._last_save = time.monotonic()
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._layouts)
+
+    def match(self, domain: str, rows: List[List[Any]]) -> Optional[SheetLayout]:
+        """
+        Stored layout of a sheet, if its fingerprint is known
+
+        Args:
+            domain: Sender domain
+            rows: The sheet's first rows (at least up to the header row)
+
+        Returns:
+            Copy of the stored layout, or None
+        """
+        for header_row in sorted(self._header_rows.get(domain, ())):
+            if header_row < len(rows):
+                layout = self._layouts.get(fingerprint(domain, header_row, rows[header_row]))
+                if layout is not None:
+                    self.hits += 1
+                    return replace(layout, columns=dict(layout.columns), hits=1)
+        self.misses += 1
+        return None
+
+    def learn(self, layouts: Iterable[Optional[SheetLayout]]):
+        """
+        Store the layouts of successfully parsed sheets and save the registry
+
+        Args:
+            layouts: Layouts from ExcelSheetData.layout (None entries are skipped)
+        """
+        changed = False
+        dirty = False
+        now = time.time()
+        for layout in layouts:
+            if layout is None or not layout.fingerprint or not all(layout.columns.get(role) for role in REQUIRED_ROLES):
+                continue
+            stored = self._layouts.get(layout.fingerprint)
+            if stored is None:
+                logger.info(f"Learned sheet layout for {layout.domain or 'unknown sender'}: header row "
+                            f"{layout.header_row}, columns {layout.columns}, prices from {layout.price_strategy}")
+                stored = replace(layout, hits=0)
+                self._layouts[layout.fingerprint] = stored
+                self._header_rows.setdefault(layout.domain, set()).add(layout.header_row)
+                changed = True
+            elif stored.columns != layout.columns or stored.price_strategy != layout.price_strategy:
+                logger.info(f"Sheet layout for {layout.domain or 'unknown sender'} changed: columns "
+                            f"{layout.columns}, prices from {layout.price_strategy}")
+                stored.columns = dict(layout.columns)
+                stored.price_strategy = layout.price_strategy
+                changed = True
+            stored.hits += layout.hits
+            stored.last_used = now
+            dirty = True
+
+        if changed:
+            self._evict()
+        if changed or (dirty and time.monotonic() - self._last_save >= SAVE_INTERVAL):
+            self._save()
+
+    def _evict(self):
+        """Drop least recently used layouts above max_templates"""
+        excess = len(self._layouts) - self.max_templates
+        if excess <= 0:
+            return
+        for key in sorted(self._layouts, key=lambda k: self._layouts[k].last_used)[:excess]:
+            del self._layouts[key]
+        self._header_rows = {}
+        for layout in self._layouts.values():
+            self._header_rows.setdefault(layout.domain, set()).add(layout.header_row)
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('format') != TEMPLATE_FORMAT:
+                logger.info(f"Ignoring sheet layouts in {self.path} (format {data.get('format')})")
+                return
+            for entry in data.get('layouts', []):
+                layout = SheetLayout(**entry)
+                self._layouts[layout.fingerprint] = layout
+                self._header_rows.setdefault(layout.domain, set()).add(layout.header_row)
+        except Exception as e:
+            logger.warning(f"Could not load sheet layouts from {self.path}: {e}")
+
+    def _save(self):
+        self._last_save = time.monotonic()
+        if not self.path:
+            return
+        data = {'format': TEMPLATE_FORMAT, 'layouts': [asdict(layout) for layout in self._layouts.values()]}
+        try:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.templates_')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, default=str)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save sheet layouts to {self.path}: {e}")
@@ -3,7 +3,7 @@ Data Unifier
 Normalizes product data from different sources (Excel, PDF, inline tables)
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Mapping, Optional
 from dataclasses import dataclass, field
 import logging
 
@@ -12,7 +12,7 @@ from .excel_parser import ProductRow
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class UnifiedProduct:
     """Unified product structure from all sources"""
     sku: str
@@ -22,7 +22,7 @@ class UnifiedProduct:
     total_price: Optional[float] = None
     source: str = "unknown"  # "excel", "pdf", "inline_table", "email_text"
     source_file: Optional[str] = None
-    raw_data: Dict[str, Any] = field(default_factory=dict)
+    raw_data: Mapping[str, Any] = field(default_factory=dict)  # Shared with the source ProductRow (not copied)
     confidence: float = 1.0  # Confidence in extraction (0-1)
     metadata: Dict[str, Any] = field(default_factory=dict)
 
@@ -57,7 +57,7 @@ class DataUnifier:
                     source=source_type,
                     source_file=getattr(product, 'source_file', None),
                     raw_data=product.raw_data or {},
-                    confidence=1.0,
+                    confidence=getattr(product, 'confidence', 1.0),
                     metadata={
                         "row_number": product.row_number,
                         "category": getattr(product, 'category', None)
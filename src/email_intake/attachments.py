@@ -0,0 +1,280 @@
+"""
+Email Attachments
+Lazy attachment handles: name, size and sniffed type are known up front,
+the bytes are only read when a consumer asks for them
+"""
+
+import base64
+import binascii
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterator, Optional, Tuple
+import logging
+
+try:
+    import olefile
+except ImportError:
+    olefile = None
+
+logger = logging.getLogger(__name__)
+
+HEAD_BYTES = 512  # Enough for every signature below, and one OLE sector
+STREAM_CHUNK_BYTES = 1024 * 1024  # Attachment bytes held in memory at a time when streaming
+SPOOL_MEMORY_BYTES = 8 * 1024 * 1024  # Spooled attachment buffers move to disk above this
+
+EXCEL_KINDS = frozenset(['xlsx', 'xls', 'xlsb', 'csv'])  # Parsed by ExcelParser
+PARSEABLE_KINDS = EXCEL_KINDS | {'pdf'}
+
+_OLE_SIGNATURE = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+_ZIP_SIGNATURES = (b'PK\x03\x04', b'PK\x05\x06', b'PK\x07\x08')
+_IMAGE_SIGNATURES = (b'\x89PNG\r\n\x1a\n', b'\xff\xd8\xff', b'GIF87a', b'GIF89a', b'II*\x00', b'MM\x00*')
+_XLSX_EXTENSIONS = ('.xlsx', '.xlsm', '.xltx', '.xltm')
+_DELIMITED_EXTENSIONS = ('.csv', '.tsv', '.tab')
+_DELIMITED_TYPES = ('text/csv', 'text/tab-separated-values', 'application/csv')
+_EXTENSION_KINDS = {
+    '.xlsx': 'xlsx', '.xlsm': 'xlsx', '.xltx': 'xlsx', '.xltm': 'xlsx',
+    '.xls': 'xls', '.xlt': 'xls',
+    '.xlsb': 'xlsb',
+    '.csv': 'csv', '.tsv': 'csv', '.tab': 'csv',
+    '.pdf': 'pdf',
+}
+
+
+def sniff_kind(head: Optional[bytes], filename: str = "", content_type: str = "") -> str:
+    """
+    Classify an attachment from its first bytes
+
+    Zip and OLE containers are told apart (xlsx/xlsb vs docx/zip, xls vs
+    doc/msg) by the file extension; text without a binary signature is a CSV/TSV
+    price list by its extension or MIME type. Without any bytes the extension
+    alone decides.
+
+    Args:
+        head: First bytes of the attachment (None if unavailable)
+        filename: Attachment filename
+        content_type: Declared MIME type
+
+    Returns:
+        "xlsx", "xls", "xlsb", "csv", "pdf", "image", "zip", "ole" or "other"
+    """
+    suffix = Path(filename or "").suffix.lower()
+    if not head:
+        if content_type.startswith('image/'):
+            return 'image'
+        return _EXTENSION_KINDS.get(suffix, 'other')
+
+    if b'%PDF-' in head[:HEAD_BYTES]:  # Readers accept junk before the header
+        return 'pdf'
+    if head.startswith(_ZIP_SIGNATURES):
+        if suffix == '.xlsb' or 'sheet.binary' in content_type.lower():
+            return 'xlsb'
+        if suffix in _XLSX_EXTENSIONS or b'xl/' in head or 'spreadsheetml' in content_type:
+            return 'xlsx'
+        return 'zip'
+    if head.startswith(_OLE_SIGNATURE):
+        if suffix in ('.xls', '.xlt') or 'ms-excel' in content_type:
+            return 'xls'
+        return 'ole'
+    if head.startswith(_IMAGE_SIGNATURES):
+        return 'image'
+    if (suffix in _DELIMITED_EXTENSIONS or content_type.lower() in _DELIMITED_TYPES) and _is_text(head):
+        return 'csv'
+    return 'other'
+
+
+def output_filename(filename: str, kind: str) -> str:
+    """
+    Name to save an attachment under, with an extension its parser reads
+
+    The Excel pipeline picks the CSV/TSV reader by extension, so a delimited
+    price list recognized only by its MIME type (e.g. "prices" sent as
+    text/csv) is saved as "prices.csv".
+    """
+    if kind == 'csv' and Path(filename).suffix.lower() not in _DELIMITED_EXTENSIONS:
+        return f"{filename}.csv"
+    return filename
+
+
+def _is_text(head: bytes) -> bool:
+    """No NUL bytes, except in UTF-16 text (BOM)"""
+    return b'\x00' not in head or head.startswith((b'\xff\xfe', b'\xfe\xff'))
+
+
+@dataclass
+class EmailAttachment:
+    """Attachment handle; ``data`` reads the bytes on each access (not cached)"""
+    filename: str
+    content_type: str
+    size: int  # Bytes (estimated from the encoded length for MIME parts)
+    kind: str = "other"  # See sniff_kind
+    content_id: Optional[str] = None  # Set for inline (cid:) images
+    locator: Optional[Tuple] = None  # ("ole", stream path) / ("mime", index), see EmailParser.bind_attachments
+    loader: Optional[Callable[[], Optional[bytes]]] = field(default=None, repr=False)
+    chunks: Optional[Callable[[int], Iterator[bytes]]] = field(default=None, repr=False)  # Streaming reader
+
+    def __getstate__(self):
+        # Loaders close over open messages; unpickled handles are re-bound from the locator
+        state = self.__dict__.copy()
+        state['loader'] = None
+        state['chunks'] = None
+        return state
+
+    @property
+    def data(self) -> Optional[bytes]:
+        """Attachment bytes, read from the source message on demand"""
+        if self.loader is None:
+            return None
+        return self.loader()
+
+    @property
+    def parseable(self) -> bool:
+        """True if a document parser handles this kind (xlsx/xls/xlsb/csv/pdf)"""
+        return self.kind in PARSEABLE_KINDS
+
+    def iter_chunks(self, chunk_size: int = STREAM_CHUNK_BYTES) -> Iterator[bytes]:
+        """
+        Attachment bytes in chunks of at most ``chunk_size``
+
+        Attachments of .msg files are read straight from the compound file,
+        so only one chunk is in memory at a time; other sources slice
+        their already decoded payload.
+        """
+        if self.chunks is not None:
+            yield from self.chunks(chunk_size)
+            return
+        data = self.data
+        if data is None:
+            return
+        view = memoryview(data)
+        for start in range(0, len(view), chunk_size):
+            yield view[start:start + chunk_size]
+
+    def save(self, filepath: str, chunk_size: int = STREAM_CHUNK_BYTES) -> Optional[int]:
+        """
+        Stream the attachment to a file
+
+        Returns:
+            Bytes written, or None if the attachment has no data
+        """
+        if self.loader is None and self.chunks is None:
+            return None
+        written = 0
+        with open(filepath, 'wb') as f:
+            for chunk in self.iter_chunks(chunk_size):
+                written += f.write(chunk)
+        return written
+
+    def spool(self, max_memory: int = SPOOL_MEMORY_BYTES, chunk_size: int = STREAM_CHUNK_BYTES) -> BinaryIO:
+        """
+        Copy the attachment into a buffer that spills to disk above ``max_memory``
+
+        Returns:
+            SpooledTemporaryFile positioned at the start (caller closes it)
+        """
+        buffer = tempfile.SpooledTemporaryFile(max_size=max_memory, prefix='dt-attachment-')
+        for chunk in self.iter_chunks(chunk_size):
+            buffer.write(chunk)
+        buffer.seek(0)
+        return buffer
+
+
+def base64_head(payload: str, length: int = HEAD_BYTES) -> Optional[bytes]:
+    """Decode only the first ``length`` bytes of a base64 payload"""
+    chars = ''.join(payload[:length * 2].split())
+    chars = chars[:(length + 2) // 3 * 4]
+    chars = chars[:len(chars) - len(chars) % 4]
+    try:
+        return base64.b64decode(chars)
+    except (binascii.Error, ValueError):
+        return None
+
+
+def base64_size(payload: str) -> int:
+    """Decoded size of a base64 payload, from its length (ignores line breaks)"""
+    payload = payload.rstrip()
+    line_breaks = payload.count('\n') + payload.count('\r')
+    return max(0, (len(payload) - line_breaks) * 3 // 4 - payload[-2:].count('='))
+
+
+def ole_stream_head(ole, path, length: int = HEAD_BYTES) -> bytes:
+    """
+    First bytes of an OLE stream without reading the whole stream
+
+    olefile's openstream() loads the complete stream; for regular (non-mini)
+    streams read the first sector straight from the file instead.
+    """
+    entry = ole.direntries[ole._find(path)]
+    if entry.size < ole.minisectorcutoff:
+        return ole.openstream(path).read(length)
+    ole.fp.seek(ole.sectorsize * (entry.isectStart + 1))
+    return ole.fp.read(min(length, entry.size, ole.sectorsize))
+
+
+def iter_ole_stream(ole, path, chunk_size: int = STREAM_CHUNK_BYTES) -> Iterator[bytes]:
+    """
+    Read an OLE stream in chunks by following its FAT sector chain
+
+    olefile's openstream() assembles the whole stream in memory; this reads
+    runs of consecutive sectors straight from the file instead, so memory
+    stays at ``chunk_size`` however large the attachment is.
+
+    Args:
+        ole: Open olefile.OleFileIO
+        path: Stream path (list of storage/stream names)
+        chunk_size: Maximum bytes per chunk (rounded up to one sector)
+    """
+    entry = ole.direntries[ole._find(path)]
+    if entry.size < ole.minisectorcutoff:
+        yield ole.openstream(path).read()  # Mini stream, at most 4 KB
+        return
+
+    sector_size = ole.sectorsize
+    fat = ole.fat
+    sector = entry.isectStart
+    remaining = entry.size
+    while remaining > 0:
+        if sector >= len(fat):
+            raise IOError(f"Broken sector chain in OLE stream {'/'.join(path)}")
+        run_start = sector
+        run_sectors = 1
+        # Extend the run while the chain continues with the next sector on disk
+        while (run_sectors + 1) * sector_size <= max(chunk_size, sector_size) and \
+                run_sectors * sector_size < remaining and fat[sector] == sector + 1:
+            sector += 1
+            run_sectors += 1
+        ole.fp.seek(sector_size * (run_start + 1))
+        data = ole.fp.read(min(run_sectors * sector_size, remaining))
+        if not data:
+            raise IOError(f"OLE stream {'/'.join(path)} is truncated")
+        remaining -= len(data)
+        yield data
+        sector = fat[sector]
+
+
+def ole_stream_chunks(filepath: str, path) -> Callable[[int], Iterator[bytes]]:
+    """Streaming reader that reopens the compound file and yields one stream in chunks"""
+    def chunks(chunk_size: int = STREAM_CHUNK_BYTES) -> Iterator[bytes]:
+        if olefile is None:
+            logger.warning("olefile not available, cannot read attachment")
+            return
+        ole = olefile.OleFileIO(filepath)
+        try:
+            yield from iter_ole_stream(ole, path, chunk_size)
+        finally:
+            ole.close()
+    return chunks
+
+
+def ole_stream_loader(filepath: str, path) -> Callable[[], Optional[bytes]]:
+    """Loader that reopens the compound file and reads one stream"""
+    def load() -> Optional[bytes]:
+        if olefile is None:
+            logger.warning("olefile not available, cannot read attachment")
+            return None
+        ole = olefile.OleFileIO(filepath)
+        try:
+            return ole.openstream(path).read()
+        finally:
+            ole.close()
+    return load
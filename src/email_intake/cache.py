@@ -0,0 +1,172 @@
+"""
+Parsed Email Cache
+Stores parsed EmailMetadata / EmailContext on disk, keyed by the email file's
+content hash, so re-running the same .msg skips OLE parsing and extraction
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+import zlib
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Tuple
+import logging
+
+from .content_extractor import context_rules_digest
+
+logger = logging.getLogger(__name__)
+
+CACHE_FORMAT = 1  # Bump when the entry layout changes
+_ENTRY_SUFFIX = '.pz'
+_HASH_CHUNK = 1024 * 1024
+
+
+@lru_cache(maxsize=1)
+def parser_version() -> str:
+    """
+    Version stamp of the email intake code
+
+    Hash of the email_intake sources, so any parser/extractor change
+    invalidates existing entries without a manual version bump.
+    """
+    digest = hashlib.sha256(str(CACHE_FORMAT).encode())
+    for path in sorted(Path(__file__).parent.glob('*.py')):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def file_digest(filepath: str) -> str:
+    """SHA-256 of a file's content"""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ParsedEmailCache:
+    """
+    Size-bounded on-disk cache of (EmailMetadata, EmailContext)
+
+    Entries are zlib-compressed pickles named by content hash and stamped
+    with the parser version, the context rule pack and caller settings.
+    Hits refresh the entry's mtime; when the directory grows past
+    ``max_bytes`` the least recently used entries are removed. Entries are only read from a directory this
+    service writes (pickle is not safe for untrusted input).
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024, settings: str = ""):
+        """
+        Initialize cache
+
+        Args:
+            directory: Cache directory (created on first write)
+            max_bytes: Evict least recently used entries above this total size
+            settings: Extra stamp for options that change the parsed result
+                (e.g. max_thread_segments)
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.settings = settings
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def stamp(self) -> str:
+        """Entry stamp: parser version, context rule pack in effect and settings"""
+        return f"{parser_version()}:{context_rules_digest()}:{self.settings}"
+
+    def key_for(self, filepath: str) -> str:
+        """Cache key (content hash) of an email file"""
+        return file_digest(filepath)
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + _ENTRY_SUFFIX)
+
+    def get(self, key: str) -> Optional[Tuple]:
+        """
+        Load a cached entry
+
+        Args:
+            key: Key from key_for()
+
+        Returns:
+            (EmailMetadata, EmailContext), or None on a miss or stale entry
+        """
+        path = self._entry_path(key)
+        try:
+            with open(path, 'rb') as f:
+                stamp, metadata, context = pickle.loads(zlib.decompress(f.read()))
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as e:
+            logger.warning(f"Discarding unreadable email cache entry {path}: {e}")
+            self._remove(path)
+            self.misses += 1
+            return None
+
+        if stamp != self.stamp:
+            logger.debug(f"Email cache entry {key[:12]} is from another parser version")
+            self._remove(path)
+            self.misses += 1
+            return None
+
+        try:
+            os.utime(path)  # LRU order
+        except OSError:
+            pass
+        self.hits += 1
+        return metadata, context
+
+    def put(self, key: str, metadata, context):
+        """
+        Store an entry (atomically) and evict if over the size bound
+
+        Args:
+            key: Key from key_for()
+            metadata: EmailMetadata object
+            context: EmailContext object
+        """
+        try:
+            payload = zlib.compress(pickle.dumps((self.stamp, metadata, context), pickle.HIGHEST_PROTOCOL))
+        except Exception as e:
+            logger.warning(f"Could not serialize email for cache: {e}")
+            return
+        if len(payload) > self.max_bytes:
+            return
+
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix='.entry_')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+        os.replace(temp_path, self._entry_path(key))
+        self._evict()
+
+    def _evict(self):
+        """Remove least recently used entries until under max_bytes"""
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(_ENTRY_SUFFIX):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+        if total <= self.max_bytes:
+            return
+
+        for _, size, path in sorted(entries):
+            self._remove(path)
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def _remove(self, path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -4,54 +4,291 @@ Extracts and structures relevant information from email body for agent understan
 """
 
 import re
-from typing import Dict, List, Optional
-from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Match, Optional, Pattern, Tuple
+from dataclasses import dataclass
 import logging
 
+from .thread_splitter import ThreadSegment, ThreadSplitter, newest_segments_text
+from ..rules import register_compiler, rule_pack
+
 logger = logging.getLogger(__name__)
 
+# Characters re.IGNORECASE matches to ASCII letters that str.lower() leaves alone
+_FOLD_FIXES = str.maketrans({'\u017f': 's', '\u0131': 'i'})  # long s, dotless i
+# Pattern sources whose matches always start with one of their terms
+_TERMS_PREFIX = re.compile(r'\((?:\?:)?\{terms\}\)(?![?*{])')
+
 
 @dataclass
+class ScanPattern:
+    """Compiled context pattern and the field its matches belong to"""
+    field: str
+    regex: Pattern
+    label: Optional[str] = None  # Quantity unit / price currency
+    triggers: Tuple[str, ...] = ()  # Lowercase literals, at least one must occur (empty = always scan)
+    anchored: bool = False  # Every match starts at an occurrence of a trigger
+
+
+def context_patterns(data: Dict) -> List[Tuple]:
+    """
+    Pattern definitions of a context rule pack (see src/rules/context.yaml)
+    
+    Args:
+        data: Parsed rule pack
+        
+    Returns:
+        (field, pattern, flags, label, triggers, anchored) tuples; order within a
+        field is output order. A pattern is anchored when it starts with its
+        terms and its triggers are the terms.
+    """
+    patterns = []
+    for rule in data['patterns']:
+        terms = [str(term) for term in rule.get('terms', [])]
+        pattern = rule['pattern'].replace('{terms}', '|'.join(re.escape(term) for term in terms))
+        flags = 0
+        for flag_name in rule.get('flags', []):
+            flags |= re.RegexFlag[flag_name]
+        triggers = rule.get('triggers')
+        anchored = bool(terms) and triggers is None and _TERMS_PREFIX.match(rule['pattern']) is not None
+        if triggers is None:
+            triggers = [term.lower() for term in terms]
+        patterns.append((rule['field'], pattern, flags, rule.get('label'), tuple(str(t) for t in triggers),
+                         anchored))
+    return patterns
+
+
+class ContextScanner:
+    """
+    Runs the context patterns over an email body
+    
+    Patterns are compiled once. The body is case-folded once per scan and a
+    pattern is skipped when none of its trigger literals occur. Patterns that
+    start with their terms are only tried where a term occurs (found with
+    str.find, re.match there) instead of at every position of the body; on
+    real threads the triggers almost always occur, so that is where the time
+    goes. Matches are grouped by field in pattern order, exactly as separate
+    re.finditer calls would return them.
+    
+    (A single regex combining all patterns as lookahead alternatives was
+    measured at 1.5-3x slower than separate scans in CPython's re engine,
+    so each pattern keeps its own compiled scan.)
+    """
+    
+    def __init__(self, patterns: Iterable[Tuple]):
+        self.patterns = [
+            ScanPattern(field=field_name, regex=re.compile(pattern, flags), label=label, triggers=triggers,
+                        anchored=anchored)
+            for field_name, pattern, flags, label, triggers, anchored in patterns
+        ]
+    
+    def scan(self, text: str, fields: Optional[Iterable[str]] = None) -> Dict[str, List[Tuple[ScanPattern, Match]]]:
+        """
+        Collect matches for all (or selected) fields
+        
+        Args:
+            text: Email body text
+            fields: Limit scan to these fields (default: all)
+            
+        Returns:
+            Dictionary of field -> [(pattern, match), ...]
+        """
+        text = text or ""
+        wanted = set(fields) if fields is not None else None
+        # Dotted capital I is the one character str.lower() expands; as "i" the
+        # folded offsets stay the body's offsets
+        folded = (text.replace('\u0130', 'i') if '\u0130' in text else text).lower()
+        if '\u017f' in folded or '\u0131' in folded:
+            folded = folded.translate(_FOLD_FIXES)  # Rare; translate is slow on long non-ASCII text
+        
+        results: Dict[str, List[Tuple[ScanPattern, Match]]] = {}
+        for pattern in self.patterns:
+            if wanted is not None and pattern.field not in wanted:
+                continue
+            found = results.setdefault(pattern.field, [])
+            if pattern.triggers and not any(trigger in folded for trigger in pattern.triggers):
+                continue
+            if pattern.anchored:
+                found.extend((pattern, match) for match in self._anchored_matches(pattern, text, folded))
+            else:
+                found.extend((pattern, match) for match in pattern.regex.finditer(text))
+        
+        return results
+    
+    def _anchored_matches(self, pattern: ScanPattern, text: str, folded: str) -> Iterator[Match]:
+        """re.finditer's matches of an anchored pattern, trying only where a trigger occurs"""
+        starts = set()
+        for trigger in pattern.triggers:
+            start = folded.find(trigger)
+            while start >= 0:
+                starts.add(start)
+                start = folded.find(trigger, start + 1)
+        
+        end = 0
+        for start in sorted(starts):
+            if start < end:
+                continue  # Inside the previous match; finditer resumes after it
+            match = pattern.regex.match(text, start)
+            if match:
+                yield match
+                end = max(match.end(), start + 1)
+
+
+@register_compiler('context')
+def compile_context_rules(data: Dict) -> ContextScanner:
+    """Compile the context rule pack into the scanner all extractors share"""
+    return ContextScanner(context_patterns(data))
+
+
+def context_rules_digest() -> str:
+    """Digest of the context rule pack in effect (changes with every edit of the pack)"""
+    return rule_pack('context').digest
+
+
+_UNSET = object()
+
+
+class _LazyField:
+    """EmailContext attribute computed by the extractor on first access, then memoized"""
+    
+    def __init__(self, method: str):
+        self.method = method  # EmailContentExtractor method taking the context
+    
+    def __set_name__(self, owner, name):
+        self.slot = f"_{name}"
+    
+    def __get__(self, context, owner=None):
+        if context is None:
+            return self
+        value = getattr(context, self.slot)
+        if value is _UNSET:
+            if context._extractor is None:
+                return []  # Not memoized, a later bind() can still compute it
+            value = getattr(context._extractor, self.method)(context)
+            setattr(context, self.slot, value)
+        return value
+    
+    def __set__(self, context, value):
+        setattr(context, self.slot, value)
+
+
 class EmailContext:
-    """Structured email context for agent understanding"""
-    # Basic metadata
-    from_address: str
-    to_addresses: List[str]
-    subject: str
-    email_chain: List[str] = field(default_factory=list)  # Email conversation chain
-    
-    # Extracted information
-    customer_mentions: List[str] = field(default_factory=list)
-    product_descriptions: List[str] = field(default_factory=list)
-    special_notes: List[str] = field(default_factory=list)
-    quantities_mentioned: List[Dict] = field(default_factory=list)
-    prices_mentioned: List[Dict] = field(default_factory=list)
-    
-    # Structured content
-    inline_tables: List[Dict] = field(default_factory=list)
-    specifications: List[str] = field(default_factory=list)
-    
-    # Full text for reference
-    full_body_text: str = ""
-    full_body_html: Optional[str] = None
-    
-    # Language
-    language: str = "en"
+    """
+    Structured email context for agent understanding
+    
+    The extracted lists (mentions, descriptions, notes, ...) and the
+    structured string are computed on first access and memoized. The first
+    list read scans the analyzed text once for every field and the others
+    reuse those matches. Slots keep queued contexts small in batch mode.
+    """
+    
+    # Extracted information (lazy)
+    email_chain = _LazyField('_context_email_chain')  # Email conversation chain
+    customer_mentions = _LazyField('_context_customer_mentions')
+    product_descriptions = _LazyField('_context_product_descriptions')
+    special_notes = _LazyField('_context_notes')
+    quantities_mentioned = _LazyField('_context_quantities')
+    prices_mentioned = _LazyField('_context_prices')
+    specifications = _LazyField('_context_specifications')
+    structured_string = _LazyField('to_structured_string')  # Rendered only when a sink needs it
+    
+    LAZY_FIELDS = ('email_chain', 'customer_mentions', 'product_descriptions', 'special_notes',
+                   'quantities_mentioned', 'prices_mentioned', 'specifications', 'structured_string')
+    
+    __slots__ = (
+        'from_address', 'to_addresses', 'subject',
+        'inline_tables',  # Structured content
+        'thread_segments', 'analyzed_segments',  # Reply chain split into messages (newest first)
+        'full_body_text', 'full_body_html',  # Full text for reference
+        'language', 'segment_languages',  # Language (of the newest message; per message)
+        '_matches',  # Scan of the analyzed text shared by the lazy fields (not pickled)
+        '_extractor',
+    ) + tuple(f"_{name}" for name in LAZY_FIELDS)
+    
+    def __init__(self, from_address: str, to_addresses: List[str], subject: str,
+                 full_body_text: str = "", full_body_html: Optional[str] = None, language: str = "en",
+                 extractor: Optional['EmailContentExtractor'] = None, **extracted):
+        """
+        Initialize context
+        
+        Args:
+            from_address, to_addresses, subject: Email metadata
+            full_body_text, full_body_html: Email body
+            language: "he" or "en"
+            extractor: Computes the lazy fields on first access (None = empty lists)
+            **extracted: Precomputed values for lazy fields
+        """
+        self.from_address = from_address
+        self.to_addresses = to_addresses
+        self.subject = subject
+        self.inline_tables: List[Dict] = []
+        self.thread_segments: List[ThreadSegment] = []
+        self.analyzed_segments = 0  # Newest segments the extractors run on
+        self.full_body_text = full_body_text
+        self.full_body_html = full_body_html
+        self.language = language
+        self.segment_languages: List[str] = []
+        self._matches = None
+        self._extractor = extractor
+        for name in self.LAZY_FIELDS:
+            setattr(self, f"_{name}", extracted.pop(name, _UNSET))
+        if extracted:
+            raise TypeError(f"Unknown EmailContext fields: {', '.join(extracted)}")
+    
+    @property
+    def analyzed_text(self) -> str:
+        """Body text of the analyzed (newest) segments"""
+        if not self.thread_segments:
+            return self.full_body_text or ""
+        return newest_segments_text(self.thread_segments, self.analyzed_segments)
+    
+    def bind(self, extractor: 'EmailContentExtractor') -> 'EmailContext':
+        """Attach the extractor that computes the lazy fields (e.g. after unpickling)"""
+        self._extractor = extractor
+        return self
+    
+    def materialize(self) -> 'EmailContext':
+        """Compute every lazy field now"""
+        for name in self.LAZY_FIELDS:
+            getattr(self, name)
+        return self
+    
+    def __getstate__(self):
+        # Pickle computed values only; the extractor is re-attached with bind()
+        return {
+            name: getattr(self, name) for name in self.__slots__
+            if name not in ('_matches', '_extractor') and getattr(self, name) is not _UNSET
+        }
+    
+    def __setstate__(self, state):
+        self._extractor = None
+        for name in self.__slots__[:-len(self.LAZY_FIELDS)]:
+            setattr(self, name, state.get(name))
+        for name in self.LAZY_FIELDS:
+            setattr(self, f"_{name}", state.get(f"_{name}", _UNSET))
+    
+    def __repr__(self) -> str:
+        return (f"EmailContext(from_address={self.from_address!r}, subject={self.subject!r}, "
+                f"language={self.language!r}, segments={len(self.thread_segments)})")
 
 
 class EmailContentExtractor:
     """Extract and structure email content for agent processing"""
     
-    def __init__(self):
-        self.specification_patterns = [
-            r'\d+\s*[GM]B?\s+(?:RAM|Memory|DDR)',
-            r'\d+\s*[GT]B?\s+(?:SSD|HDD|Storage|NVME)',
-            r'\d+x\s+\d+[GM]Hz',  # CPU frequencies
-            r'\d+U?\s+server',  # Server size
-            r'CPU|processor|Xeon|Intel|AMD',
-            r'port[s]?|פורטים',
-            r'gigabit|10G|25G|100G',
-        ]
+    def __init__(self, max_segments: int = 0):
+        """
+        Initialize extractor
+        
+        Args:
+            max_segments: Only extract from the newest N messages of a reply
+                chain (0 = whole body). Older messages are only summarized.
+        """
+        self.max_segments = max_segments or 0
+        self.splitter = ThreadSplitter()
+    
+    @property
+    def scanner(self) -> ContextScanner:
+        """Scanner compiled from the context rule pack (follows reloads of the pack file)"""
+        return rule_pack('context').rules
     
     def extract_context(self, metadata) -> EmailContext:
         """
@@ -69,183 +306,152 @@ class EmailContentExtractor:
             subject=metadata.subject,
             full_body_text=metadata.body_text or "",
             full_body_html=metadata.body_html,
-            language=metadata.language
+            language=metadata.language,
+            extractor=self
         )
         
-        # Extract email chain
-        context.email_chain = self._extract_email_chain(metadata.body_text)
+        # Split the reply chain once; extractors only see the newest messages
+        context.thread_segments = self.splitter.split(metadata.body_text)
+        context.analyzed_segments = min(self.max_segments or len(context.thread_segments),
+                                        len(context.thread_segments))
         
-        # Extract customer/vendor mentions
-        context.customer_mentions = self._extract_customer_mentions(metadata.body_text)
+        # A Hebrew note forwarded on top of an English vendor quote is a Hebrew email
+        context.segment_languages = [segment.language for segment in context.thread_segments]
+        if len(context.thread_segments) > 1:
+            context.language = context.segment_languages[0]
         
-        # Extract product descriptions
-        context.product_descriptions = self._extract_product_descriptions(metadata.body_text)
-        
-        # Extract special notes (Hebrew/English)
-        context.special_notes = self._extract_notes(metadata.body_text)
-        
-        # Extract specifications
-        context.specifications = self._extract_specifications(metadata.body_text)
-        
-        # Extract quantities and prices mentioned in text
-        context.quantities_mentioned = self._extract_quantities(metadata.body_text)
-        context.prices_mentioned = self._extract_prices(metadata.body_text)
-        
-        # Inline tables are already extracted by parser
-        # They will be added separately
+        # Mentions, descriptions, notes, specifications, quantities and prices
+        # are extracted on first access (see EmailContext); inline tables are
+        # extracted by the parser and added separately
         
         return context
     
-    def _extract_email_chain(self, body_text: str) -> List[str]:
-        """Extract email conversation chain"""
+    # Lazy EmailContext fields
+    def _context_email_chain(self, context: EmailContext) -> List[str]:
+        return self._extract_email_chain(context.full_body_text, context.thread_segments)
+    
+    def _context_matches(self, context: EmailContext) -> Dict[str, List[Tuple[ScanPattern, Match]]]:
+        """One scan of the analyzed text for all fields, shared by the lazy fields"""
+        if context._matches is None:
+            context._matches = self.scanner.scan(context.analyzed_text)
+        return context._matches
+    
+    def _context_customer_mentions(self, context: EmailContext) -> List[str]:
+        return self._extract_customer_mentions(context.analyzed_text, self._context_matches(context))
+    
+    def _context_product_descriptions(self, context: EmailContext) -> List[str]:
+        return self._extract_product_descriptions(context.analyzed_text, self._context_matches(context))
+    
+    def _context_notes(self, context: EmailContext) -> List[str]:
+        return self._extract_notes(context.analyzed_text, self._context_matches(context))
+    
+    def _context_specifications(self, context: EmailContext) -> List[str]:
+        return self._extract_specifications(context.analyzed_text, self._context_matches(context))
+    
+    def _context_quantities(self, context: EmailContext) -> List[Dict]:
+        return self._extract_quantities(context.analyzed_text, self._context_matches(context))
+    
+    def _context_prices(self, context: EmailContext) -> List[Dict]:
+        return self._extract_prices(context.analyzed_text, self._context_matches(context))
+    
+    def _field_matches(self, field_name: str, body_text: str, matches: Optional[Dict]) -> List[Tuple[ScanPattern, Match]]:
+        """Matches for one field, scanning the body for just that field if no shared scan is given"""
+        if matches is None:
+            matches = self.scanner.scan(body_text, fields=[field_name])
+        return matches.get(field_name, [])
+    
+    def _extract_email_chain(self, body_text: str, segments: Optional[List[ThreadSegment]] = None) -> List[str]:
+        """Extract email conversation chain (quoted messages with their reply headers)"""
         chain = []
         
-        # Look for "From:" patterns indicating email chain
-        from_pattern = r'From:\s*([^\n]+(?:\n(?!From:)[^\n]+)*)'
-        matches = re.finditer(from_pattern, body_text, re.IGNORECASE | re.MULTILINE)
+        if segments is None:
+            segments = self.splitter.split(body_text)
         
-        for match in matches:
-            chain_segment = match.group(1).strip()
+        for segment in segments:
+            if not segment.header:
+                continue  # Top message, not part of the quoted chain
+            chain_segment = segment.text.strip()
             if len(chain_segment) > 20:  # Filter out very short segments
                 chain.append(chain_segment[:500])  # Limit length
         
         return chain
     
-    def _extract_customer_mentions(self, body_text: str) -> List[str]:
+    def _extract_customer_mentions(self, body_text: str, matches: Optional[Dict] = None) -> List[str]:
         """Extract customer/vendor names mentioned in email"""
         mentions = []
         
-        # Look for common patterns
-        patterns = [
-            r'(?:customer|client|vendor|לקוח|ספק)[\s:]+([A-Za-z\s-]{3,30})',
-            r'([A-Z][a-z]+\s+[A-Z][a-z]+)\s+(?:is|נמצא|הוא)',  # Name patterns
-            r'<([^>@]+@[^>]+)>',  # Email addresses with names
-        ]
-        
-        for pattern in patterns:
-            matches = re.finditer(pattern, body_text, re.IGNORECASE)
-            for match in matches:
-                mention = match.group(1).strip()
-                if mention and len(mention) > 3:
-                    mentions.append(mention)
+        for _, match in self._field_matches('customer_mentions', body_text, matches):
+            mention = match.group(1).strip()
+            if mention and len(mention) > 3:
+                mentions.append(mention)
         
         return list(set(mentions))  # Remove duplicates
     
-    def _extract_product_descriptions(self, body_text: str) -> List[str]:
+    def _extract_product_descriptions(self, body_text: str, matches: Optional[Dict] = None) -> List[str]:
         """Extract product descriptions from email body"""
         descriptions = []
         
-        # Look for product-like sentences
-        # Patterns: "X server with...", "Y quantity of Z", product lists, SKU patterns
-        product_indicators = [
-            r'\d+U?\s+server[^\n]{10,200}',
-            r'(?:server|storage|network|firewall|gpu|appliance|enclosure)[^\n]{10,150}',
-            r'\d+x\s+[A-Z0-9]+[^\n]{5,100}',  # "2x XYZ123..."
-            r'\d+\s+[A-Z0-9-]+[^\n]{5,100}',  # "12 S0G11536P24EPP1..."
-            r'[A-Z0-9-]{6,20}\s+\d+\s+[^\n]{10,100}',  # "S0G11536P24EPP1 12 15.36TB..."
-            r'(?:CPU|SSD|HDD|RAM|NVMe|SAS)[^\n]{5,100}',
-            r'\d+\.?\d*\s*(?:TB|GB|MB)\s+[^\n]{5,100}',  # "15.36TB 1 DWPD..."
-        ]
-        
-        for pattern in product_indicators:
-            matches = re.finditer(pattern, body_text, re.IGNORECASE | re.MULTILINE)
-            for match in matches:
-                desc = match.group(0).strip()
-                if len(desc) > 10:
-                    descriptions.append(desc)
+        for _, match in self._field_matches('product_descriptions', body_text, matches):
+            desc = match.group(0).strip()
+            if len(desc) > 10:
+                descriptions.append(desc)
         
         return descriptions
     
-    def _extract_notes(self, body_text: str) -> List[str]:
+    def _extract_notes(self, body_text: str, matches: Optional[Dict] = None) -> List[str]:
         """Extract special notes, warnings, or important information"""
         notes = []
         
-        # Hebrew note patterns
-        hebrew_patterns = [
-            r'(חשוב|שכחתי|נא|שים\s+לב|הערה)[:;]?\s*([^\n]{10,200})',
-            r'(אלון|יוסי|valentina)[^\n]{5,150}',  # Person mentions with context
-        ]
-        
-        # English note patterns
-        english_patterns = [
-            r'(?:important|note|attention|warning)[:;]?\s*([^\n]{10,200})',
-            r'(?:please|remind|forgot)[^\n]{5,150}',
-        ]
-        
-        all_patterns = hebrew_patterns + english_patterns
-        
-        for pattern in all_patterns:
-            matches = re.finditer(pattern, body_text, re.IGNORECASE | re.MULTILINE)
-            for match in matches:
-                note = match.group(0).strip()
-                if len(note) > 10:
-                    notes.append(note)
+        for _, match in self._field_matches('special_notes', body_text, matches):
+            note = match.group(0).strip()
+            if len(note) > 10:
+                notes.append(note)
         
         return notes
     
-    def _extract_specifications(self, body_text: str) -> List[str]:
+    def _extract_specifications(self, body_text: str, matches: Optional[Dict] = None) -> List[str]:
         """Extract technical specifications"""
         specs = []
         
-        for pattern in self.specification_patterns:
-            matches = re.finditer(pattern, body_text, re.IGNORECASE)
-            for match in matches:
-                spec = match.group(0).strip()
-                if spec:
-                    specs.append(spec)
+        for _, match in self._field_matches('specifications', body_text, matches):
+            spec = match.group(0).strip()
+            if spec:
+                specs.append(spec)
         
         return list(set(specs))
     
-    def _extract_quantities(self, body_text: str) -> List[Dict]:
+    def _extract_quantities(self, body_text: str, matches: Optional[Dict] = None) -> List[Dict]:
         """Extract quantities mentioned in text"""
         quantities = []
         
         # Patterns like "2 ports", "200 GB", "1x CPU", etc.
-        patterns = [
-            (r'(\d+)\s*פורטים?', 'ports'),  # Hebrew
-            (r'(\d+)\s+ports?', 'ports'),  # English
-            (r'(\d+)\s*[GM]B', 'storage'),
-            (r'(\d+)x\s+(\w+)', 'items'),
-            (r'(\d+)\s*יחידות?', 'units'),  # Hebrew
-        ]
-        
-        for pattern, unit in patterns:
-            matches = re.finditer(pattern, body_text, re.IGNORECASE)
-            for match in matches:
-                qty = match.group(1)
-                item = match.group(2) if len(match.groups()) > 1 else None
-                quantities.append({
-                    "quantity": int(qty),
-                    "unit": unit,
-                    "item": item,
-                    "text": match.group(0)
-                })
+        for pattern, match in self._field_matches('quantities_mentioned', body_text, matches):
+            qty = match.group(1)
+            item = match.group(2) if len(match.groups()) > 1 else None
+            quantities.append({
+                "quantity": int(qty),
+                "unit": pattern.label,
+                "item": item,
+                "text": match.group(0)
+            })
         
         return quantities
     
-    def _extract_prices(self, body_text: str) -> List[Dict]:
+    def _extract_prices(self, body_text: str, matches: Optional[Dict] = None) -> List[Dict]:
         """Extract prices mentioned in text"""
         prices = []
         
-        # Currency patterns
-        patterns = [
-            (r'[\$₪]?\s*(\d{1,3}(?:[,\s]\d{3})*(?:\.\d{2})?)\s*(?:USD|ILS|\$|₪)?', 'unknown'),
-            (r'(\d+(?:[,\s]\d{3})*)\s*(?:ש\"ח|דולר)', 'ILS'),
-        ]
-        
-        for pattern, currency in patterns:
-            matches = re.finditer(pattern, body_text)
-            for match in matches:
-                price_text = match.group(1).replace(',', '').replace(' ', '')
-                try:
-                    price = float(price_text)
-                    prices.append({
-                        "amount": price,
-                        "currency": currency,
-                        "text": match.group(0)
-                    })
-                except ValueError:
-                    continue
+        for pattern, match in self._field_matches('prices_mentioned', body_text, matches):
+            price_text = match.group(1).replace(',', '').replace(' ', '')
+            try:
+                price = float(price_text)
+                prices.append({
+                    "amount": price,
+                    "currency": pattern.label,
+                    "text": match.group(0)
+                })
+            except ValueError:
+                continue
         
         return prices
     
@@ -264,7 +470,10 @@ class EmailContentExtractor:
         lines.append("=== EMAIL CONTEXT ===")
         lines.append(f"From: {context.from_address}")
         lines.append(f"Subject: {context.subject}")
-        lines.append(f"Language: {context.language}")
+        if len(set(context.segment_languages)) > 1:
+            lines.append(f"Language: {context.language} (messages: {', '.join(context.segment_languages)})")
+        else:
+            lines.append(f"Language: {context.language}")
         lines.append("")
         
         if context.customer_mentions:
@@ -304,6 +513,13 @@ class EmailContentExtractor:
                 lines.append(segment[:300] + "..." if len(segment) > 300 else segment)
                 lines.append("")
         
+        older = context.thread_segments[context.analyzed_segments:]
+        if context.analyzed_segments and older:
+            lines.append(f"=== OLDER MESSAGES ({len(older)}, NOT ANALYZED) ===")
+            for segment in older:
+                lines.append(f"- {segment.summary}")
+            lines.append("")
+        
         lines.append("=== FULL EMAIL BODY (REFERENCE) ===")
         lines.append(context.full_body_text[:2000] + "..." if len(context.full_body_text) > 2000 else context.full_body_text)
         
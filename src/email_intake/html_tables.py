@@ -0,0 +1,311 @@
+"""
+HTML Table Extraction
+Pulls <table> rows out of (Outlook) HTML email bodies without building a full document tree
+"""
+
+import html
+import re
+from html.parser import HTMLParser
+from typing import Callable, Dict, List, Tuple, Union
+import logging
+
+try:
+    from lxml import html as lxml_html
+except ImportError:
+    lxml_html = None
+
+try:
+    from bs4 import BeautifulSoup
+    from bs4.dammit import UnicodeDammit
+except ImportError:
+    BeautifulSoup = None
+    UnicodeDammit = None
+
+logger = logging.getLogger(__name__)
+
+# Same element sets as BeautifulSoup's html.parser tree builder, so cell text matches get_text(strip=True)
+VOID_ELEMENTS = frozenset([
+    'area', 'base', 'basefont', 'bgsound', 'br', 'col', 'command', 'embed', 'frame', 'hr', 'image', 'img',
+    'input', 'isindex', 'keygen', 'link', 'menuitem', 'meta', 'nextid', 'param', 'source', 'spacer', 'track', 'wbr',
+])
+HIDDEN_TEXT_ELEMENTS = frozenset(['style', 'script', 'template', 'rt', 'rp'])  # Text not returned by get_text
+
+# First <table outside comments / style / script blocks
+_TABLE_START = re.compile(r'<!--.*?-->|<(style|script)\b.*?</\1\s*>|<table\b', re.IGNORECASE | re.DOTALL)
+_TABLE_END = re.compile(r'</table\s*>', re.IGNORECASE)
+_TABLE_OPEN = re.compile(r'<table\b', re.IGNORECASE)
+# Inline base64 images: the attribute value is never needed, only its length costs time
+_DATA_URI = re.compile(r'''(\ssrc\s*=\s*["']?)data:[^"'\s>]*''', re.IGNORECASE)
+_DECLARED_CHARSET = re.compile(rb'''<meta[^>]+charset\s*=\s*["']?([\w-]+)''', re.IGNORECASE)
+
+TableRows = List[List[str]]
+
+
+def decode_html(markup: Union[str, bytes]) -> str:
+    """
+    Decode an HTML body to text (extract_msg returns bytes)
+
+    Uses BeautifulSoup's UnicodeDammit when available so decoding matches the
+    bs4 backend; otherwise declared charset, then UTF-8, then windows-1252.
+    """
+    if isinstance(markup, str):
+        return markup
+    if UnicodeDammit is not None:
+        decoded = UnicodeDammit(markup, is_html=True).unicode_markup
+        if decoded is not None:
+            return decoded
+
+    declared = _DECLARED_CHARSET.search(markup[:4096])
+    for encoding in ([declared.group(1).decode('ascii')] if declared else []) + ['utf-8']:
+        try:
+            return markup.decode(encoding)
+        except (LookupError, UnicodeDecodeError):
+            continue
+    return markup.decode('windows-1252', errors='replace')
+
+
+def table_region(markup: str) -> Tuple[int, int]:
+    """
+    Offsets of the first <table> and the end of the last </table>
+
+    Parsing from the first table skips <head>, inline CSS and the message
+    text before it. Assumes end tags inside a table don't close elements
+    opened before it (true for Outlook, Gmail and Word generated HTML).
+
+    Returns:
+        (start, end), or (0, 0) if the markup has no table
+    """
+    start = None
+    for match in _TABLE_START.finditer(markup):
+        if match.group(0)[:6].lower() == '<table':
+            start = match.start()
+            break
+    if start is None:
+        return 0, 0
+
+    end = None
+    for match in _TABLE_END.finditer(markup, start):
+        end = match.end()
+    if end is None or _TABLE_OPEN.search(markup, end):
+        end = len(markup)  # Unclosed table, keep the rest
+    return start, end
+
+
+class _TableCollector(HTMLParser):
+    """
+    Streaming html.parser handler that only records tables, rows and cells
+
+    Mirrors BeautifulSoup's html.parser tree rules (an end tag closes up to
+    the most recent open element of that name, void elements never nest,
+    text strings are split at every tag and stripped) without building a
+    tree, so rows/cells match find_all('tr') / find_all(['td', 'th']).
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.tables: List[List[List[List[str]]]] = []  # table -> row -> cell -> text strings
+        self.stack: List[list] = []  # [name, record] - record is the table/row/cell list or None
+        self.open_counts: Dict[str, int] = {}
+        self.closed_void: List[str] = []
+        self.data: List[str] = []
+        self.cells_open = 0
+        self.hidden_open = 0
+
+    # Text
+    def _flush(self, keep: bool = True):
+        if not self.data:
+            return
+        text = ''.join(self.data).strip()
+        self.data = []
+        if keep and text and self.cells_open and not self.hidden_open:
+            for name, record in self.stack:
+                if name in ('td', 'th'):
+                    record.append(text)
+
+    def handle_data(self, data):
+        self.data.append(data)
+
+    def handle_charref(self, name):
+        self.data.append(html.unescape(f'&#{name};'))
+
+    def handle_entityref(self, name):
+        text = html.unescape(f'&{name};')
+        self.data.append(text if text != f'&{name};' else f'&{name}')
+
+    def handle_comment(self, data):
+        self._flush()
+
+    def handle_decl(self, decl):
+        self._flush()
+
+    def handle_pi(self, data):
+        self._flush()
+
+    def unknown_decl(self, data):
+        self._flush()
+        if data.upper().startswith('CDATA['):
+            self.data.append(data[len('CDATA['):])
+            self._flush()
+
+    # Tags
+    def handle_starttag(self, tag, attrs, void_end=True):
+        self._flush()
+        record = None
+        if tag == 'table':
+            record = []
+            self.tables.append(record)
+        elif tag == 'tr':
+            record = []
+            for name, parent in self.stack:
+                if name == 'table':
+                    parent.append(record)
+        elif tag in ('td', 'th'):
+            record = []
+            for name, parent in self.stack:
+                if name == 'tr':
+                    parent.append(record)
+            self.cells_open += 1
+        if tag in HIDDEN_TEXT_ELEMENTS:
+            self.hidden_open += 1
+
+        self.stack.append([tag, record])
+        self.open_counts[tag] = self.open_counts.get(tag, 0) + 1
+
+        if tag in VOID_ELEMENTS and void_end:
+            self.handle_endtag(tag, check_closed=False)
+            self.closed_void.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs, void_end=False)
+        self.handle_endtag(tag, check_closed=False)
+
+    def handle_endtag(self, tag, check_closed=True):
+        if check_closed and tag in self.closed_void:
+            self.closed_void.remove(tag)  # </br> after <br>, already closed
+            return
+        self._flush()
+        if not self.open_counts.get(tag):
+            return
+        while self.stack:
+            name, _ = self.stack.pop()
+            self.open_counts[name] -= 1
+            if name in ('td', 'th'):
+                self.cells_open -= 1
+            if name in HIDDEN_TEXT_ELEMENTS:
+                self.hidden_open -= 1
+            if name == tag:
+                break
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+def _stream_tables(markup: str) -> List[TableRows]:
+    """Stdlib backend: tokenize only the table region, record cells as they stream by"""
+    start, end = table_region(markup)
+    if start == end:
+        return []
+    collector = _TableCollector()
+    collector.feed(_DATA_URI.sub(r'\1', markup[start:end]))
+    if collector.open_counts.get('table'):
+        collector.feed(_DATA_URI.sub(r'\1', markup[end:]))  # Text after the last </table> still belongs to a cell
+    collector.close()
+    return [[[''.join(cell) for cell in row] for row in table] for table in collector.tables]
+
+
+def _lxml_text(element) -> List[str]:
+    """Stripped text strings under element, skipping comments and hidden elements"""
+    parts = []
+    if element.text and element.text.strip():
+        parts.append(element.text.strip())
+    for child in element:
+        if isinstance(child.tag, str) and child.tag not in HIDDEN_TEXT_ELEMENTS:
+            parts.extend(_lxml_text(child))
+        if child.tail and child.tail.strip():
+            parts.append(child.tail.strip())
+    return parts
+
+
+def _lxml_tables(markup: str) -> List[TableRows]:
+    """lxml backend: libxml2 parse of the table region (implies missing </td>/</tr>)"""
+    start, end = table_region(markup)
+    if start == end:
+        return []
+    if len(_TABLE_OPEN.findall(markup, start, end)) > len(_TABLE_END.findall(markup, start, end)):
+        end = len(markup)
+    region = _DATA_URI.sub(r'\1', markup[start:end])
+    parser = lxml_html.HTMLParser(remove_comments=True, remove_pis=True, huge_tree=True)
+    root = lxml_html.fromstring(region, parser=parser)
+    return [
+        [[''.join(_lxml_text(cell)) for cell in tr.iter('td', 'th')] for tr in table.iter('tr')]
+        for table in root.iter('table')
+    ]
+
+
+def _bs4_tables(markup: str) -> List[TableRows]:
+    """BeautifulSoup backend (full document tree, previous implementation)"""
+    soup = BeautifulSoup(markup, 'html.parser')
+    return [
+        [[td.get_text(strip=True) for td in tr.find_all(['td', 'th'])] for tr in table.find_all('tr')]
+        for table in soup.find_all('table')
+    ]
+
+
+BACKENDS: Dict[str, Callable[[str], List[TableRows]]] = {
+    'stream': _stream_tables,
+    'lxml': _lxml_tables,
+    'bs4': _bs4_tables,
+}
+
+
+def available_backends() -> List[str]:
+    """Backends usable in this environment, fastest first"""
+    available = ['lxml'] if lxml_html is not None else []
+    available.append('stream')
+    if BeautifulSoup is not None:
+        available.append('bs4')
+    return available
+
+
+def extract_html_tables(markup: Union[str, bytes], backend: str = 'stream') -> List[Dict]:
+    """
+    Extract tables from an HTML email body
+
+    Args:
+        markup: HTML body (str or bytes)
+        backend: "stream" (stdlib, same rows/cells as bs4 html.parser),
+            "lxml" (fastest, libxml2 error recovery on malformed markup),
+            "bs4" (full BeautifulSoup parse) or "auto" (fastest available)
+
+    Returns:
+        List of {"type": "html_table", "data": rows, "headers": first row}
+    """
+    if not markup:
+        return []
+    if backend == 'auto':
+        backend = available_backends()[0]
+    if backend not in BACKENDS:
+        logger.warning(f"Unknown HTML table backend {backend}, using stream")
+        backend = 'stream'
+    if (backend == 'lxml' and lxml_html is None) or (backend == 'bs4' and BeautifulSoup is None):
+        logger.warning(f"HTML table backend {backend} not available, using stream")
+        backend = 'stream'
+
+    text = decode_html(markup)
+    try:
+        parsed = BACKENDS[backend](text)
+    except Exception as e:
+        logger.warning(f"HTML table backend {backend} failed ({e}), using stream")
+        parsed = _stream_tables(text)
+
+    tables = []
+    for table in parsed:
+        rows = [cells for cells in table if cells]
+        if rows:
+            tables.append({
+                "type": "html_table",
+                "data": rows,
+                "headers": rows[0] if rows else []
+            })
+    return tables
@@ -0,0 +1,56 @@
+"""
+Language Detection
+Hebrew/English classification from a bounded sample of the text
+"""
+
+import re
+from typing import Optional
+
+HEBREW_RATIO = 0.1  # Text is Hebrew if more than 10% of its letters are Hebrew
+SAMPLE_CHARS = 4096  # Characters sampled from each end of long texts
+CHUNK_CHARS = 512
+
+_HEBREW = re.compile('[\u0590-\u05FF]')
+_LETTER = re.compile(r'[^\W\d_]')
+
+
+def sample_text(text: str, sample_chars: int = SAMPLE_CHARS) -> str:
+    """Prefix and suffix of text (the whole text if short enough)"""
+    if len(text) <= 2 * sample_chars:
+        return text
+    return text[:sample_chars] + '\n' + text[-sample_chars:]
+
+
+def detect_language(text: Optional[str], sample_chars: int = SAMPLE_CHARS) -> str:
+    """
+    Detect if text is Hebrew or English
+
+    Counts Hebrew characters (U+0590-U+05FF) against all letters in one pass
+    over at most ``2 * sample_chars`` characters, chunk by chunk, and stops
+    as soon as the unread rest of the sample can no longer change the result.
+
+    Args:
+        text: Text to analyze
+        sample_chars: Characters taken from each end of long texts
+
+    Returns:
+        "he" for Hebrew, "en" for English (default)
+    """
+    if not text:
+        return "en"
+
+    sample = sample_text(text, sample_chars)
+    hebrew = letters = 0
+    for start in range(0, len(sample), CHUNK_CHARS):
+        chunk = sample[start:start + CHUNK_CHARS]
+        hebrew += len(_HEBREW.findall(chunk))
+        letters += len(_LETTER.findall(chunk))
+        remaining = len(sample) - start - len(chunk)  # Upper bound on unread letters
+        if letters and hebrew > HEBREW_RATIO * (letters + remaining):
+            return "he"
+        if hebrew + remaining <= HEBREW_RATIO * (letters + remaining):
+            return "en"
+
+    if letters > 0 and hebrew / letters > HEBREW_RATIO:
+        return "he"
+    return "en"
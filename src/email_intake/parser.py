@@ -4,8 +4,12 @@ Supports Hebrew and English content
 """
 
 import os
+import base64
+import email
+from email import policy
+from email.utils import getaddresses, parsedate_to_datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import BinaryIO, Callable, Dict, Iterable, List, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 import logging
@@ -20,6 +24,19 @@ try:
 except ImportError:
     parse_from_file = None
 
+try:
+    import olefile
+except ImportError:
+    olefile = None
+
+from .attachments import (
+    HEAD_BYTES, SPOOL_MEMORY_BYTES, EmailAttachment, base64_head, base64_size, ole_stream_chunks, ole_stream_head, ole_stream_loader,
+    output_filename, sniff_kind
+)
+from .html_tables import extract_html_tables
+from .text_tables import extract_text_tables
+from .language import detect_language
+
 logger = logging.getLogger(__name__)
 
 
@@ -33,7 +50,7 @@ class EmailMetadata:
     message_id: str
     body_text: str
     body_html: Optional[str] = None
-    attachments: List[Dict] = None
+    attachments: List[EmailAttachment] = None
     language: str = "en"  # "en" or "he"
 
 
@@ -44,21 +61,30 @@ class AttachmentInfo:
     filepath: str
     content_type: str
     size: int
+    kind: str = "other"  # Sniffed type, see email_intake.attachments
 
 
 class EmailParser:
     """Parse Outlook .msg files and extract content"""
     
-    def __init__(self):
+    def __init__(self, html_table_backend: str = 'auto'):
+        """
+        Initialize parser
+        
+        Args:
+            html_table_backend: Inline HTML table backend ("auto", "lxml",
+                "stream" or "bs4", see email_intake.html_tables)
+        """
+        self.html_table_backend = html_table_backend
         if extract_msg is None:
             logger.warning("extract_msg not available. Install with: pip install extract-msg")
     
     def parse_msg_file(self, filepath: str) -> EmailMetadata:
         """
-        Parse Outlook .msg file
+        Parse Outlook .msg file (or RFC 822 .eml file saved by the IMAP watcher)
         
         Args:
-            filepath: Path to .msg file
+            filepath: Path to .msg or .eml file
             
         Returns:
             EmailMetadata object with parsed email data
@@ -67,7 +93,9 @@ class EmailParser:
             raise FileNotFoundError(f"Email file not found: {filepath}")
         
         try:
-            if extract_msg:
+            if Path(filepath).suffix.lower() == '.eml':
+                return self._parse_eml(filepath)
+            elif extract_msg:
                 return self._parse_with_extract_msg(filepath)
             elif parse_from_file:
                 return self._parse_with_mailparser(filepath)
@@ -79,27 +107,10 @@ class EmailParser:
     
     def _parse_with_extract_msg(self, filepath: str) -> EmailMetadata:
         """Parse using extract_msg library"""
-        msg = extract_msg.Message(filepath)
-        
-        # Extract attachments
-        attachments = []
-        if msg.attachments:
-            for att in msg.attachments:
-                # Handle extract-msg Attachment object attributes
-                filename = getattr(att, 'longFilename', None) or getattr(att, 'shortFilename', None) or f"attachment_{len(attachments)}"
-                data = getattr(att, 'data', None)
-                # Check for various possible content_type attributes
-                content_type = (
-                    getattr(att, 'contentType', None) or
-                    getattr(att, 'content_type', None) or
-                    getattr(att, 'mimeType', None) or
-                    "application/octet-stream"
-                )
-                attachments.append({
-                    "filename": filename,
-                    "data": data,
-                    "content_type": content_type
-                })
+        # Attachments are enumerated from the OLE directory instead of msg.attachments,
+        # which would read every attachment stream into memory up front
+        msg = extract_msg.Message(filepath, delayAttachments=True)
+        attachments = self._msg_attachments(msg, filepath)
         
         # Extract body
         body_html = msg.htmlBody if hasattr(msg, 'htmlBody') else None
@@ -123,6 +134,43 @@ class EmailParser:
         msg.close()
         return metadata
     
+    def _msg_attachments(self, msg, filepath: str) -> List[EmailAttachment]:
+        """Lazy handles for the data attachments of an open extract_msg Message"""
+        storages = sorted({
+            entry[0] for entry in msg.listDir(streams=True, storages=True)
+            if entry and entry[0].startswith('__attach_version1.0_#')
+        })
+        ole = olefile.OleFileIO(filepath) if olefile else None
+        attachments = []
+        try:
+            for storage in storages:
+                stream = [storage, '__substg1.0_37010102']
+                if not msg.exists(stream):
+                    # Embedded messages / OLE objects have no binary data stream
+                    logger.debug(f"Skipping attachment {storage} without a data stream")
+                    continue
+                filename = (
+                    msg.getStringStream([storage, '__substg1.0_3707']) or
+                    msg.getStringStream([storage, '__substg1.0_3704']) or
+                    f"attachment_{len(attachments)}"
+                )
+                content_type = msg.getStringStream([storage, '__substg1.0_370E']) or "application/octet-stream"
+                head = ole_stream_head(ole, stream) if ole else None
+                attachments.append(EmailAttachment(
+                    filename=filename,
+                    content_type=content_type,
+                    size=msg._getOleEntry(stream).size,
+                    kind=sniff_kind(head, filename, content_type),
+                    content_id=msg.getStringStream([storage, '__substg1.0_3712']),
+                    locator=('ole', stream),
+                    loader=ole_stream_loader(filepath, stream),
+                    chunks=ole_stream_chunks(filepath, stream)
+                ))
+        finally:
+            if ole:
+                ole.close()
+        return attachments
+    
     def _parse_with_mailparser(self, filepath: str) -> EmailMetadata:
         """Parse using mailparser library (alternative method)"""
         mail = parse_from_file(filepath)
@@ -130,11 +178,24 @@ class EmailParser:
         attachments = []
         if mail.attachments:
             for att in mail.attachments:
-                attachments.append({
-                    "filename": att.get('filename', 'unknown'),
-                    "data": att.get('payload'),
-                    "content_type": att.get('mail_content_type', 'application/octet-stream')
-                })
+                payload = att.get('payload') or ""
+                filename = att.get('filename', 'unknown')
+                content_type = att.get('mail_content_type', 'application/octet-stream')
+                if att.get('binary'):
+                    head, size = base64_head(payload), base64_size(payload)
+                    load = lambda payload=payload: base64.b64decode(payload)
+                else:
+                    head, size = payload[:HEAD_BYTES].encode('utf-8', 'replace'), len(payload)
+                    load = lambda payload=payload: payload.encode('utf-8')
+                attachments.append(EmailAttachment(
+                    filename=filename,
+                    content_type=content_type,
+                    size=size,
+                    kind=sniff_kind(head, filename, content_type),
+                    content_id=att.get('content-id') or None,
+                    locator=('mailparser', len(attachments)),
+                    loader=load
+                ))
         
         body_text = mail.text_plain[0] if mail.text_plain else (
             mail.text_html[0] if mail.text_html else ""
@@ -153,44 +214,159 @@ class EmailParser:
             language=language
         )
     
-    def extract_attachments(self, metadata: EmailMetadata, output_dir: str) -> List[AttachmentInfo]:
+    def _parse_eml(self, filepath: str) -> EmailMetadata:
+        """Parse RFC 822 message using the standard library email package"""
+        with open(filepath, 'rb') as f:
+            msg = email.message_from_binary_file(f, policy=policy.default)
+        
+        attachments = []
+        for part in msg.iter_attachments():
+            filename = part.get_filename() or f"attachment_{len(attachments)}"
+            payload = part.get_payload()
+            if not isinstance(payload, str):
+                continue  # Attached message/rfc822, no binary payload
+            if part.get('Content-Transfer-Encoding', '').lower() == 'base64':
+                head, size = base64_head(payload), base64_size(payload)
+            else:
+                head, size = part.get_payload(decode=True)[:HEAD_BYTES], len(payload)
+            attachments.append(EmailAttachment(
+                filename=filename,
+                content_type=part.get_content_type(),
+                size=size,
+                kind=sniff_kind(head, filename, part.get_content_type()),
+                content_id=(part['Content-ID'] or '').strip('<>') or None,
+                locator=('mime', len(attachments)),
+                loader=lambda part=part: part.get_payload(decode=True)
+            ))
+        
+        text_part = msg.get_body(preferencelist=('plain',))
+        html_part = msg.get_body(preferencelist=('html',))
+        body_html = html_part.get_content() if html_part else None
+        body_text = (text_part.get_content() if text_part else None) or body_html or ""
+        language = self._detect_language(body_text)
+        
+        try:
+            date = parsedate_to_datetime(msg['Date'])
+        except (TypeError, ValueError):
+            date = datetime.now()
+        
+        return EmailMetadata(
+            from_address=str(msg['From'] or ""),
+            to_addresses=[addr for _, addr in getaddresses(msg.get_all('To', []))],
+            subject=str(msg['Subject'] or ""),
+            date=date,
+            message_id=str(msg['Message-ID'] or ""),
+            body_text=body_text,
+            body_html=body_html,
+            attachments=attachments,
+            language=language
+        )
+    
+    def bind_attachments(self, metadata: EmailMetadata, filepath: str) -> EmailMetadata:
+        """
+        Point attachment handles at ``filepath`` (after loading metadata from
+        the parsed-email cache, where the same content may have another path)
+        
+        Args:
+            metadata: EmailMetadata object
+            filepath: Email file the metadata was parsed from
+            
+        Returns:
+            The same EmailMetadata object
+        """
+        parsers = {'mime': self._parse_eml, 'mailparser': self._parse_with_mailparser}
+        reparsed = {}  # Source -> attachments of the message, parsed once for all handles
+        
+        def load(source: str, ref: int) -> Optional[bytes]:
+            if source not in reparsed:
+                reparsed[source] = parsers[source](filepath).attachments
+            return reparsed[source][ref].data
+        
+        for att in metadata.attachments or []:
+            source, ref = att.locator or (None, None)
+            if source == 'ole':
+                att.loader = ole_stream_loader(filepath, ref)
+                att.chunks = ole_stream_chunks(filepath, ref)
+            elif source in parsers:
+                att.loader = lambda source=source, ref=ref: load(source, ref)
+        return metadata
+    
+    def extract_attachments(self, metadata: EmailMetadata, output_dir: str,
+                            kinds: Optional[Iterable[str]] = None) -> List[AttachmentInfo]:
         """
         Extract attachments from email metadata to files
         
         Args:
             metadata: EmailMetadata object
             output_dir: Directory to save attachments
+            kinds: Only write attachments of these sniffed kinds (e.g.
+                PARSEABLE_KINDS); None writes all. Skipped attachments are
+                never read from the message.
             
         Returns:
             List of AttachmentInfo objects
         """
         os.makedirs(output_dir, exist_ok=True)
         attachment_infos = []
+        kinds = set(kinds) if kinds is not None else None
         
         for i, att in enumerate(metadata.attachments or []):
-            filename = att.get("filename", f"attachment_{i}")
-            filepath = os.path.join(output_dir, filename)
+            filename = att.filename or f"attachment_{i}"
+            if kinds is not None and att.kind not in kinds:
+                logger.debug(f"Skipping attachment {filename} ({att.kind}, {att.size} bytes)")
+                continue
             
-            # Save attachment data
-            with open(filepath, 'wb') as f:
-                if isinstance(att.get("data"), bytes):
-                    f.write(att["data"])
-                else:
-                    logger.warning(f"Could not extract attachment {filename}")
-                    continue
+            # Stream to disk; .msg attachments never sit in memory as a whole
+            filename = output_filename(filename, att.kind)
+            filepath = os.path.join(output_dir, filename)
+            if att.save(filepath) is None:
+                logger.warning(f"Could not extract attachment {filename}")
+                continue
             
             attachment_infos.append(AttachmentInfo(
                 filename=filename,
                 filepath=filepath,
-                content_type=att.get("content_type", "application/octet-stream"),
-                size=os.path.getsize(filepath)
+                content_type=att.content_type or "application/octet-stream",
+                size=os.path.getsize(filepath),
+                kind=att.kind
             ))
         
         return attachment_infos
     
+    def stream_attachments(self, metadata: EmailMetadata, consumer: Callable[[EmailAttachment, BinaryIO], None],
+                           kinds: Optional[Iterable[str]] = None,
+                           spool_bytes: int = SPOOL_MEMORY_BYTES) -> int:
+        """
+        Hand attachments to a consumer one at a time, each in a spill-to-disk buffer
+        
+        Only one attachment is buffered at a time and buffers larger than
+        ``spool_bytes`` live on disk, so memory stays bounded for any message size.
+        
+        Args:
+            metadata: EmailMetadata object
+            consumer: Called as consumer(attachment, buffer); the buffer is
+                closed when the consumer returns
+            kinds: Only these sniffed kinds (None = all)
+            spool_bytes: In-memory limit per buffer
+            
+        Returns:
+            Number of attachments passed to the consumer
+        """
+        count = 0
+        for att in metadata.attachments or []:
+            if kinds is not None and att.kind not in kinds:
+                continue
+            buffer = att.spool(spool_bytes)
+            try:
+                consumer(att, buffer)
+            finally:
+                buffer.close()
+            count += 1
+        return count
+    
     def _detect_language(self, text: str) -> str:
         """
-        Detect if text is Hebrew or English
+        Detect if text is Hebrew or English (sampled, see email_intake.language)
         
         Args:
             text: Text to analyze
@@ -198,18 +374,7 @@ class EmailParser:
         Returns:
             "he" for Hebrew, "en" for English (default)
         """
-        if not text:
-            return "en"
-        
-        # Simple heuristic: check for Hebrew characters
-        # Hebrew Unicode range: U+0590 to U+05FF
-        hebrew_chars = sum(1 for char in text if '\u0590' <= char <= '\u05FF')
-        total_chars = sum(1 for char in text if char.isalpha())
-        
-        if total_chars > 0 and hebrew_chars / total_chars > 0.1:
-            return "he"
-        
-        return "en"
+        return detect_language(text)
     
     def extract_inline_tables(self, metadata: EmailMetadata) -> List[Dict]:
         """
@@ -233,65 +398,14 @@ class EmailParser:
         
         return tables
     
-    def _extract_html_tables(self, html: str) -> List[Dict]:
-        """Extract tables from HTML content"""
-        try:
-            from bs4 import BeautifulSoup
-        except ImportError:
-            logger.warning("BeautifulSoup not available for HTML parsing")
-            return []
-        
-        soup = BeautifulSoup(html, 'html.parser')
-        tables = []
-        
-        for table in soup.find_all('table'):
-            rows = []
-            for tr in table.find_all('tr'):
-                cells = [td.get_text(strip=True) for td in tr.find_all(['td', 'th'])]
-                if cells:
-                    rows.append(cells)
-            
-            if rows:
-                tables.append({
-                    "type": "html_table",
-                    "data": rows,
-                    "headers": rows[0] if rows else []
-                })
-        
-        return tables
+    def _extract_html_tables(self, html) -> List[Dict]:
+        """Extract tables from HTML content (str, or bytes as returned by extract_msg)"""
+        return extract_html_tables(html, self.html_table_backend)
     
     def _extract_text_tables(self, text: str) -> List[Dict]:
         """
         Extract table-like structures from plain text
-        Looks for tab-separated or space-aligned columns
+        Splits tab-separated or space-aligned blocks on their shared column boundaries
         """
-        lines = text.split('\n')
-        tables = []
-        current_table = []
-        
-        for line in lines:
-            # Look for lines with multiple columns (tabs or multiple spaces)
-            if '\t' in line or line.count('  ') >= 2:
-                parts = [p.strip() for p in line.split('\t') if p.strip()]
-                if len(parts) >= 2:  # At least 2 columns
-                    current_table.append(parts)
-            elif current_table:
-                # End of table
-                if len(current_table) > 1:
-                    tables.append({
-                        "type": "text_table",
-                        "data": current_table,
-                        "headers": current_table[0] if current_table else []
-                    })
-                current_table = []
-        
-        # Handle last table
-        if current_table and len(current_table) > 1:
-            tables.append({
-                "type": "text_table",
-                "data": current_table,
-                "headers": current_table[0] if current_table else []
-            })
-        
-        return tables
+        return extract_text_tables(text)
 
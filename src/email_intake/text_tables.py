@@ -0,0 +1,162 @@
+"""
+Plain Text Table Extraction
+Finds space/tab aligned tables in plain text email bodies and splits them into
+rows using column boundaries shared by every line of the block
+"""
+
+import re
+from typing import Dict, List, Tuple
+
+TAB_SIZE = 8
+MIN_ROWS = 2
+
+# A column gap: two spaces or a tab after a non-space character (lines are stripped first)
+_COLUMN_GAP = re.compile(r'\S(?: {2}| *\t)')
+_WHITESPACE = re.compile(r'[ \t]+')
+_SPACE_GAP = re.compile(r'^ +| {2,}')
+_TABS = re.compile(r'\t+')
+_QUOTE_PREFIX = re.compile(r'^[ \t]*(?:>[ \t]?)+')
+_RULE_LINE = re.compile(r'^[-=_+|:\s]{3,}$')  # "-----  -----" under a header
+
+Span = Tuple[int, int]
+TableRows = List[List[str]]
+
+
+def layout_line(line: str) -> Tuple[str, List[Span]]:
+    """
+    Expand tabs and locate the line's column gaps
+
+    Args:
+        line: Line without trailing whitespace
+
+    Returns:
+        (expanded text, [(start, end)] display-column ranges of the leading
+        indent, tab runs and runs of two or more spaces)
+    """
+    if '\t' not in line:
+        return line, [match.span() for match in _SPACE_GAP.finditer(line)]
+
+    pieces = []
+    gaps = []
+    col = 0
+    pos = 0
+    for match in _WHITESPACE.finditer(line):
+        text = line[pos:match.start()]
+        pieces.append(text)
+        col += len(text)
+        start = col
+        run = match.group(0)
+        if '\t' in run:
+            for char in run:
+                col = (col // TAB_SIZE + 1) * TAB_SIZE if char == '\t' else col + 1
+            gaps.append((start, col))
+        else:
+            col += len(run)
+            if start == 0 or col - start >= 2:
+                gaps.append((start, col))
+        pieces.append(' ' * (col - start))
+        pos = match.end()
+    pieces.append(line[pos:])
+    return ''.join(pieces), gaps
+
+
+def column_spans(lines: List[Tuple[str, List[Span]]]) -> List[Span]:
+    """
+    Column ranges of a block: display columns that are a gap (or past the end) on no line
+
+    Gap ranges are added to a difference array, so the block is scanned once
+    (linear in its size) rather than once per candidate boundary.
+    """
+    width = max(len(text) for text, _ in lines)
+    coverage = [0] * (width + 1)
+    for text, gaps in lines:
+        for start, end in gaps:
+            coverage[start] += 1
+            coverage[end] -= 1
+        coverage[len(text)] += 1
+        coverage[width] -= 1
+
+    spans = []
+    depth = 0
+    span_start = None
+    for col in range(width + 1):
+        depth += coverage[col]
+        separator = col == width or depth == len(lines)
+        if separator and span_start is not None:
+            spans.append((span_start, col))
+            span_start = None
+        elif not separator and span_start is None:
+            span_start = col
+    return spans
+
+
+def align_columns(texts: List[str]) -> TableRows:
+    """Split lines on the column boundaries they share (one column if there are none)"""
+    laid = [layout_line(text) for text in texts]
+    spans = column_spans(laid)
+    if not spans:
+        return [[text.strip()] for text in texts]
+    return [[text[start:end].strip() for start, end in spans] for text, _ in laid]
+
+
+def split_block(lines: List[str]) -> TableRows:
+    """
+    Split a block of candidate lines into a rectangular row matrix
+
+    Lines are aligned on display columns (tabs expanded). When every line
+    contains a tab, the tabs are also tried as hard boundaries: with each
+    field aligned on its own if all lines have the same field count, padded
+    to the widest line otherwise. Whichever finds more columns wins, tabs on
+    a tie (tab-delimited cells need not line up).
+    """
+    rows = align_columns(lines)
+    if not all('\t' in line for line in lines):
+        return rows
+
+    fields = [_TABS.split(line.strip()) for line in lines]
+    width = max(len(row) for row in fields)
+    if all(len(row) == width for row in fields):
+        per_field = [align_columns([row[index] for row in fields]) for index in range(width)]
+        tab_rows = [[cell for field_rows in per_field for cell in field_rows[line]] for line in range(len(lines))]
+    else:
+        tab_rows = [[cell.strip() for cell in row] + [''] * (width - len(row)) for row in fields]
+    return tab_rows if len(tab_rows[0]) >= len(rows[0]) else rows
+
+
+def extract_text_tables(text: str, min_rows: int = MIN_ROWS) -> List[Dict]:
+    """
+    Extract aligned tables from a plain text body
+
+    Consecutive lines with a column gap (tab, or two or more spaces between
+    words) form a block; "----" rule lines inside a block are skipped and
+    reply quote markers ("> ") are removed. Each block is split on the
+    display columns that are whitespace on every line, so space-aligned,
+    tab-aligned and mixed tables all come out with one cell per column.
+
+    Args:
+        text: Plain text body
+        min_rows: Smallest block (including header) reported as a table
+
+    Returns:
+        Table dictionaries ({"type": "text_table", "data": rows, "headers": first row})
+    """
+    tables = []
+    block: List[str] = []
+
+    def flush():
+        if len(block) >= min_rows:
+            rows = split_block(block)
+            if len(rows[0]) >= 2:
+                tables.append({"type": "text_table", "data": rows, "headers": rows[0]})
+        block.clear()
+
+    for line in text.splitlines():
+        line = _QUOTE_PREFIX.sub('', line).rstrip()
+        if _RULE_LINE.match(line):
+            continue
+        if _COLUMN_GAP.search(line):
+            block.append(line)
+        else:
+            flush()
+    flush()
+    return tables
@@ -0,0 +1,218 @@
+"""
+Email Thread Splitter
+Splits a reply chain into its individual messages (newest first)
+Supports Outlook, Gmail and Hebrew Outlook reply headers
+"""
+
+import re
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Dict, List, Optional
+import logging
+
+from .language import detect_language
+
+logger = logging.getLogger(__name__)
+
+# Characters stripped before classifying a line: quote markers, RTL/LTR marks, NBSP
+_LINE_PREFIX = '> \t\u200e\u200f\xa0'
+_LINE_SUFFIX = ' \t\r\u200e\u200f\xa0'
+
+# Outlook / Hebrew Outlook header field names -> normalized key
+HEADER_FIELDS = {
+    'from': 'sender', 'מאת': 'sender',
+    'sent': 'date', 'date': 'date', 'נשלח': 'date', 'תאריך': 'date',
+    'to': 'to', 'אל': 'to',
+    'cc': 'cc', 'עותק': 'cc',
+    'subject': 'subject', 'נושא': 'subject',
+}
+
+_HEADER_LINE = re.compile(
+    r'(From|Sent|Date|To|Cc|Subject|מאת|נשלח|תאריך|אל|עותק|נושא)\s*:\s*(.*)', re.IGNORECASE
+)
+_FROM_LINE = re.compile(r'(?:From|מאת)\s*:\s*\S', re.IGNORECASE)
+_SEPARATOR_LINE = re.compile(
+    r'-{2,}\s*(?:Original Message|Forwarded message|הודעה מקורית|הודעה שהועברה)\s*-{2,}'
+    r'|_{10,}\s*$',
+    re.IGNORECASE
+)
+# Gmail: "On Mon, Jan 20, 2025 at 2:22 PM Alon <alon@...> wrote:" / Hebrew "בתאריך ... מאת Alon <...>:"
+_WROTE_LINE = re.compile(
+    r'(?:On\s.{4,300}\swrote|בתאריך\s.{4,300}\sמאת\s.{1,300}|.{4,300}\s(?:כתב|כתבה|כתב/ה))\s*:\s*$',
+    re.IGNORECASE
+)
+
+HEADER_LOOKAHEAD_LINES = 6  # A "From:" line only starts a header if Sent/To/Subject follows this soon
+
+
+@dataclass
+class ThreadSegment:
+    """One message of a reply chain, as offsets into the original body text"""
+    index: int  # 0 = newest message
+    start: int  # Offsets into the original body text
+    end: int
+    body_start: int  # End of the reply header (== start for the top message)
+    fields: Dict[str, str] = field(default_factory=dict)  # sender/date/to/cc/subject
+    source: str = field(default="", repr=False)
+
+    @property
+    def header(self) -> str:
+        """Reply header lines ("From: ... Subject: ..."), empty for the top message"""
+        return self.source[self.start:self.body_start].strip()
+
+    @property
+    def text(self) -> str:
+        """Full segment text including the header"""
+        return self.source[self.start:self.end]
+
+    @property
+    def body(self) -> str:
+        """Segment text without the reply header"""
+        return self.source[self.body_start:self.end]
+
+    @cached_property
+    def summary(self) -> str:
+        """One-line description (sender, date, first body line), computed on first use"""
+        first_line = next((line.strip() for line in self.body.splitlines() if line.strip()), "")
+        parts = [p for p in (self.fields.get('sender'), self.fields.get('date')) if p]
+        prefix = f"{' | '.join(parts)}: " if parts else ""
+        return f"{prefix}{first_line[:200]}"
+
+    @cached_property
+    def language(self) -> str:
+        """Language of this message's body ("he"/"en"), detected on first use"""
+        return detect_language(self.body)
+
+
+class ThreadSplitter:
+    """
+    Split email body text into reply-chain segments
+
+    Each line is classified once against anchored patterns, so splitting is
+    linear in the body length. A segment starts at an "Original Message" /
+    underscore separator, a Gmail "On ... wrote:" line, or a "From:"/"מאת:"
+    line that is followed by other header fields within a few lines.
+    """
+
+    def split(self, text: str) -> List[ThreadSegment]:
+        """
+        Split body text into segments, newest message first
+
+        Args:
+            text: Email body text
+
+        Returns:
+            List of ThreadSegment (a single segment if no reply headers found)
+        """
+        text = text or ""
+        lines = text.split('\n')
+        offsets = []
+        position = 0
+        for line in lines:
+            offsets.append(position)
+            position += len(line) + 1
+
+        stripped = [line.lstrip(_LINE_PREFIX).rstrip(_LINE_SUFFIX) for line in lines]
+        starts: List[int] = []  # Line numbers where a quoted message begins
+        headers: Dict[int, List[int]] = {}  # Start line -> header line numbers
+
+        i = 0
+        while i < len(lines):
+            line = stripped[i]
+            if not line:
+                i += 1
+                continue
+
+            if _SEPARATOR_LINE.match(line) or _WROTE_LINE.match(line):
+                starts.append(i)
+                headers[i] = [i]
+                i += 1
+                # A separator is usually followed by the Outlook header block
+                while i < len(lines) and not stripped[i]:
+                    i += 1
+                if i < len(lines) and self._is_header_start(stripped, i):
+                    block = self._header_block(stripped, i)
+                    headers[starts[-1]].extend(block)
+                    i = block[-1] + 1
+                continue
+
+            if self._is_header_start(stripped, i):
+                starts.append(i)
+                block = self._header_block(stripped, i)
+                headers[i] = block
+                i = block[-1] + 1
+                continue
+
+            i += 1
+
+        segments = []
+        boundaries = starts + [len(lines)]
+        if not starts or text[:offsets[starts[0]]].strip():
+            boundaries = [0] + boundaries  # Top message has text of its own
+
+        for start_line, end_line in zip(boundaries, boundaries[1:]):
+            start = offsets[start_line]
+            end = offsets[end_line] if end_line < len(lines) else len(text)
+            header_lines = headers.get(start_line, [])
+            body_start = start
+            if header_lines:
+                last = header_lines[-1]
+                body_start = min(offsets[last] + len(lines[last]) + 1, end)
+            segments.append(ThreadSegment(
+                index=len(segments),
+                start=start,
+                end=end,
+                body_start=body_start,
+                fields=self._parse_fields(stripped, header_lines),
+                source=text,
+            ))
+
+        logger.debug(f"Split email body into {len(segments)} thread segment(s)")
+        return segments
+
+    def _is_header_start(self, stripped: List[str], i: int) -> bool:
+        """Check if line i is "From:" followed by more header fields"""
+        if not _FROM_LINE.match(stripped[i]):
+            return False
+        for line in stripped[i + 1:i + 1 + HEADER_LOOKAHEAD_LINES]:
+            match = _HEADER_LINE.match(line)
+            if match and HEADER_FIELDS.get(match.group(1).lower()) != 'sender':
+                return True
+        return False
+
+    def _header_block(self, stripped: List[str], i: int) -> List[int]:
+        """Line numbers of the header block starting at line i"""
+        block = [i]
+        j = i + 1
+        while j < len(stripped) and j <= i + HEADER_LOOKAHEAD_LINES + 2:
+            if _HEADER_LINE.match(stripped[j]):
+                block.append(j)
+            elif stripped[j]:
+                break
+            j += 1
+        return block
+
+    def _parse_fields(self, stripped: List[str], header_lines: List[int]) -> Dict[str, str]:
+        """Normalized header fields (sender/date/to/cc/subject)"""
+        fields: Dict[str, str] = {}
+        for n in header_lines:
+            match = _HEADER_LINE.match(stripped[n])
+            if match:
+                key = HEADER_FIELDS[match.group(1).lower()]
+                fields.setdefault(key, match.group(2).strip())
+            elif n == header_lines[0] and _WROTE_LINE.match(stripped[n]):
+                fields.setdefault('sender', stripped[n].rstrip(':').strip())
+        return fields
+
+
+def newest_segments_text(segments: List[ThreadSegment], count: Optional[int]) -> str:
+    """
+    Body text covering the newest ``count`` segments (all when count is falsy)
+
+    Segments are ordered newest first, so this is a prefix of the body.
+    """
+    if not segments:
+        return ""
+    if not count or count >= len(segments):
+        return segments[0].source
+    return segments[0].source[:segments[count].start]
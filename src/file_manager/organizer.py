@@ -93,7 +93,8 @@ class FileOrganizer:
         Returns:
             Path to saved file
         """
-        ext = ".xlsx" if file_type == "excel" else ".pdf"
+        # Keep the source format (.xls, .xlsb, .csv, ...); sniffed files without an extension get the default one
+        ext = Path(filepath).suffix.lower() or (".xlsx" if file_type == "excel" else ".pdf")
         filename = f"vendor_quote_{datetime.now().strftime('%Y%m%d_%H%M%S')}{ext}"
         
         dest_path = os.path.join(dest_folder, filename)
@@ -203,6 +204,9 @@ class FileOrganizer:
             '.msg': 'email',
             '.xlsx': 'excel',
             '.xls': 'excel',
+            '.xlsb': 'excel',
+            '.csv': 'excel',
+            '.tsv': 'excel',
             '.pdf': 'pdf',
             '.json': 'data',
             '.html': 'html',
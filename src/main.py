@@ -8,21 +8,28 @@ import sys
 import argparse
 import logging
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple, Union
 import yaml
 import re
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from src.email_intake.parser import EmailParser
+from src.email_intake.parser import EmailParser, EmailMetadata
+from src.email_intake.cache import ParsedEmailCache
+from src.email_intake.attachments import EXCEL_KINDS, PARSEABLE_KINDS
 from src.email_intake.content_extractor import EmailContentExtractor, EmailContext
 from src.document_processor.excel_parser import ExcelParser
+from src.document_processor.templates import TemplateRegistry
 from src.document_processor.pdf_parser import PDFParser
+from src.document_processor.inline_tables import InlineTableParser
 from src.document_processor.unifier import DataUnifier
 from src.business_logic.pricing import PricingEngine
 from src.business_logic.quote_generator import QuoteGenerator
 from src.file_manager.organizer import FileOrganizer
+from src.rules import configure_rule_packs, preload_rule_packs
+
+RULE_PACKS = ('context', 'spreadsheet')
 
 # Configure logging
 logging.basicConfig(
@@ -35,26 +42,110 @@ logger = logging.getLogger(__name__)
 class QuoteProcessor:
     """Main quote processing orchestrator"""
     
-    def __init__(self, config_path: str):
+    def __init__(self, config_path: Union[str, Dict]):
         """
         Initialize quote processor with configuration
         
         Args:
-            config_path: Path to configuration YAML file
+            config_path: Path to configuration YAML file; a configuration
+                dictionary that is already loaded is accepted too (as the
+                automation service and the benchmarks pass it)
         """
-        with open(config_path, 'r', encoding='utf-8') as f:
-            self.config = yaml.safe_load(f)
+        if isinstance(config_path, dict):
+            self.config = config_path
+        else:
+            with open(config_path, 'r', encoding='utf-8') as f:
+                self.config = yaml.safe_load(f)
+        
+        self._configure_rule_packs()
         
         # Initialize modules
-        self.email_parser = EmailParser()
-        self.content_extractor = EmailContentExtractor()
-        self.excel_parser = ExcelParser()
-        self.pdf_parser = PDFParser(use_ocr=self.config.get('processing', {}).get('ocr_enabled', True))
+        self.email_parser = EmailParser(
+            html_table_backend=self.config.get('processing', {}).get('html_table_backend', 'auto')
+        )
+        self.content_extractor = EmailContentExtractor(
+            max_segments=self.config.get('processing', {}).get('max_thread_segments', 0)
+        )
+        self.email_cache = self._create_email_cache()
+        self.excel_parser = ExcelParser(
+            backend=self.config.get('processing', {}).get('excel_backend', 'auto'),
+            streaming_threshold_mb=self.config.get('processing', {}).get('excel_streaming_threshold_mb', 2),
+            max_workers=self.config.get('processing', {}).get('excel_workers') or None,
+            templates=self._create_template_registry()
+        )
+        self.inline_table_parser = InlineTableParser(
+            min_confidence=self.config.get('processing', {}).get('inline_table_min_confidence', 0.5)
+        )
+        self.pdf_parser = PDFParser(
+            use_ocr=self.config.get('processing', {}).get('ocr_enabled', True),
+            max_workers=self.config.get('processing', {}).get('pdf_workers') or None
+        )
         self.data_unifier = DataUnifier()
         self.pricing_engine = PricingEngine(self.config)
         self.quote_generator = QuoteGenerator(self.config)
         self.file_organizer = FileOrganizer(self.config)
     
+    def _configure_rule_packs(self):
+        """Point the rule pack registry at processing.rule_packs and compile the packs once"""
+        rules_config = self.config.get('processing', {}).get('rule_packs') or {}
+        directory = rules_config.get('directory')
+        reload_interval = rules_config.get('reload_interval_seconds', 5)
+        configure_rule_packs([directory] if directory else [], reload_interval or None)
+        for pack in preload_rule_packs(RULE_PACKS):
+            logger.info(f"Rule pack {pack.name} version {pack.version} ({pack.path})")
+    
+    def _create_email_cache(self) -> Optional[ParsedEmailCache]:
+        """Create the parsed-email cache if enabled in processing.email_cache"""
+        processing = self.config.get('processing', {})
+        cache_config = processing.get('email_cache') or {}
+        if not cache_config.get('enabled', False):
+            return None
+        return ParsedEmailCache(
+            cache_config.get('directory', '/data/cache/parsed_emails'),
+            max_bytes=int(cache_config.get('max_size_mb', 256) * 1024 * 1024),
+            settings=f"segments={processing.get('max_thread_segments', 0)}"
+        )
+    
+    def _create_template_registry(self) -> Optional[TemplateRegistry]:
+        """Create the vendor sheet layout registry if enabled in processing.excel_templates"""
+        template_config = self.config.get('processing', {}).get('excel_templates') or {}
+        if not template_config.get('enabled', False):
+            return None
+        return TemplateRegistry(template_config.get('path', '/data/cache/excel_templates.json'))
+    
+    def _parse_email(self, email_path: str) -> Tuple[EmailMetadata, EmailContext]:
+        """
+        Parse email file and extract its context, using the parsed-email cache
+        
+        Args:
+            email_path: Path to .msg/.eml file
+            
+        Returns:
+            (EmailMetadata, EmailContext)
+        """
+        key = None
+        if self.email_cache and os.path.exists(email_path):
+            key = self.email_cache.key_for(email_path)
+            cached = self.email_cache.get(key)
+            if cached:
+                logger.info(f"Using cached parse of {os.path.basename(email_path)}")
+                metadata, email_context = cached
+                return self.email_parser.bind_attachments(metadata, email_path), email_context.bind(self.content_extractor)
+        
+        metadata = self.email_parser.parse_msg_file(email_path)
+        
+        # Extract structured email context for agent understanding
+        email_context = self.content_extractor.extract_context(metadata)
+        
+        if key:
+            # Compute the lazy context fields first so a cache hit doesn't rescan the body
+            email_context.materialize()
+            try:
+                self.email_cache.put(key, metadata, email_context)
+            except OSError as e:
+                logger.warning(f"Could not write parsed-email cache: {e}")
+        return metadata, email_context
+    
     def process_email(self, email_path: str, 
                      customer_name: Optional[str] = None,
                      product_name: Optional[str] = None) -> Dict:
@@ -72,18 +163,16 @@ class QuoteProcessor:
         logger.info(f"Processing email: {email_path}")
         
         try:
-            # Step 1: Parse email
-            metadata = self.email_parser.parse_msg_file(email_path)
+            # Step 1: Parse email and extract structured context (cached by file content)
+            metadata, email_context = self._parse_email(email_path)
             logger.info(f"Parsed email from: {metadata.from_address}")
+            logger.info(f"Split email into {len(email_context.thread_segments)} message(s), language: {email_context.language}")
             
-            # Step 1.5: Extract structured email context for agent understanding
-            email_context = self.content_extractor.extract_context(metadata)
-            logger.info(f"Extracted email context: {len(email_context.product_descriptions)} product descriptions, "
-                       f"{len(email_context.special_notes)} notes, {len(email_context.customer_mentions)} customer mentions")
-            
-            # Log structured context for debugging/agent use
-            context_string = self.content_extractor.to_structured_string(email_context)
-            logger.debug(f"Email context:\n{context_string}")
+            # Context fields are extracted on first use; only render the structured string if DEBUG is on
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Extracted email context: {len(email_context.product_descriptions)} product descriptions, "
+                             f"{len(email_context.special_notes)} notes, {len(email_context.customer_mentions)} customer mentions")
+                logger.debug(f"Email context:\n{email_context.structured_string}")
             
             # Extract customer/product names if not provided
             if not customer_name:
@@ -95,16 +184,17 @@ class QuoteProcessor:
             temp_dir = os.path.join(os.path.dirname(email_path), 'temp_attachments')
             os.makedirs(temp_dir, exist_ok=True)
             
-            attachments = self.email_parser.extract_attachments(metadata, temp_dir)
-            logger.info(f"Extracted {len(attachments)} attachments")
+            # Only Excel/PDF attachments are read from the message; logos and other files are skipped
+            attachments = self.email_parser.extract_attachments(metadata, temp_dir, kinds=PARSEABLE_KINDS)
+            logger.info(f"Extracted {len(attachments)} of {len(metadata.attachments or [])} attachments")
             
             # Step 3: Process documents
             all_products = []
             sources = {}
             
             # Process attachments
-            excel_files = [a for a in attachments if a.filename.endswith(('.xlsx', '.xls'))]
-            pdf_files = [a for a in attachments if a.filename.endswith('.pdf')]
+            excel_files = [a for a in attachments if a.kind in EXCEL_KINDS]
+            pdf_files = [a for a in attachments if a.kind == 'pdf']
             
             # Process Excel files
             for excel_file in excel_files:
@@ -112,7 +202,7 @@ class QuoteProcessor:
                     if not os.path.exists(excel_file.filepath):
                         logger.warning(f"Excel file not found, skipping: {excel_file.filepath}")
                         continue
-                    sheets_data = self.excel_parser.parse_excel(excel_file.filepath)
+                    sheets_data = self.excel_parser.parse_excel(excel_file.filepath, sender=metadata.from_address)
                     products = self.excel_parser.merge_sheets(sheets_data)
                     if products:
                         sources['excel'] = sources.get('excel', []) + products
@@ -150,7 +240,6 @@ class QuoteProcessor:
             # Process inline tables from email body
             inline_tables = self.email_parser.extract_inline_tables(metadata)
             if inline_tables:
-                # Convert inline tables to product format (simplified)
                 inline_products = self._parse_inline_tables(inline_tables)
                 if inline_products:
                     sources['inline_table'] = inline_products
@@ -189,7 +278,7 @@ class QuoteProcessor:
                         "special_notes": email_context.special_notes,
                         "specifications": email_context.specifications,
                         "quantities_mentioned": email_context.quantities_mentioned,
-                        "structured_context": context_string
+                        "structured_context": email_context.structured_string
                     },
                     "products": [],
                     "validation_errors": validation_errors,
@@ -259,7 +348,7 @@ class QuoteProcessor:
                     "special_notes": email_context.special_notes,
                     "specifications": email_context.specifications,
                     "quantities_mentioned": email_context.quantities_mentioned,
-                    "structured_context": context_string
+                    "structured_context": email_context.structured_string
                 },
                 "products": [
                     {
@@ -405,20 +494,8 @@ class QuoteProcessor:
         return vendor_grouping
     
     def _parse_inline_tables(self, tables) -> list:
-        """Parse inline tables into product format"""
-        products = []
-        # This is simplified - can be enhanced
-        for table in tables:
-            # Skip if table has headers but no data
-            if len(table.get('data', [])) < 2:
-                continue
-            
-            # Try to extract products from table data
-            # This would require more sophisticated parsing
-            # For now, return empty list and rely on LLM module later
-            pass
-        
-        return products
+        """Parse inline tables into products (rule-based, see InlineTableParser)"""
+        return self.inline_table_parser.parse_tables(tables)
 
 
 def main():
@@ -0,0 +1,14 @@
+"""
+Rules Module
+Data-driven extraction rules (YAML rule packs) shared by email and document processing
+"""
+
+from .packs import (
+    RulePack, RulePackRegistry, configure_rule_packs, preload_rule_packs, register_compiler, rule_pack,
+    rule_pack_settings
+)
+
+__all__ = [
+    'RulePack', 'RulePackRegistry', 'configure_rule_packs', 'preload_rule_packs', 'register_compiler', 'rule_pack',
+    'rule_pack_settings'
+]
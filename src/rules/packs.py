@@ -0,0 +1,197 @@
+"""
+Rule Packs
+Versioned YAML rule files (patterns, keyword lists) compiled once per process
+and reloaded when the file on disk changes
+"""
+
+import hashlib
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import logging
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+BUILTIN_DIR = Path(__file__).parent  # Packs shipped with the code
+RELOAD_INTERVAL = 5.0  # Seconds between checks of a pack file for changes
+
+# Pack name -> function turning the parsed YAML into the object callers use
+Compiler = Callable[[Dict[str, Any]], Any]
+_COMPILERS: Dict[str, Compiler] = {}
+
+
+def register_compiler(name: str) -> Callable[[Compiler], Compiler]:
+    """Decorator registering the compiler of a rule pack (done by the module that uses it)"""
+    def decorator(compiler: Compiler) -> Compiler:
+        _COMPILERS[name] = compiler
+        return compiler
+    return decorator
+
+
+@dataclass
+class RulePack:
+    """A loaded and compiled rule pack"""
+    name: str
+    version: int
+    digest: str  # Content hash, changes with any edit (version bump or not)
+    path: str
+    rules: Any  # Output of the pack's compiler
+
+
+def load_pack(name: str, path: str) -> RulePack:
+    """
+    Read, validate and compile one rule pack file
+
+    Args:
+        name: Pack name (must match the file's "pack" key)
+        path: YAML file path
+
+    Returns:
+        RulePack
+
+    Raises:
+        ValueError: The file is not a valid pack for ``name``
+        KeyError: No compiler is registered for ``name``
+    """
+    with open(path, 'rb') as f:
+        content = f.read()
+    data = yaml.safe_load(content)
+    if not isinstance(data, dict) or data.get('pack') != name:
+        raise ValueError(f"{path} is not a '{name}' rule pack")
+    if not isinstance(data.get('version'), int):
+        raise ValueError(f"{path}: rule pack version must be an integer")
+
+    return RulePack(
+        name=name,
+        version=data['version'],
+        digest=hashlib.sha256(content).hexdigest()[:16],
+        path=path,
+        rules=_COMPILERS[name](data),
+    )
+
+
+class RulePackRegistry:
+    """
+    Process-wide cache of compiled rule packs
+
+    A pack is compiled on first use and returned from memory afterwards; at
+    most every ``reload_interval`` seconds a lookup stats the file and
+    recompiles it if it changed. A pack that fails to load or compile is
+    logged and the previous version stays in use. Packs are looked up in the
+    configured directories first, then in the built-in ones, so a rule change
+    is a file edit rather than a deploy. Compiled packs are plain objects,
+    so worker processes forked after preload() share them.
+    """
+
+    def __init__(self, directories: Optional[Iterable[str]] = None,
+                 reload_interval: Optional[float] = RELOAD_INTERVAL):
+        """
+        Initialize registry
+
+        Args:
+            directories: Directories searched before the built-in packs
+            reload_interval: Seconds between change checks (None = never reload)
+        """
+        self.directories = [str(d) for d in directories or []] + [str(BUILTIN_DIR)]
+        self.reload_interval = reload_interval
+        self._packs: Dict[str, RulePack] = {}
+        self._file_stamps: Dict[str, Tuple] = {}
+        self._checked: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def locate(self, name: str) -> str:
+        """Path of the pack file that is in effect"""
+        for directory in self.directories:
+            path = os.path.join(directory, f"{name}.yaml")
+            if os.path.exists(path):
+                return path
+        raise FileNotFoundError(f"Rule pack '{name}' not found in {', '.join(self.directories)}")
+
+    def get(self, name: str) -> RulePack:
+        """
+        Compiled pack, reloaded first if its file changed
+
+        Args:
+            name: Pack name (file name without .yaml)
+
+        Returns:
+            RulePack
+        """
+        pack = self._packs.get(name)
+        if pack is not None and (self.reload_interval is None
+                                 or time.monotonic() - self._checked[name] < self.reload_interval):
+            return pack
+        with self._lock:
+            return self._refresh(name)
+
+    def preload(self, names: Iterable[str]) -> List[RulePack]:
+        """Compile packs now (e.g. before forking workers)"""
+        return [self.get(name) for name in names]
+
+    def _refresh(self, name: str) -> RulePack:
+        current = self._packs.get(name)
+        self._checked[name] = time.monotonic()
+        try:
+            path = self.locate(name)
+            stat = os.stat(path)
+        except OSError as e:
+            if current is None:
+                raise
+            logger.warning(f"Rule pack {name}: {e}; keeping version {current.version}")
+            return current
+
+        file_stamp = (path, stat.st_mtime_ns, stat.st_size)
+        if current is not None and self._file_stamps.get(name) == file_stamp:
+            return current
+
+        try:
+            pack = load_pack(name, path)
+        except Exception as e:
+            if current is None:
+                raise
+            logger.error(f"Could not reload rule pack {name} from {path}: {e}; keeping version {current.version}")
+            self._file_stamps[name] = file_stamp  # Retry once the file changes again
+            return current
+
+        self._packs[name] = pack
+        self._file_stamps[name] = file_stamp
+        if current is not None:
+            logger.info(f"Reloaded rule pack {name} version {pack.version} from {path}")
+        return pack
+
+
+_registry = RulePackRegistry()
+
+
+def configure_rule_packs(directories: Optional[Iterable[str]] = None,
+                         reload_interval: Optional[float] = RELOAD_INTERVAL) -> RulePackRegistry:
+    """
+    Replace the process-wide registry (packs are recompiled on next use)
+
+    Args:
+        directories: Directories searched before the built-in packs
+        reload_interval: Seconds between change checks (None = never reload)
+    """
+    global _registry
+    _registry = RulePackRegistry(directories, reload_interval)
+    return _registry
+
+
+def rule_pack_settings() -> Tuple[List[str], Optional[float]]:
+    """Arguments that recreate the process-wide registry with configure_rule_packs (e.g. in worker processes)"""
+    return _registry.directories[:-1], _registry.reload_interval
+
+
+def rule_pack(name: str) -> RulePack:
+    """Compiled rule pack from the process-wide registry"""
+    return _registry.get(name)
+
+
+def preload_rule_packs(names: Iterable[str]) -> List[RulePack]:
+    """Compile packs in the process-wide registry now"""
+    return _registry.preload(names)
@@ -0,0 +1,36 @@
+"""Delimited text encoding and delimiter sniffing"""
+
+import pytest
+
+from src.document_processor.delimited import SNIFF_BYTES, iter_delimited_rows, sniff_dialect
+
+HEBREW = 'מסך מחשב 24 אינץ'
+
+
+@pytest.fixture
+def late_hebrew_csv(tmp_path):
+    """Windows-1255 price list whose first SNIFF_BYTES are an ASCII header and SKU rows"""
+    lines = ['SKU;Description;Qty;Unit Price']
+    line = 0
+    while sum(len(text) + 2 for text in lines) <= SNIFF_BYTES:
+        lines.append(f'MON-{line:05d};Monitor stand {line};1;{100 + line}.00')
+        line += 1
+    lines += [f'HEB-{n:03d};{HEBREW} {n};2;{900 + n}.00' for n in range(20)]
+    path = tmp_path / 'late_hebrew.csv'
+    path.write_bytes('\r\n'.join(lines).encode('cp1255'))
+    return str(path)
+
+
+def test_hebrew_after_ascii_head_sniffs_cp1255(late_hebrew_csv):
+    """Hebrew rows only past the first SNIFF_BYTES still decide the encoding"""
+    assert sniff_dialect(late_hebrew_csv) == ('cp1255', ';')
+    rows = list(iter_delimited_rows(late_hebrew_csv))
+    descriptions = [row[1] for row in rows if row[0].startswith('HEB-')]
+    assert descriptions == [f'{HEBREW} {n}' for n in range(20)]
+    assert not any('\ufffd' in cell for row in rows for cell in row)
+
+
+def test_all_ascii_file_sniffs_utf8(tmp_path):
+    path = tmp_path / 'ascii.tsv'
+    path.write_text('SKU\tDescription\nA-1\tCable\n', encoding='ascii')
+    assert sniff_dialect(str(path)) == ('utf-8', '\t')
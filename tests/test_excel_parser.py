@@ -0,0 +1,46 @@
+"""ExcelParser sheet reading"""
+
+import pytest
+from openpyxl import Workbook
+
+from src.document_processor.excel_parser import ExcelParser
+
+
+def products_of(sheets):
+    return {
+        name: [(p.sku, p.description, p.quantity, p.unit_price, p.total_price, p.row_number) for p in data.products]
+        for name, data in sheets.items()
+    }
+
+
+@pytest.fixture
+def price_list(tmp_path):
+    """Workbook with a title block above the header, a blank row, a price row below a product and a notes sheet"""
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = 'Quote'
+    sheet.append(['Quotation 1042'])
+    sheet.append([])
+    sheet.append(['SKU', 'Description', 'Qty', 'Unit Price', 'Total'])
+    for line in range(40):
+        sheet.append([f'SRV-{line:04d}', f'1U server model {line} with rails', line % 5 + 1,
+                      round(1000 + line * 12.5, 2), None])
+        if line % 10 == 3:
+            sheet.append([None, 'Includes 3 years support', None, None, 250.0])
+        if line == 20:
+            sheet.append([])
+    notes = workbook.create_sheet('Notes')
+    notes.append(['Delivery within 4 weeks'])
+    path = tmp_path / 'price_list.xlsx'
+    workbook.save(path)
+    return str(path)
+
+
+def test_pandas_fallback_matches_engine_reader(price_list, monkeypatch):
+    """Without pandas' private engine reader, sheets read via pd.read_excel give the same products"""
+    expected = products_of(ExcelParser(backend='pandas', max_workers=1).parse_excel(price_list))
+    assert expected['Quote']
+
+    monkeypatch.setattr(ExcelParser, '_engine_reader', lambda self, excel_file: None)
+    parser = ExcelParser(backend='pandas', max_workers=1)
+    assert products_of(parser.parse_excel(price_list)) == expected